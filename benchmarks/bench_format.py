@@ -0,0 +1,151 @@
+"""
+포맷팅 함수 마이크로벤치마크
+
+재실행 한 번에 카드 목록을 그릴 때 드는 포맷팅 비용(카드마다 조회수/좋아요/댓글,
+길이, 게시 시간 두 번)을 이전 구현과 formatting 모듈로 각각 측정해 비교합니다.
+이전 구현은 비교를 위해 아래에 그대로 옮겨 두었습니다 (st.cache_data로 감싼
+조회수 포맷팅, 호출마다 import re/패턴 컴파일, 호출마다 datetime import).
+
+실행 방법:
+    python benchmarks/bench_format.py            # 50개
+    python benchmarks/bench_format.py 200        # 200개
+"""
+# 필요한 라이브러리 임포트
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from formatting import format_counts, format_durations, relative_times  # noqa: E402
+
+# 런타임 없이 st.cache_data를 호출할 때 나오는 경고를 숨깁니다.
+for name in list(logging.root.manager.loggerDict):
+    if name.startswith("streamlit"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+
+# ====================================
+# 이전 구현 (비교용)
+# ====================================
+@st.cache_data
+def legacy_format_view_count(view_count):
+    try:
+        count = int(view_count)
+        if count >= 100000000:
+            return f"{count//100000000}억{(count%100000000)//10000:,}만회" if count%100000000 >= 10000 else f"{count//100000000}억회"
+        elif count >= 10000:
+            return f"{count//10000:,}만회"
+        else:
+            return f"{count:,}회"
+    except (ValueError, TypeError):
+        return "조회수 정보 없음"
+
+
+def legacy_format_duration(duration_str):
+    if not duration_str:
+        return ""
+    import re
+    pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
+    match = re.match(pattern, duration_str)
+    if match:
+        hours, minutes, seconds = match.groups()
+        hours = int(hours) if hours else 0
+        minutes = int(minutes) if minutes else 0
+        seconds = int(seconds) if seconds else 0
+        if hours > 0:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        else:
+            return f"{minutes}:{seconds:02d}"
+    return ""
+
+
+def legacy_get_relative_time(published_at):
+    try:
+        from datetime import datetime
+        published = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        now = datetime.now(published.tzinfo)
+        diff = now - published
+        if diff.days > 0:
+            return f"{diff.days}일 전"
+        elif diff.seconds > 3600:
+            return f"{diff.seconds // 3600}시간 전"
+        elif diff.seconds > 60:
+            return f"{diff.seconds // 60}분 전"
+        else:
+            return "방금 전"
+    except:
+        return ""
+
+
+# ====================================
+# 측정
+# ====================================
+def make_rows(count):
+    """가짜 동영상 정보: 이전 구현용 원본 문자열과 파싱된 값을 함께 만듭니다."""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        published = now - timedelta(hours=i * 7)
+        rows.append({
+            'view_count': 1000 + i * 791923,
+            'like_count': 10 + i * 1301,
+            'comment_count': i * 17,
+            'duration': 60 + i * 37,
+            'duration_iso': f"PT{(60 + i * 37) // 60}M{(60 + i * 37) % 60}S",
+            'published_at': published,
+            'published_iso': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+    return rows
+
+
+def legacy_rerun(rows):
+    for row in rows:
+        legacy_format_view_count(row['view_count'])
+        legacy_format_view_count(row['like_count'])
+        legacy_format_view_count(row['comment_count'])
+        legacy_format_duration(row['duration_iso'])
+        # 카드 HTML과 카드 컴포넌트에서 한 번씩
+        legacy_get_relative_time(row['published_iso'])
+        legacy_get_relative_time(row['published_iso'])
+
+
+def batch_rerun(rows):
+    format_counts([row['view_count'] for row in rows])
+    format_counts([row['like_count'] for row in rows])
+    format_counts([row['comment_count'] for row in rows])
+    format_durations([row['duration'] for row in rows])
+    published = [row['published_at'] for row in rows]
+    relative_times(published)
+    relative_times(published, years=True)
+
+
+def measure(func, rows, repeat=200):
+    """재실행 한 번의 중앙값 (마이크로초); 첫 실행(캐시 채우기)은 제외"""
+    func(rows)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rows = make_rows(count)
+    legacy = measure(legacy_rerun, rows)
+    batch = measure(batch_rerun, rows)
+    print(f"동영상 {count}개, 재실행 한 번의 포맷팅 비용")
+    print(f"{'구현':<12}{'중앙값(µs)':>14}{'카드당(µs)':>14}")
+    print(f"{'이전':<12}{legacy:>14.1f}{legacy / count:>14.2f}")
+    print(f"{'formatting':<12}{batch:>14.1f}{batch / count:>14.2f}")
+    print(f"{legacy / batch:.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+카드 렌더링 방식 비교 벤치마크
+
+카드마다 Streamlit 컴포넌트를 만드는 기본 루프와, 그리드 전체를 HTML 한 번으로
+보내는 방식을 같은 가짜 데이터로 실행해 소요 시간과 전송되는 요소 수를 비교합니다.
+
+실행 방법:
+    python benchmarks/bench_render.py            # 50개, 4열
+    python benchmarks/bench_render.py 200 3      # 200개, 3열
+"""
+# 필요한 라이브러리 임포트
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def render_script(count, layout, mode, repo_root):
+    """AppTest에서 실행할 스크립트: 가짜 동영상으로 카드 목록만 렌더링"""
+    import sys
+    from datetime import datetime, timedelta, timezone
+
+    sys.path.insert(0, repo_root)
+    import streamlit_app
+    from models import Video
+
+    now = datetime.now(timezone.utc)
+    videos = [
+        Video(
+            id=f"vid{i:05d}",
+            title=f"벤치마크 동영상 제목 {i} - 인기 급상승 テスト",
+            channel=f"채널 {i % 17}",
+            thumbnail=f"https://i.ytimg.com/vi/vid{i:05d}/hqdefault.jpg",
+            view_count=1000 + i * 7919,
+            like_count=10 + i * 13,
+            comment_count=i,
+            published_at=now - timedelta(hours=i),
+            duration=60 + i,
+        )
+        for i in range(count)
+    ]
+    streamlit_app.render_videos(videos, layout, mode)
+
+
+def count_elements(node):
+    """렌더링된 요소 트리의 잎 노드(실제 전송되는 요소) 수"""
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def run(mode, count, layout, repeat=5):
+    timings = []
+    elements = 0
+    for _ in range(repeat):
+        at = AppTest.from_function(
+            render_script,
+            kwargs={"count": count, "layout": layout, "mode": mode, "repo_root": REPO_ROOT},
+            default_timeout=120,
+        )
+        started = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        elements = count_elements(at.main)
+    return statistics.median(timings), elements
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    layout = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    print(f"동영상 {count}개, {layout}열")
+    print(f"{'방식':<12}{'중앙값(ms)':>12}{'요소 수':>10}")
+    for mode in ("streamlit", "html"):
+        elapsed, elements = run(mode, count, layout)
+        print(f"{mode:<12}{elapsed * 1000:>12.1f}{elements:>10}")
+
+
+if __name__ == "__main__":
+    main()
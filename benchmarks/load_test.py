@@ -0,0 +1,308 @@
+"""
+동시 접속 부하 테스트 (로컬 mock API 사용, 할당량 소모 없음)
+
+mock_api.py의 재생 서버를 띄우고 streamlit_app.py를 Streamlit AppTest 세션 N개로
+동시에 실행합니다. 세션마다 국가/정렬/개수 변경, 검색, 새로고침 클릭을 무작위로
+섞어 수행합니다.
+
+AppTest는 실행할 때마다 전역 Runtime을 바꿔 끼우므로 한 프로세스에서 여러 세션을
+동시에 실행할 수 없습니다. 그래서 세션마다 프로세스를 따로 띄우며, 세션들은 워커
+프로세스 여러 개로 실행한 서버처럼 디스크 캐시(SQLite)만 공유하고 메모리 캐시와
+single-flight는 각자 따로 씁니다. 따라서 API 요청 수는 한 프로세스로 실행한 서버보다
+많게 나오는 상한값입니다.
+
+끝나면 동작별 재실행 소요 시간 백분위수(p50/p95/p99), 캐시 계층별 적중률,
+mock API가 받은 요청 수를 출력합니다.
+
+실행 방법:
+    python benchmarks/load_test.py                                # 세션 8개, 세션당 동작 10개
+    python benchmarks/load_test.py --sessions 32 --steps 20 --latency 0.1 --jitter 0.1
+    python benchmarks/load_test.py --fixtures fixtures --error-rate 0.05 --json load.json
+"""
+# 필요한 라이브러리 임포트
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "streamlit_app.py")
+sys.path.insert(0, REPO_ROOT)
+
+# 세션이 고르는 동작과 가중치
+ACTIONS = {
+    'country': 3,
+    'order': 2,
+    'count': 2,
+    'search': 3,
+    'refresh': 1,
+}
+
+# 캐시에서 바로 제공한 것으로 보는 결과 (새로고침 'refresh'는 조회가 아니므로 제외)
+HIT_OUTCOMES = ('hit', 'stale', 'coalesced')
+
+# 검색창에 입력해 보는 검색어 (빈 문자열은 검색 지우기)
+SEARCH_TERMS = ("합성", "채널 3", "동영샹", "video", "")
+
+
+# ====================================
+# 세션 한 개
+# ====================================
+def widget(elements, prefix):
+    """라벨이 prefix로 시작하는 위젯"""
+    return next(element for element in elements if element.label.startswith(prefix))
+
+
+def option_values(labels):
+    """국가/정렬 선택 상자의 표시 문자열(AppTest의 options)을 앱의 원래 값으로 바꾸는 함수"""
+    from streamlit_app import (
+        ALL_REGIONS, ALL_REGIONS_LABEL, COUNTRIES, LOCAL_SORT_OPTIONS, SORT_OPTIONS,
+    )
+
+    values = {ALL_REGIONS_LABEL: ALL_REGIONS}
+    for options in (COUNTRIES, SORT_OPTIONS, LOCAL_SORT_OPTIONS):
+        values.update({label: value for value, label in options.items()})
+    return [values[label] for label in labels]
+
+
+def run_session(session_id, steps, seed, think_time, record):
+    """
+    AppTest 세션 하나를 열고 무작위 동작을 steps번 수행하는 함수
+
+    Args:
+        session_id (int): 세션 번호 (기록용)
+        steps (int): 첫 화면 이후 수행할 동작 수
+        seed (int): 동작 선택용 난수 시드
+        think_time (float): 동작 사이 최대 대기 시간 (초)
+        record (callable): (세션 번호, 동작, 소요 시간(초), 오류 메시지 또는 None)을 받는 함수
+            (오류는 처리되지 않은 예외나 화면에 표시된 st.error)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+
+    def timed(action, run):
+        started = time.perf_counter()
+        try:
+            run()
+            # 처리되지 않은 예외, 또는 사용자에게 보인 오류 메시지(st.error)
+            error = at.exception[0].value if at.exception else (at.error[0].value if at.error else None)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        record(session_id, action, time.perf_counter() - started, error)
+
+    timed('initial', at.run)
+    actions, weights = zip(*ACTIONS.items())
+    for _ in range(steps):
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+        action = rng.choices(actions, weights)[0]
+        try:
+            if action in ('country', 'order'):
+                # format_func를 쓰는 선택 상자는 표시 문자열이 아닌 원래 값으로 바꿔야 합니다.
+                prefix = "📍" if action == 'country' else "🔄"
+                box = widget(at.selectbox, prefix)
+                value = rng.choice([
+                    option for option in option_values(box.options) if option != box.value
+                ])
+                box.set_value(value)
+                timed(action, at.run)
+                selected = widget(at.selectbox, prefix).value
+                if selected != value:
+                    raise AssertionError(f"{box.label}: {value!r}를 골랐지만 {selected!r}입니다.")
+            elif action == 'count':
+                slider = widget(at.slider, "📺")
+                slider.set_value(rng.randrange(int(slider.min), int(slider.max) + 1, int(slider.step)))
+                timed(action, at.run)
+            elif action == 'search':
+                widget(at.text_input, "🔍").input(rng.choice(SEARCH_TERMS))
+                timed(action, at.run)
+            elif action == 'refresh':
+                widget(at.button, "🔄").click()
+                timed(action, at.run)
+        except StopIteration:
+            # 이전 실행이 실패해 위젯이 없으면 처음부터 다시 그립니다.
+            timed('initial', at.run)
+
+
+def session_worker(session_id, steps, seed, think_time, delay):
+    """
+    세션 프로세스에서 실행하는 함수
+
+    Returns:
+        tuple: ([(동작, 소요 시간)], [(세션, 동작, 오류)], {(계층, 결과): 늘어난 횟수})
+    """
+    logging.disable(logging.WARNING)
+    from instrumentation import REGISTRY
+
+    samples = []
+    errors = []
+
+    def record(session_id, action, elapsed, error):
+        samples.append((action, elapsed))
+        if error:
+            errors.append((session_id, action, str(error)))
+
+    time.sleep(delay)
+    before = REGISTRY.snapshot()['cache']
+    run_session(session_id, steps, seed, think_time, record)
+    after = REGISTRY.snapshot()['cache']
+    return samples, errors, {key: count - before.get(key, 0) for key, count in after.items()}
+
+
+# ====================================
+# 집계
+# ====================================
+def percentile(values, q):
+    """정렬된 values의 q 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def latency_table(samples):
+    """동작별 {'count', 'p50', 'p95', 'p99', 'max'} (밀리초)"""
+    table = {}
+    for action in ['all'] + sorted({action for action, _ in samples}):
+        values = sorted(
+            elapsed * 1000 for name, elapsed in samples if action in ('all', name)
+        )
+        table[action] = {
+            'count': len(values),
+            'p50': round(percentile(values, 50), 1),
+            'p95': round(percentile(values, 95), 1),
+            'p99': round(percentile(values, 99), 1),
+            'max': round(values[-1], 1) if values else 0.0,
+        }
+    return table
+
+
+def cache_table(counts):
+    """
+    계층별 {'lookups', 결과별 횟수, 'hit_rate'}
+
+    Args:
+        counts (dict): {(계층, 결과): 횟수}
+    """
+    deltas = {}
+    for (tier, outcome), count in counts.items():
+        if count:
+            deltas.setdefault(tier, {})[outcome] = deltas.get(tier, {}).get(outcome, 0) + count
+    table = {}
+    for tier, outcomes in sorted(deltas.items()):
+        served = sum(outcomes.get(outcome, 0) for outcome in HIT_OUTCOMES)
+        lookups = served + outcomes.get('miss', 0)
+        table[tier] = dict(
+            sorted(outcomes.items()), lookups=lookups,
+            hit_rate=round(served / lookups, 3) if lookups else 0.0,
+        )
+    return table
+
+
+def print_report(report):
+    print(f"\n세션 {report['sessions']}개 × 동작 {report['steps']}개, "
+          f"{report['elapsed_s']:.1f}초, 오류 {len(report['errors'])}건")
+    print(f"\n{'동작':<10}{'횟수':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'최대(ms)':>10}")
+    for action, row in report['latency_ms'].items():
+        print(f"{action:<10}{row['count']:>7}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}{row['max']:>10.1f}")
+    print(f"\n{'캐시':<10}{'조회':>7}{'적중률':>9}  결과별")
+    for tier, row in report['cache'].items():
+        outcomes = ", ".join(f"{name} {count}" for name, count in row.items() if name not in ('lookups', 'hit_rate'))
+        print(f"{tier:<10}{row['lookups']:>7}{row['hit_rate']:>9.1%}  {outcomes}")
+    calls = report['upstream_calls']
+    print(f"\nmock API 요청: {sum(calls.values())}건 ({', '.join(f'{name} {count}' for name, count in sorted(calls.items()))})")
+    for session_id, action, message in report['errors'][:5]:
+        print(f"  세션 {session_id} {action}: {message}")
+
+
+# ====================================
+# 실행
+# ====================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="streamlit_app.py를 동시 세션으로 실행해 부하를 측정합니다.")
+    parser.add_argument('--sessions', type=int, default=8, help="동시 세션 수 (기본값: 8)")
+    parser.add_argument('--steps', type=int, default=10, help="세션마다 수행할 동작 수 (기본값: 10)")
+    parser.add_argument('--think-time', type=float, default=0.0, help="동작 사이 최대 대기 시간 (초)")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="세션 시작을 이 시간(초)에 걸쳐 나눔")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (같으면 같은 동작 순서)")
+    parser.add_argument('--fixtures', help="재생할 fixture 디렉터리 (없으면 합성 데이터)")
+    parser.add_argument('--synthetic', type=int, default=200, help="합성할 목록당 동영상 수 (기본값: 200)")
+    parser.add_argument('--latency', type=float, default=0.05, help="mock API 응답 지연 (초, 기본값: 0.05)")
+    parser.add_argument('--jitter', type=float, default=0.05, help="지연 시간에 더할 무작위 값의 최대치 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="mock API 실패 응답 비율 (0~1)")
+    parser.add_argument('--json', help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    from mock_api import FixtureStore, MockYouTubeServer
+
+    server = MockYouTubeServer(
+        FixtureStore(args.fixtures, synthetic=0 if args.fixtures else args.synthetic),
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+    ).start()
+
+    # 캐시/기록 파일은 임시 디렉터리에 두고, .env의 실제 키 대신 mock 키를 씁니다
+    # (load_dotenv()는 이미 있는 환경 변수를 덮어쓰지 않음).
+    workdir = tempfile.mkdtemp(prefix="youtube-load-")
+    os.environ.update({
+        'YOUTUBE_API_BASE_URL': server.base_url,
+        'YOUTUBE_API_KEY': 'mock-key',
+        'YOUTUBE_API_KEYS': '',
+        'YOUTUBE_CACHE_PATH': os.path.join(workdir, 'youtube_cache.sqlite3'),
+        'YOUTUBE_HISTORY_PATH': os.path.join(workdir, 'history.sqlite3'),
+        'YOUTUBE_QUOTA_PATH': os.path.join(workdir, 'quota.sqlite3'),
+        'YOUTUBE_THUMBNAIL_DIR': os.path.join(workdir, 'thumbnails'),
+    })
+    os.environ.setdefault('YOUTUBE_QUOTA_DAILY_LIMIT', str(10 ** 9))
+    started = time.perf_counter()
+    samples = []
+    errors = []
+    cache = {}
+    # 세션마다 새 프로세스 (fork 대신 spawn: mock 서버 스레드를 복제하지 않음)
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=args.sessions, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    session_worker, session_id, args.steps, args.seed * 100003 + session_id,
+                    args.think_time, args.ramp_up * session_id / args.sessions,
+                )
+                for session_id in range(args.sessions)
+            ]
+            for future in futures:
+                session_samples, session_errors, session_cache = future.result()
+                samples += session_samples
+                errors += session_errors
+                for key, count in session_cache.items():
+                    cache[key] = cache.get(key, 0) + count
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'sessions': args.sessions,
+        'steps': args.steps,
+        'elapsed_s': round(elapsed, 2),
+        'latency_ms': latency_table(samples),
+        'cache': cache_table(cache),
+        'upstream_calls': server.calls(),
+        'errors': errors,
+    }
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+단계별 벤치마크 모음 (파싱, 합계, 검색, 포맷팅, 카드 HTML)
+
+합성 데이터와 기록한 fixture(mock_api.py record)로 50~5,000개 동영상에 대해 각 단계를
+측정하고, 결과를 benchmarks/results/<커밋>.json에 저장합니다. 이전에 저장한 결과
+(기본값: 가장 최근 것)와 비교해 느려진 항목을 표시하므로 커밋 사이의 성능 저하를
+확인할 수 있습니다.
+
+실행 방법:
+    python benchmarks/run.py                         # 전체 측정 후 저장, 직전 결과와 비교
+    python benchmarks/run.py --sizes 50,500 --only parse,search
+    python benchmarks/run.py --fixtures fixtures     # 기록한 응답으로도 측정
+    python benchmarks/run.py --compare abc1234 --fail-on-regression
+"""
+# 필요한 라이브러리 임포트
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_SIZES = (50, 500, 5000)
+DEFAULT_THRESHOLD = 0.10  # 이보다 더 느려지면 성능 저하로 표시 (10%)
+
+# 검색 벤치마크에서 한 번에 모두 찾는 검색어 (접두어, 오타, 부분 문자열, 결과 없음)
+SEARCH_TERMS = ("합성", "채널 1", "동영샹", "video", "존재하지않는검색어")
+
+
+# ====================================
+# 데이터
+# ====================================
+def synthetic_payload(count):
+    """mock_api의 합성 데이터로 만든 videos.list 항목 count개"""
+    from mock_api import synthetic_item
+
+    return [synthetic_item(f"bench{i:06d}", i) for i in range(count)]
+
+
+def recorded_payload(directory, count):
+    """기록한 fixture의 videos.list 항목을 count개가 될 때까지 반복해 이어 붙인 목록"""
+    from mock_api import FixtureStore
+
+    items = list(FixtureStore(directory).videos.values())
+    if not items:
+        raise SystemExit(f"{directory}에 videos.list fixture가 없습니다.")
+    repeated = items * math.ceil(count / len(items))
+    return [dict(item, id=f"{item['id']}-{i}") for i, item in enumerate(repeated[:count])]
+
+
+class PayloadClient:
+    """request_video_page()에 넘길 가짜 클라이언트 (미리 만든 응답 본문을 돌려줌)"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, resource, params, fields=None, etag=None):
+        return self.body
+
+
+# ====================================
+# 측정 대상
+# ====================================
+def build_cases(items):
+    """
+    동영상 목록 하나에 대한 벤치마크 함수들
+
+    Returns:
+        dict: {이름: 인자 없이 호출할 함수}
+    """
+    import streamlit_app
+    from formatting import format_counts, format_durations, relative_times
+    from models import Video
+    from popular import PAGE_SIZE, request_video_page
+    from search_index import SearchIndex
+
+    bodies = [
+        {'items': items[start:start + PAGE_SIZE], 'etag': str(start)}
+        for start in range(0, len(items), PAGE_SIZE)
+    ]
+    clients = [PayloadClient(body) for body in bodies]
+    videos = [Video.from_api_item(item) for item in items]
+    index = SearchIndex(videos)
+
+    def parse():
+        # 응답 파싱 → 디스크 캐시용 딕셔너리 → 화면용 Video (get_popular_videos 경로)
+        for client in clients:
+            page = request_video_page(client, 'KR', 'mostPopular')
+            [Video.from_dict(video) for video in page['videos']]
+
+    def search():
+        for term in SEARCH_TERMS:
+            index.search(term)
+
+    def fmt():
+        format_counts(video.view_count for video in videos)
+        format_counts(video.like_count for video in videos)
+        format_counts(video.comment_count for video in videos)
+        format_durations(video.duration for video in videos)
+        relative_times(video.published_at for video in videos)
+
+    return {
+        'parse': parse,
+        'totals': lambda: streamlit_app.compute_totals(videos),
+        'search_index': lambda: SearchIndex(videos),
+        'search': search,
+        'format': fmt,
+        'card_html': lambda: [streamlit_app.create_video_card(video, rank) for rank, video in enumerate(videos, 1)],
+        'grid_html': lambda: streamlit_app.build_video_grid_html(videos, 4),
+    }
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    func 한 번의 소요 시간 (초)
+
+    min_time 이상 걸리도록 반복 횟수를 정한 뒤 repeat번 재서 중앙값과 최솟값을 구합니다.
+    """
+    func()  # 준비 실행 (지연 import, 메모이제이션 채우기)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {'median': statistics.median(timings), 'min': min(timings), 'number': number}
+
+
+# ====================================
+# 결과 저장/비교
+# ====================================
+def git_revision():
+    """현재 커밋의 짧은 해시 (작업 중인 변경이 있으면 '-dirty' 붙임, git이 없으면 'local')"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def load_results(revision=None, exclude=None):
+    """저장된 결과 하나 (revision이 없으면 exclude가 아닌 가장 최근 결과, 없으면 None)"""
+    if revision:
+        path = os.path.join(RESULTS_DIR, f"{revision}.json")
+        if not os.path.exists(path):
+            raise SystemExit(f"저장된 결과가 없습니다: {path}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    candidates = []
+    for path in glob.glob(os.path.join(RESULTS_DIR, "*.json")):
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+        if results['revision'] != exclude:
+            candidates.append(results)
+    return max(candidates, key=lambda results: results['created_at'], default=None)
+
+
+def compare(current, baseline, threshold):
+    """
+    기준 결과와 비교한 표를 출력하고 느려진 항목 수를 반환하는 함수
+
+    중앙값이 threshold 비율보다 더 커진 항목을 성능 저하로 봅니다.
+    """
+    print(f"\n기준: {baseline['revision']} ({baseline['created_at']})")
+    print(f"{'항목':<34}{'기준(µs)':>12}{'현재(µs)':>12}{'변화':>9}")
+    regressions = 0
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if before is None:
+            continue
+        change = result['median'] / before['median'] - 1
+        mark = ""
+        if change > threshold:
+            mark = "  ▲ 느려짐"
+            regressions += 1
+        elif change < -threshold:
+            mark = "  ▼ 빨라짐"
+        print(f"{name:<34}{before['median'] * 1e6:>12.1f}{result['median'] * 1e6:>12.1f}{change:>+9.1%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="단계별 벤치마크를 실행하고 커밋별로 저장합니다.")
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)),
+                        help="쉼표로 구분한 동영상 수 (기본값: 50,500,5000)")
+    parser.add_argument('--only', help="쉼표로 구분한 측정 항목 (parse,totals,search_index,search,format,card_html,grid_html)")
+    parser.add_argument('--fixtures', help="기록한 fixture 디렉터리 (지정하면 recorded 데이터로도 측정)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="항목별 최소 측정 시간 (초)")
+    parser.add_argument('--compare', help="비교할 저장된 결과의 커밋 (기본값: 가장 최근 결과)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="성능 저하로 볼 중앙값 증가 비율 (기본값: 0.10)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="느려진 항목이 있으면 종료 코드 1")
+    parser.add_argument('--no-save', action='store_true', help="결과를 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    # streamlit_app을 런타임 없이 불러올 때 나오는 경고를 숨깁니다.
+    logging.disable(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    only = set(args.only.split(",")) if args.only else None
+    datasets = [('synthetic', synthetic_payload)]
+    if args.fixtures:
+        datasets.append(('recorded', lambda count: recorded_payload(args.fixtures, count)))
+
+    revision = git_revision()
+    current = {
+        'revision': revision,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'benchmarks': {},
+    }
+    print(f"{'항목':<34}{'중앙값(µs)':>14}{'최소(µs)':>12}{'반복':>8}")
+    for dataset, make_payload in datasets:
+        for size in sizes:
+            for case, func in build_cases(make_payload(size)).items():
+                if only and case not in only:
+                    continue
+                name = f"{case}[{dataset}-{size}]"
+                result = measure(func, args.min_time)
+                current['benchmarks'][name] = result
+                print(f"{name:<34}{result['median'] * 1e6:>14.1f}{result['min'] * 1e6:>12.1f}{result['number']:>8}")
+
+    regressions = 0
+    baseline = load_results(args.compare, exclude=revision)
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{revision}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n저장: {os.path.relpath(path, REPO_ROOT)}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# 필요한 라이브러리 임포트
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from instrumentation import REGISTRY
+from singleflight import SingleFlight
+
+# ====================================
+# 디스크 캐시 설정
+# ====================================
+# 같은 호스트의 모든 워커 프로세스가 하나의 SQLite 파일을 공유합니다.
+DEFAULT_CACHE_PATH = os.path.join(".cache", "youtube_cache.sqlite3")
+
+# fetch()가 "변경 없음"(HTTP 304)을 알릴 때 반환하는 값
+NOT_MODIFIED = object()
+
+
+class CacheEntry:
+    """디스크 캐시에 저장된 항목 하나 (값 + TTL 메타데이터)"""
+
+    __slots__ = ("key", "value", "stored_at", "expires_at")
+
+    def __init__(self, key, value, stored_at, expires_at):
+        self.key = key
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def age(self):
+        """저장된 뒤 지난 시간 (초)"""
+        return time.time() - self.stored_at
+
+    @property
+    def is_fresh(self):
+        """TTL이 아직 지나지 않았는지 여부"""
+        return time.time() < self.expires_at
+
+
+class DiskCache:
+    """
+    SQLite 기반의 영속 캐시
+
+    프로세스 메모리에 있는 st.cache_data 아래에 놓이는 두 번째 캐시 계층입니다.
+    재시작하거나 워커가 여러 개여도 같은 파일을 읽으므로, 마지막으로 받아 둔
+    결과를 바로 보여줄 수 있습니다. TTL이 지난 항목은 stale_ttl 동안 그대로
+    반환하면서 백그라운드에서 다시 가져옵니다 (stale-while-revalidate).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("YOUTUBE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        self._refreshing = set()  # 이 프로세스에서 재검증 중인 키
+        self._flight = SingleFlight()  # 같은 키의 동시 조회를 하나로 합침
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    refresh_lease REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+
+    def _connect(self):
+        # 연결은 스레드 간에 공유하지 않고 호출마다 새로 엽니다.
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key):
+        """
+        키에 해당하는 항목을 반환합니다 (만료 여부와 관계없이)
+
+        Returns:
+            CacheEntry or None: 저장된 항목, 없으면 None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value, stored_at, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return CacheEntry(key, value, row[1], row[2])
+
+    def set(self, key, value, ttl):
+        """값을 저장하고 ttl초 뒤에 만료되도록 표시합니다."""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO entries (key, value, stored_at, expires_at, refresh_lease)
+                VALUES (?, ?, ?, ?, 0)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    stored_at = excluded.stored_at,
+                    expires_at = excluded.expires_at,
+                    refresh_lease = 0
+                """,
+                (key, payload, now, now + ttl),
+            )
+
+    def touch(self, key, ttl):
+        """
+        값은 그대로 두고 수명만 연장합니다 (변경 없음 응답을 받았을 때).
+
+        방금 서버에서 최신임을 확인했으므로 저장 시각도 지금으로 갱신합니다.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                UPDATE entries SET stored_at = ?, expires_at = ?, refresh_lease = 0
+                WHERE key = ?
+                """,
+                (now, now + ttl, key),
+            )
+
+    def delete(self, key):
+        """항목을 삭제합니다."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _acquire_refresh_lease(self, key, lease_seconds):
+        """
+        여러 프로세스 중 하나만 재검증하도록 짧은 임대(lease)를 잡습니다.
+
+        Returns:
+            bool: 임대를 얻었으면 True
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE entries SET refresh_lease = ? WHERE key = ? AND refresh_lease < ?",
+                (now + lease_seconds, key, now),
+            )
+            return cursor.rowcount == 1
+
+    def _store(self, key, value, ttl):
+        """fetch() 결과를 반영합니다. 저장했거나 수명을 연장했으면 True"""
+        if value is NOT_MODIFIED:
+            self.touch(key, ttl)
+            return True
+        # 빈 결과는 마지막으로 받아 둔 정상 데이터를 덮어쓰지 않습니다.
+        if value:
+            self.set(key, value, ttl)
+            return True
+        return False
+
+    def _fetch_and_store(self, key, entry, fetch, ttl):
+        value = fetch(entry)
+        return value, self._store(key, value, ttl)
+
+    def _revalidate(self, key, entry, fetch, ttl):
+        try:
+            self._store(key, fetch(entry), ttl)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _revalidate_in_background(self, key, entry, fetch, ttl):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        if not self._acquire_refresh_lease(key, lease_seconds=30):
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+        thread = threading.Thread(
+            target=self._revalidate, args=(key, entry, fetch, ttl), daemon=True
+        )
+        thread.start()
+
+    def refresh(self, key, fetch, ttl):
+        """
+        TTL과 관계없이 fetch()로 다시 가져와 저장합니다 (새로고침/미리 가져오기용).
+
+        진행 중인 get_or_fetch()/refresh()가 같은 키를 가져오고 있으면 그 결과를 함께 씁니다.
+
+        Returns:
+            갱신된 값 (바뀌지 않았으면 기존 값), 가져오지 못했으면 None
+        """
+        entry = self.get(key)
+        (value, stored), coalesced = self._flight.do(
+            key, lambda: self._fetch_and_store(key, entry, fetch, ttl)
+        )
+        REGISTRY.record_cache("disk", "coalesced" if coalesced else "refresh")
+        if not stored:
+            return None
+        if value is NOT_MODIFIED:
+            return entry.value if entry is not None else None
+        return value
+
+    def get_or_fetch(self, key, fetch, ttl, stale_ttl):
+        """
+        캐시에서 값을 가져오고, 없으면 fetch()로 가져와 저장합니다.
+
+        fetch는 기존 항목(CacheEntry 또는 None)을 인자로 받으므로 조건부 요청
+        (If-None-Match)을 보낼 수 있고, 변경이 없으면 NOT_MODIFIED를 반환해
+        기존 값의 수명만 연장할 수 있습니다. 같은 키를 동시에 놓친 호출들은 fetch()를
+        한 번만 실행하고 그 결과를 함께 받습니다.
+
+        Args:
+            key (str): 캐시 키
+            fetch (callable): fetch(entry) -> 새 값 또는 NOT_MODIFIED
+            ttl (int): 신선한 것으로 간주하는 시간 (초)
+            stale_ttl (int): 만료 후에도 재검증하며 반환할 수 있는 시간 (초)
+
+        Returns:
+            값 (fetch()가 반환하는 것과 같은 형태)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            if entry.is_fresh:
+                REGISTRY.record_cache("disk", "hit")
+                return entry.value
+            if time.time() < entry.expires_at + stale_ttl:
+                # 오래된 값을 바로 반환하고 새 값은 백그라운드에서 가져옵니다.
+                REGISTRY.record_cache("disk", "stale")
+                self._revalidate_in_background(key, entry, fetch, ttl)
+                return entry.value
+
+        # 여러 세션이 동시에 같은 키를 놓치면 한 번만 가져오고 나머지는 결과를 기다립니다.
+        (value, stored), coalesced = self._flight.do(
+            key, lambda: self._fetch_and_store(key, entry, fetch, ttl)
+        )
+        REGISTRY.record_cache("disk", "coalesced" if coalesced else "miss")
+        if stored and value is not NOT_MODIFIED:
+            return value
+        if entry is not None:
+            # 변경이 없거나 새로 가져오지 못했으면 기존 데이터를 보여줍니다.
+            return entry.value
+        return value
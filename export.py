@@ -0,0 +1,273 @@
+"""
+인기 동영상 일괄 내보내기 (Streamlit 없이 실행)
+
+여러 국가/정렬 조합을 병렬로 가져와 JSONL, CSV 또는 Parquet 파일로 저장합니다.
+cron이나 작업 큐에서 실행하는 용도이며, 페이지를 받는 대로 바로 기록하므로
+가져오는 페이지 수와 관계없이 메모리 사용량이 일정합니다.
+
+실행 방법:
+    python export.py --output popular.jsonl
+    python export.py --regions KR,US --orders mostPopular,date --max-results 200 \\
+        --format parquet --output popular.parquet --history
+    python export.py --format csv --output -        # 표준 출력으로
+"""
+# 필요한 라이브러리 임포트
+import argparse
+import csv
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from history import HistoryStore
+from popular import ORDERS, PAGE_SIZE, REGION_CODES, iter_video_pages
+from quota import ApiKeyPool
+from recording import FixtureRecorder
+from youtube_client import YouTubeClient
+
+logger = logging.getLogger("export")
+
+# ====================================
+# 출력 형식
+# ====================================
+# 내보내는 행의 열 (순서 유지)
+COLUMNS = (
+    'fetched_at', 'region', 'order', 'rank', 'id', 'title', 'channel', 'url', 'thumbnail',
+    'view_count', 'like_count', 'comment_count', 'published_at', 'duration',
+)
+
+
+def video_row(video, region_code, order, rank, fetched_at):
+    """Video 하나를 내보낼 행(딕셔너리)으로 변환하는 함수"""
+    return {
+        'fetched_at': fetched_at,
+        'region': region_code,
+        'order': order,
+        'rank': rank,
+        'id': video.id,
+        'title': video.title,
+        'channel': video.channel,
+        'url': video.url,
+        'thumbnail': video.thumbnail,
+        'view_count': video.view_count,
+        'like_count': video.like_count,
+        'comment_count': video.comment_count,
+        'published_at': video.published_at.isoformat() if video.published_at else None,
+        'duration': video.duration,
+    }
+
+
+class JsonlWriter:
+    """한 줄에 행 하나씩 JSON으로 기록"""
+
+    def __init__(self, output):
+        self.file = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class CsvWriter:
+    """COLUMNS 순서의 CSV로 기록 (첫 줄은 머리글)"""
+
+    def __init__(self, output):
+        self.file = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ParquetWriter:
+    """페이지마다 Parquet 행 그룹 하나로 기록 (pyarrow 필요)"""
+
+    def __init__(self, output):
+        if output == '-':
+            raise SystemExit("Parquet 형식은 파일로만 저장할 수 있습니다 (--output 경로 지정).")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet 형식을 사용하려면 pyarrow를 설치하세요: pip install pyarrow")
+        self.pa = pa
+        self.schema = pa.schema([
+            ('fetched_at', pa.string()),
+            ('region', pa.string()),
+            ('order', pa.string()),
+            ('rank', pa.int32()),
+            ('id', pa.string()),
+            ('title', pa.string()),
+            ('channel', pa.string()),
+            ('url', pa.string()),
+            ('thumbnail', pa.string()),
+            ('view_count', pa.int64()),
+            ('like_count', pa.int64()),
+            ('comment_count', pa.int64()),
+            ('published_at', pa.string()),
+            ('duration', pa.int32()),
+        ])
+        self.writer = pq.ParquetWriter(output, self.schema)
+
+    def write(self, rows):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {'jsonl': JsonlWriter, 'csv': CsvWriter, 'parquet': ParquetWriter}
+
+
+# ====================================
+# 수집
+# ====================================
+_DONE = object()  # 조합 하나를 끝냈다는 표시
+
+
+def export(targets, writer, max_results, workers=4, history=None, client=None):
+    """
+    (지역, 정렬) 조합을 병렬로 가져와 writer에 기록하는 함수
+
+    작업 스레드는 페이지를 크기가 제한된 큐에 넣고, 호출한 스레드 하나만 파일에
+    씁니다. 큐가 가득 차면 작업 스레드가 기다리므로 메모리에는 최대
+    (workers * 2)개 페이지만 머뭅니다.
+
+    Args:
+        targets (list): (region_code, order) 튜플의 리스트
+        writer: write(rows)/close()를 가진 출력 객체
+        max_results (int): 조합별로 가져올 동영상 수
+        workers (int): 동시에 가져올 조합 수
+        history (HistoryStore): 주어지면 인기순 페이지를 차트 기록에도 저장
+        client (YouTubeClient): API 클라이언트 (기본값: 환경 변수의 키 풀을 쓰는 새 클라이언트)
+
+    Returns:
+        dict: {(region_code, order): 기록한 동영상 수, 실패했으면 예외 객체}
+    """
+    client = client or YouTubeClient(pool_maxsize=workers, keys=ApiKeyPool.from_env(),
+                                     recorder=FixtureRecorder.from_env())
+    pages = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()  # 기록 쪽에서 오류가 나면 작업 스레드를 멈춤
+
+    def collect(target):
+        region_code, order = target
+        count = 0
+        captured_at = time.time()  # 페이지들을 차트 스냅샷 하나로 기록
+        try:
+            for page_index, videos in iter_video_pages(
+                client, region_code, order, max_results,
+                on_warning=lambda message: logger.warning("%s/%s: %s", region_code, order, message),
+            ):
+                if stop.is_set():
+                    break
+                fetched_at = datetime.now(timezone.utc).isoformat()
+                start_rank = page_index * PAGE_SIZE + 1
+                if history is not None and order == 'mostPopular':
+                    history.record(region_code, videos, start_rank=start_rank, captured_at=captured_at)
+                rows = [
+                    video_row(video, region_code, order, start_rank + offset, fetched_at)
+                    for offset, video in enumerate(videos)
+                ]
+                pages.put(rows)
+                count += len(rows)
+            return count
+        except Exception as e:
+            logger.error("%s/%s: %s", region_code, order, e)
+            return e
+        finally:
+            pages.put(_DONE)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as executor:
+        futures = {target: executor.submit(collect, target) for target in targets}
+        remaining = len(targets)
+        try:
+            while remaining:
+                rows = pages.get()
+                if rows is _DONE:
+                    remaining -= 1
+                    continue
+                writer.write(rows)
+        except BaseException:
+            stop.set()
+            # 작업 스레드가 put()에서 막히지 않도록 큐를 비웁니다.
+            while remaining:
+                if pages.get() is _DONE:
+                    remaining -= 1
+            raise
+        for target, future in futures.items():
+            results[target] = future.result()
+            if not isinstance(results[target], Exception):
+                logger.info("%s/%s: %d개", target[0], target[1], results[target])
+    return results
+
+
+def parse_list(value, choices):
+    """쉼표로 구분된 목록을 검사해 튜플로 변환 (argparse type 용)"""
+    items = tuple(item.strip() for item in value.split(',') if item.strip())
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"알 수 없는 값: {', '.join(unknown)} (가능한 값: {', '.join(choices)})")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube 인기 동영상을 파일로 내보냅니다.")
+    parser.add_argument('--regions', type=lambda v: parse_list(v, REGION_CODES), default=REGION_CODES,
+                        help="쉼표로 구분한 지역 코드 (기본값: 전체)")
+    parser.add_argument('--orders', type=lambda v: parse_list(v, ORDERS), default=('mostPopular',),
+                        help="쉼표로 구분한 정렬 기준 (기본값: mostPopular)")
+    parser.add_argument('--max-results', type=int, default=PAGE_SIZE,
+                        help="조합별로 가져올 동영상 수 (기본값: 50)")
+    parser.add_argument('--format', choices=sorted(WRITERS), default=None,
+                        help="출력 형식 (기본값: 출력 파일 확장자, 없으면 jsonl)")
+    parser.add_argument('--output', '-o', default='-', help="출력 파일 경로 ('-'는 표준 출력)")
+    parser.add_argument('--workers', type=int, default=4, help="동시에 가져올 조합 수 (기본값: 4)")
+    parser.add_argument('--history', action='store_true',
+                        help="인기순 결과를 차트 기록(history.sqlite3)에도 저장")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s", stream=sys.stderr)
+    load_dotenv()
+    key_pool = ApiKeyPool.from_env()
+    if key_pool is None:
+        parser.error("YouTube API 키가 설정되지 않았습니다. .env 파일에 YOUTUBE_API_KEY를 추가해주세요.")
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip('.') or 'jsonl'
+    if output_format not in WRITERS:
+        parser.error(f"알 수 없는 출력 형식입니다: {output_format}")
+
+    targets = [(region_code, order) for region_code in args.regions for order in args.orders]
+    writer = WRITERS[output_format](args.output)
+    try:
+        results = export(
+            targets, writer, args.max_results, workers=args.workers,
+            history=HistoryStore() if args.history else None,
+            client=YouTubeClient(pool_maxsize=args.workers, keys=key_pool, recorder=FixtureRecorder.from_env()),
+        )
+    finally:
+        writer.close()
+    failed = [target for target, result in results.items() if isinstance(result, Exception)]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+화면 표시용 숫자/길이/게시 시간 포맷팅 (Streamlit 없이 사용 가능)
+
+카드 하나에 여러 번, 재실행마다 수백 번 호출되는 함수들이므로 st.cache_data처럼
+인자를 해시하고 결과를 피클링하는 캐시 대신 프로세스 안의 functools.lru_cache를
+사용합니다. 목록 전체를 한 번에 포맷팅하는 format_counts/format_durations/
+relative_times는 현재 시각을 한 번만 구합니다.
+"""
+# 필요한 라이브러리 임포트
+from datetime import datetime, timezone
+from functools import lru_cache
+
+# ====================================
+# 포맷팅 설정
+# ====================================
+_HUNDRED_MILLION = 100000000
+_TEN_THOUSAND = 10000
+
+# 메모이즈할 서로 다른 값의 최대 개수 (인기 차트 몇 개 분량)
+MEMO_SIZE = 4096
+
+UNKNOWN_COUNT = "조회수 정보 없음"
+
+
+# ====================================
+# 값 하나 포맷팅
+# ====================================
+@lru_cache(maxsize=MEMO_SIZE)
+def _format_count(count):
+    # 1억 이상인 경우
+    if count >= _HUNDRED_MILLION:
+        # 1억 이상 1억 1만 미만: '1억회'로 표시
+        # 1억 1만 이상: '1억 1,234만회'로 표시
+        remainder = count % _HUNDRED_MILLION
+        if remainder >= _TEN_THOUSAND:
+            return f"{count // _HUNDRED_MILLION}억{remainder // _TEN_THOUSAND:,}만회"
+        return f"{count // _HUNDRED_MILLION}억회"
+    # 1만 이상 1억 미만
+    if count >= _TEN_THOUSAND:
+        return f"{count // _TEN_THOUSAND:,}만회"
+    # 1만 미만
+    return f"{count:,}회"
+
+
+def format_view_count(view_count):
+    """
+    조회수를 한국식 형식으로 포맷팅하는 함수
+
+    Args:
+        view_count (str or int): 포맷팅할 조회수
+
+    Returns:
+        str: 포맷팅된 조회수 (예: '1.2만회', '1억 2,345만회')
+    """
+    try:
+        count = int(view_count)
+    except (ValueError, TypeError):
+        return UNKNOWN_COUNT
+    return _format_count(count)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def format_duration(duration):
+    """
+    동영상 길이(초)를 읽기 쉬운 형태로 변환 (예: 253 → '4:13')
+    """
+    if not duration:
+        return ""
+
+    hours, remainder = divmod(duration, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def get_relative_time(published_at, now=None, years=False):
+    """
+    게시일(UTC datetime)을 상대적 시간으로 변환
+
+    Args:
+        published_at (datetime): 게시일 (없으면 빈 문자열 반환)
+        now (datetime): 기준 시각 (기본값: 현재 시각)
+        years (bool): 1년이 넘으면 'N년 전'으로 표시
+
+    Returns:
+        str: '3일 전', '5시간 전', '방금 전' 등
+    """
+    if published_at is None:
+        return ""
+    try:
+        diff = (now or datetime.now(published_at.tzinfo)) - published_at
+    except (TypeError, AttributeError):
+        return ""
+
+    if diff.days > 0:
+        if years and diff.days > 365:
+            return f"{diff.days // 365}년 전"
+        return f"{diff.days}일 전"
+    elif diff.seconds > 3600:
+        return f"{diff.seconds // 3600}시간 전"
+    elif diff.seconds > 60:
+        return f"{diff.seconds // 60}분 전"
+    return "방금 전"
+
+
+# ====================================
+# 열 단위 포맷팅
+# ====================================
+def format_counts(values):
+    """조회수/좋아요/댓글 수 목록을 한 번에 포맷팅하는 함수"""
+    return [format_view_count(value) for value in values]
+
+
+def format_durations(values):
+    """동영상 길이(초) 목록을 한 번에 포맷팅하는 함수"""
+    return [format_duration(value) for value in values]
+
+
+def relative_times(values, now=None, years=False):
+    """
+    게시일 목록을 한 번에 상대적 시간으로 변환하는 함수
+
+    모든 항목에 같은 기준 시각을 쓰므로 목록 안에서 순서가 뒤바뀌지 않습니다.
+
+    Args:
+        values (iterable): UTC datetime (또는 None) 목록
+        now (datetime): 기준 시각 (기본값: 현재 UTC 시각)
+        years (bool): get_relative_time()과 같음
+    """
+    now = now or datetime.now(timezone.utc)
+    return [get_relative_time(value, now, years) for value in values]
@@ -0,0 +1,245 @@
+# 필요한 라이브러리 임포트
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import numpy as np
+
+# ====================================
+# 차트 기록 설정
+# ====================================
+DEFAULT_HISTORY_PATH = os.path.join(".cache", "history.sqlite3")
+
+# 이보다 오래 차트에서 보이지 않았다가 다시 나타나면 그 사이는 차트 체류 시간에 넣지 않습니다.
+MAX_GAP_SECONDS = 3 * 3600
+
+# metrics()가 반환하는 열 이름
+METRIC_COLUMNS = (
+    "video_id", "title", "rank", "best_rank", "rank_delta", "views",
+    "views_per_hour", "avg_views_per_hour", "hours_on_chart", "first_seen", "last_seen",
+)
+
+
+class HistoryStore:
+    """
+    인기 차트 스냅샷을 계속 쌓아 두는 SQLite 저장소
+
+    가져올 때마다 (지역, 시각, 동영상) 단위로 순위와 조회수를 snapshots 테이블에
+    추가만 하고, 동영상별 최신/직전 값은 chart_state 테이블에서 같은 트랜잭션으로
+    갱신합니다. 지표는 chart_state만 읽어 NumPy로 한 번에 계산하므로, 기록이
+    몇 달 쌓여도 화면을 그릴 때 과거 스냅샷을 다시 훑지 않습니다.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): SQLite 파일 경로 (기본값: YOUTUBE_HISTORY_PATH 또는 .cache/history.sqlite3)
+        """
+        self.path = path or os.getenv("YOUTUBE_HISTORY_PATH", DEFAULT_HISTORY_PATH)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    region TEXT NOT NULL,
+                    captured_at REAL NOT NULL,
+                    video_id TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    view_count INTEGER NOT NULL,
+                    like_count INTEGER NOT NULL,
+                    comment_count INTEGER NOT NULL,
+                    PRIMARY KEY (region, captured_at, video_id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chart_state (
+                    region TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    first_views INTEGER NOT NULL,
+                    captured_at REAL NOT NULL,
+                    rank INTEGER NOT NULL,
+                    views INTEGER NOT NULL,
+                    prev_captured_at REAL,
+                    prev_rank INTEGER,
+                    prev_views INTEGER,
+                    best_rank INTEGER NOT NULL,
+                    on_chart_seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (region, video_id)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS chart_state_seen ON chart_state (region, captured_at)"
+            )
+
+    def _connect(self):
+        # 연결은 스레드 간에 공유하지 않고 호출마다 새로 엽니다.
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, region, videos, start_rank=1, captured_at=None):
+        """
+        인기 차트 한 페이지를 기록합니다.
+
+        Args:
+            region (str): 지역 코드
+            videos (list): 차트 순서대로 정렬된 Video 리스트
+            start_rank (int): 첫 동영상의 순위 (두 번째 페이지면 51)
+            captured_at (float): 가져온 시각 (기본값: 현재 시각)
+                한 번에 가져온 여러 페이지는 같은 값을 넘겨야 스냅샷 하나로 묶입니다.
+        """
+        if not videos:
+            return
+        captured_at = captured_at or time.time()
+        rows = [
+            (region, captured_at, video.id, start_rank + offset,
+             video.view_count, video.like_count, video.comment_count, video.title)
+            for offset, video in enumerate(videos)
+        ]
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO snapshots "
+                "(region, captured_at, video_id, rank, view_count, like_count, comment_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [row[:7] for row in rows],
+            )
+            # 기존 값은 직전 값으로 옮기고, 연속으로 보인 구간만 체류 시간에 더합니다.
+            # (SET의 오른쪽에 있는 열은 갱신 전 값을 가리킵니다.)
+            conn.executemany(
+                """
+                INSERT INTO chart_state (
+                    region, video_id, title, first_seen, first_views,
+                    captured_at, rank, views, best_rank
+                )
+                VALUES (:region, :video_id, :title, :captured_at, :views,
+                        :captured_at, :rank, :views, :rank)
+                ON CONFLICT (region, video_id) DO UPDATE SET
+                    title = excluded.title,
+                    prev_captured_at = captured_at,
+                    prev_rank = rank,
+                    prev_views = views,
+                    on_chart_seconds = on_chart_seconds + CASE
+                        WHEN excluded.captured_at - captured_at <= :max_gap
+                        THEN excluded.captured_at - captured_at ELSE 0 END,
+                    captured_at = excluded.captured_at,
+                    rank = excluded.rank,
+                    views = excluded.views,
+                    best_rank = MIN(best_rank, excluded.rank)
+                WHERE excluded.captured_at > captured_at
+                """,
+                [
+                    {
+                        "region": region, "video_id": video_id, "title": title,
+                        "captured_at": at, "rank": rank, "views": views,
+                        "max_gap": MAX_GAP_SECONDS,
+                    }
+                    for region, at, video_id, rank, views, _, _, title in rows
+                ],
+            )
+
+    def metrics(self, region, since=None, now=None):
+        """
+        지역의 동영상별 차트 지표를 계산합니다.
+
+        Args:
+            region (str): 지역 코드
+            since (float): 이 시각 이후에 차트에서 보인 동영상만 (기본값: 전체)
+            now (float): 체류 시간 계산 기준 시각 (기본값: 현재 시각)
+
+        Returns:
+            dict: METRIC_COLUMNS 이름별 NumPy 배열. 값이 없으면 NaN입니다.
+                rank_delta: 직전 기록 대비 오른 순위 (양수면 상승)
+                views_per_hour: 직전 기록 이후 시간당 조회수 증가량
+                avg_views_per_hour: 처음 본 뒤 시간당 조회수 증가량
+                hours_on_chart: 연속으로 차트에 머문 누적 시간
+        """
+        query = (
+            "SELECT video_id, title, first_seen, first_views, captured_at, rank, views, "
+            "prev_captured_at, prev_rank, prev_views, best_rank, on_chart_seconds "
+            "FROM chart_state WHERE region = ?"
+        )
+        params = [region]
+        if since is not None:
+            query += " AND captured_at >= ?"
+            params.append(since)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY rank", params).fetchall()
+
+        columns = list(zip(*rows)) if rows else [()] * 12
+        (video_ids, titles, first_seen, first_views, captured_at, rank, views,
+         prev_captured_at, prev_rank, prev_views, best_rank, on_chart_seconds) = columns
+
+        def floats(values):
+            # None(직전 기록 없음)은 NaN으로 바뀝니다.
+            return np.array(values, dtype=float)
+
+        first_seen = floats(first_seen)
+        captured_at = floats(captured_at)
+        rank = floats(rank)
+        views = floats(views)
+        prev_captured_at = floats(prev_captured_at)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            interval_hours = (captured_at - prev_captured_at) / 3600
+            views_per_hour = (views - floats(prev_views)) / interval_hours
+            span_hours = (captured_at - first_seen) / 3600
+            avg_views_per_hour = np.where(
+                span_hours > 0, (views - floats(first_views)) / span_hours, np.nan
+            )
+
+        return {
+            "video_id": np.array(video_ids, dtype=object),
+            "title": np.array(titles, dtype=object),
+            "rank": rank,
+            "best_rank": floats(best_rank),
+            "rank_delta": floats(prev_rank) - rank,
+            "views": views,
+            "views_per_hour": views_per_hour,
+            "avg_views_per_hour": avg_views_per_hour,
+            "hours_on_chart": floats(on_chart_seconds) / 3600,
+            "first_seen": first_seen,
+            "last_seen": captured_at,
+        }
+
+    def top_movers(self, region, by="views_per_hour", limit=10, since=None):
+        """
+        지표 하나를 기준으로 상위 동영상을 고르는 함수 (값이 없는 동영상은 제외)
+
+        Args:
+            region (str): 지역 코드
+            by (str): 정렬 기준 지표 (METRIC_COLUMNS 중 숫자 열)
+            limit (int): 반환할 동영상 수
+            since (float): 이 시각 이후에 차트에서 보인 동영상만
+
+        Returns:
+            dict: metrics()와 같은 형식으로, by 내림차순으로 정렬된 상위 limit개
+        """
+        metrics = self.metrics(region, since=since)
+        values = metrics[by]
+        valid = np.flatnonzero(~np.isnan(values))
+        # 동률이면 현재 순위가 높은 쪽이 먼저 오도록 안정 정렬합니다.
+        order = valid[np.argsort(-values[valid], kind="stable")][:limit]
+        return {name: column[order] for name, column in metrics.items()}
+
+    def has_previous(self, region):
+        """
+        지역에 직전 기록과 비교할 수 있는 동영상이 있는지 (스냅샷이 두 번 이상 쌓였는지)
+
+        기록 전체를 세지 않고 chart_state에서 직전 값이 있는 행 하나만 찾습니다.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM chart_state "
+                "WHERE region = ? AND prev_captured_at IS NOT NULL)",
+                (region,),
+            ).fetchone()
+        return bool(row[0])
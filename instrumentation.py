@@ -0,0 +1,213 @@
+"""
+단계별 소요 시간과 캐시 적중 여부 계측 (Streamlit 없이 사용 가능)
+
+프로세스 전체 누적값은 REGISTRY에 쌓이며 Prometheus 텍스트 형식으로 내보낼 수
+있습니다. 화면 한 번(재실행 한 번)의 값은 start_trace()로 시작한 RunTrace에
+따로 모입니다.
+"""
+# 필요한 라이브러리 임포트
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ====================================
+# 계측 설정
+# ====================================
+# 계측하는 단계
+PHASES = ('fetch', 'parse', 'stats', 'filter', 'render')
+
+# Prometheus 히스토그램 구간 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# /metrics 서버의 기본 바인드 주소 (로컬에서만 접근)
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+# 현재 재실행의 RunTrace (스레드로 넘길 때는 contextvars.copy_context() 사용)
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class RunTrace:
+    """재실행 한 번 동안의 단계별 소요 시간과 캐시 결과"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # 단계 → [횟수, 합계(초)]
+        self.cache = {}   # (계층, 결과) → 횟수
+        self._lock = threading.Lock()
+
+    def add_phase(self, phase, seconds):
+        with self._lock:
+            stat = self.phases.setdefault(phase, [0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+
+    def add_cache(self, tier, outcome):
+        with self._lock:
+            self.cache[(tier, outcome)] = self.cache.get((tier, outcome), 0) + 1
+
+    @property
+    def elapsed(self):
+        """시작한 뒤 지난 시간 (초)"""
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """로그로 남기기 좋은 딕셔너리"""
+        with self._lock:
+            return {
+                'total_ms': round(self.elapsed * 1000, 1),
+                'phases_ms': {phase: round(total * 1000, 1) for phase, (_, total) in self.phases.items()},
+                'cache': {f"{tier}.{outcome}": count for (tier, outcome), count in self.cache.items()},
+            }
+
+
+class Metrics:
+    """
+    프로세스 전체의 단계별 소요 시간 히스토그램과 캐시 적중 카운터
+
+    여러 세션과 백그라운드 스레드에서 동시에 기록하므로 잠금으로 보호합니다.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._phases = {}  # 단계 → {'count', 'sum', 'max', 'buckets'}
+        self._cache = {}   # (계층, 결과) → 횟수
+        self._lock = threading.Lock()
+
+    def observe(self, phase, seconds):
+        """단계 하나의 소요 시간을 기록합니다 (현재 RunTrace에도 더함)."""
+        with self._lock:
+            stat = self._phases.get(phase)
+            if stat is None:
+                stat = self._phases[phase] = {
+                    'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(self.buckets),
+                }
+            stat['count'] += 1
+            stat['sum'] += seconds
+            stat['max'] = max(stat['max'], seconds)
+            index = bisect.bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                stat['buckets'][index] += 1
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_phase(phase, seconds)
+
+    @contextmanager
+    def timer(self, phase):
+        """with 블록의 실행 시간을 phase로 기록하는 컨텍스트 관리자"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def record_cache(self, tier, outcome):
+        """
+        캐시 조회 결과를 기록합니다.
+
+        Args:
+            tier (str): 캐시 계층 ('memory', 'disk' 등)
+            outcome (str): 'hit', 'stale', 'miss' 등
+        """
+        with self._lock:
+            self._cache[(tier, outcome)] = self._cache.get((tier, outcome), 0) + 1
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_cache(tier, outcome)
+
+    def snapshot(self):
+        """현재 누적값의 복사본 {'phases': {...}, 'cache': {...}}"""
+        with self._lock:
+            return {
+                'phases': {
+                    phase: dict(stat, buckets=list(stat['buckets']))
+                    for phase, stat in self._phases.items()
+                },
+                'cache': dict(self._cache),
+            }
+
+    def render_prometheus(self):
+        """누적값을 Prometheus 텍스트 형식으로 변환합니다."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP youtube_app_phase_seconds Time spent in each phase.",
+            "# TYPE youtube_app_phase_seconds histogram",
+        ]
+        for phase, stat in sorted(snapshot['phases'].items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, stat['buckets']):
+                cumulative += count
+                lines.append(f'youtube_app_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'youtube_app_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {stat["count"]}')
+            lines.append(f'youtube_app_phase_seconds_sum{{phase="{phase}"}} {stat["sum"]:.6f}')
+            lines.append(f'youtube_app_phase_seconds_count{{phase="{phase}"}} {stat["count"]}')
+        lines += [
+            "# HELP youtube_app_cache_lookups_total Cache lookups by tier and outcome.",
+            "# TYPE youtube_app_cache_lookups_total counter",
+        ]
+        for (tier, outcome), count in sorted(snapshot['cache'].items()):
+            lines.append(f'youtube_app_cache_lookups_total{{tier="{tier}",outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전체에서 공유하는 계측값
+REGISTRY = Metrics()
+
+
+def start_trace():
+    """현재 컨텍스트에서 새 RunTrace를 시작하고 반환합니다."""
+    trace = RunTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    """현재 컨텍스트의 RunTrace (진행 중인 것이 없으면 None)"""
+    return _current_trace.get()
+
+
+def end_trace():
+    """현재 컨텍스트의 RunTrace를 끝냅니다 (이후 기록은 누적값에만 반영)."""
+    _current_trace.set(None)
+
+
+def serve_metrics(port, registry=REGISTRY, host=None):
+    """
+    /metrics 경로로 Prometheus 텍스트를 제공하는 HTTP 서버를 백그라운드에서 시작합니다.
+
+    내부 실행/할당량 지표가 노출되지 않도록 기본값은 로컬(127.0.0.1)에서만 받으며,
+    다른 호스트에서 수집해야 하면 YOUTUBE_METRICS_HOST로 바꿉니다.
+
+    Args:
+        port (int): 포트 번호
+        registry (Metrics): 제공할 계측값
+        host (str): 바인드할 주소 (기본값: YOUTUBE_METRICS_HOST 또는 127.0.0.1)
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (shutdown()으로 중지)
+
+    Raises:
+        OSError: 포트를 이미 다른 프로세스가 쓰는 경우 등
+    """
+    host = host or os.getenv("YOUTUBE_METRICS_HOST", DEFAULT_METRICS_HOST)
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # 스크레이프마다 로그를 남기지 않음
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,64 @@
+# 필요한 라이브러리 임포트
+import threading
+import time
+
+
+class RefreshTracker:
+    """
+    새로고침을 캐시 키 단위로 관리하는 클래스
+
+    키마다 세대 번호를 두고 새로고침이 끝나면 그 키의 번호만 올립니다. 메모리 캐시의
+    인자에 세대 번호를 넣으면 해당 키만 캐시를 건너뛰고, 다른 국가/정렬 조합과
+    다른 사용자의 캐시는 그대로 유지됩니다. 짧은 시간 안에 같은 키를 다시
+    새로고침하면 무시합니다(디바운스).
+    """
+
+    def __init__(self, debounce_seconds=10.0):
+        """
+        Args:
+            debounce_seconds (float): 같은 키의 새로고침을 무시할 시간 (초)
+        """
+        self.debounce_seconds = debounce_seconds
+        self._generations = {}
+        self._last_refresh = {}
+        self._lock = threading.Lock()
+
+    def generation(self, key):
+        """키의 현재 세대 번호 (한 번도 새로고침하지 않았으면 0)"""
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def is_debounced(self, key):
+        """
+        지금 새로고침을 요청하면 디바운스로 무시되는지 확인합니다 (상태는 바꾸지 않음).
+
+        Returns:
+            bool: 디바운스 시간 안에 이미 새로고침했으면 True
+        """
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_refresh.get(key)
+            return last is not None and now - last < self.debounce_seconds
+
+    def request(self, key):
+        """
+        키의 새로고침을 요청합니다 (디바운스만 확인하고 세대 번호는 그대로 둠).
+
+        새 데이터를 저장한 뒤 bump()를 호출해야 메모리 캐시가 새 세대로 넘어갑니다.
+        먼저 올리면 그사이 다른 세션이 이전 데이터를 새 세대로 저장할 수 있습니다.
+
+        Returns:
+            bool: 새로고침해야 하면 True, 디바운스 시간 안의 중복 요청이면 False
+        """
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_refresh.get(key)
+            if last is not None and now - last < self.debounce_seconds:
+                return False
+            self._last_refresh[key] = now
+            return True
+
+    def bump(self, key):
+        """새 데이터를 저장한 뒤 키의 세대 번호를 올립니다 (메모리 캐시 무효화)."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
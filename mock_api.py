@@ -0,0 +1,392 @@
+"""
+YouTube Data API 기록/재생 (할당량을 쓰지 않는 부하 테스트와 벤치마크용)
+
+record: 실제 API의 videos.list/search.list 응답을 fixture(JSON 파일)로 저장합니다.
+serve:  저장한 fixture(또는 합성 데이터)를 YouTube API처럼 돌려주는 로컬 HTTP 서버를
+        실행합니다. 지연 시간, 오류 비율, 할당량 소진, 페이지 크기를 조절할 수 있으며,
+        YOUTUBE_API_BASE_URL을 서버 주소로 지정하면 앱과 export.py가 그쪽을 호출합니다.
+
+실행 방법:
+    python mock_api.py record --output fixtures --regions KR,US --orders mostPopular,date
+    python mock_api.py serve --fixtures fixtures --port 8765 --latency 0.05 --error-rate 0.02
+    python mock_api.py serve --synthetic 200         # fixture 없이 지역마다 200개 합성
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8765/youtube/v3 YOUTUBE_API_KEY=mock streamlit run streamlit_app.py
+"""
+# 필요한 라이브러리 임포트
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from recording import FixtureRecorder
+
+# ====================================
+# 기록/재생 설정
+# ====================================
+API_PATH = "/youtube/v3"
+DEFAULT_PORT = 8765
+
+# 목록을 구분할 때 무시하는 매개변수 (키, 응답 모양, 페이지 위치)
+IGNORED_PARAMS = {"key", "fields", "part", "pageToken", "maxResults"}
+
+# 한 페이지의 최대 항목 수 (YouTube API 제한)
+MAX_PAGE_SIZE = 50
+
+
+def listing_key(resource, params):
+    """같은 목록(여러 페이지)을 가리키는 요청을 하나로 묶는 키"""
+    return (resource,) + tuple(sorted(
+        (name, value) for name, value in params.items() if name not in IGNORED_PARAMS
+    ))
+
+
+# ====================================
+# 기록
+# ====================================
+def record(directory, regions, orders, max_results, key_pool):
+    """
+    (지역, 정렬) 조합마다 max_results개까지 실제 API를 호출해 fixture로 저장하는 함수
+
+    Returns:
+        int: 저장한 동영상 수
+    """
+    from popular import iter_video_pages
+    from youtube_client import YouTubeClient
+
+    client = YouTubeClient(keys=key_pool, recorder=FixtureRecorder(directory).record)
+    total = 0
+    try:
+        for region_code in regions:
+            for order in orders:
+                for _, videos in iter_video_pages(client, region_code, order, max_results):
+                    total += len(videos)
+    finally:
+        client.close()
+    return total
+
+
+# ====================================
+# 재생 데이터
+# ====================================
+def synthetic_item(video_id, index):
+    """합성 videos.list 항목 하나 (index로 조회수/게시일 등을 정함)"""
+    published = datetime.now(timezone.utc) - timedelta(hours=index * 3 + 1)
+    return {
+        "kind": "youtube#video",
+        "id": video_id,
+        "snippet": {
+            "title": f"합성 동영상 {index} - {video_id}",
+            "channelTitle": f"채널 {index % 17}",
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "thumbnails": {
+                "medium": {"url": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"},
+                "high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"},
+            },
+        },
+        "statistics": {
+            "viewCount": str(10000000 // (index + 1) + index * 37),
+            "likeCount": str(100000 // (index + 1)),
+            "commentCount": str(5000 // (index + 1)),
+        },
+        "contentDetails": {"duration": f"PT{index % 50 + 1}M{index % 60}S"},
+    }
+
+
+def as_search_item(item):
+    """videos.list 항목을 search.list 항목 모양으로 변환 (통계 없음)"""
+    return {"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": item["id"]},
+            "snippet": item["snippet"]}
+
+
+class FixtureStore:
+    """
+    fixture를 목록 단위로 모아 두고 요청에 맞는 페이지를 만들어 주는 저장소
+
+    기록할 때의 페이지 경계와 관계없이 같은 목록의 항목을 순서대로 이어 붙여 두고,
+    요청의 maxResults/pageToken(오프셋)으로 잘라 줍니다. videos.list?id=... 요청은
+    모든 fixture의 동영상을 ID로 찾아 응답합니다. synthetic이 0보다 크면 fixture에
+    없는 목록을 그 개수만큼 합성합니다.
+    """
+
+    def __init__(self, directory=None, synthetic=0):
+        self.synthetic = synthetic
+        self.listings = {}  # listing_key → 항목 리스트
+        self.videos = {}    # 동영상 ID → videos.list 항목
+        self._lock = threading.Lock()
+        if directory:
+            self.load(directory)
+
+    def load(self, directory):
+        """디렉터리의 fixture를 모두 읽어 목록별로 페이지 순서대로 이어 붙입니다."""
+        pages = {}  # listing_key → {pageToken: fixture}
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                fixture = json.load(f)
+            resource, params, body = fixture["resource"], fixture["params"], fixture["body"]
+            if resource == "videos" and "id" in params:
+                for item in body.get("items", []):
+                    self.videos[item["id"]] = item
+                continue
+            pages.setdefault(listing_key(resource, params), {})[params.get("pageToken")] = body
+
+        # 첫 페이지(pageToken 없음)부터 nextPageToken을 따라 이어 붙입니다.
+        for key, by_token in pages.items():
+            items = []
+            body = by_token.get(None)
+            while body is not None:
+                items.extend(body.get("items", []))
+                token = body.get("nextPageToken")
+                body = by_token.pop(token, None) if token else None
+            self.listings[key] = items
+            if key[0] == "videos":
+                for item in items:
+                    self.videos[item["id"]] = item
+
+    def listing(self, resource, params):
+        """요청에 맞는 목록 전체 (없고 합성하지 않으면 None)"""
+        key = listing_key(resource, params)
+        with self._lock:
+            items = self.listings.get(key)
+            if items is None and self.synthetic:
+                region = params.get("regionCode", "US")
+                tag = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:4]
+                videos = [synthetic_item(f"{region}{tag}{i:05d}", i) for i in range(self.synthetic)]
+                for item in videos:
+                    self.videos[item["id"]] = item
+                items = videos if resource == "videos" else [as_search_item(item) for item in videos]
+                self.listings[key] = items
+            return items
+
+    def respond(self, resource, params, page_size=None, max_items=None):
+        """
+        요청 하나에 대한 응답 본문
+
+        Args:
+            resource (str): 'videos' 또는 'search'
+            params (dict): 쿼리 매개변수
+            page_size (int): 지정하면 maxResults 대신 이 크기로 자름
+            max_items (int): 지정하면 목록을 이 개수까지만 제공 (페이지 수 제한)
+        """
+        if resource == "videos" and "id" in params:
+            items = [self.videos[video_id] for video_id in params["id"].split(",") if video_id in self.videos]
+            return {"kind": "youtube#videoListResponse", "items": items}
+        items = self.listing(resource, params) or []
+        if max_items is not None:
+            items = items[:max_items]
+        size = min(page_size or int(params.get("maxResults", 5)), MAX_PAGE_SIZE)
+        offset = int(params.get("pageToken") or 0)
+        page = items[offset:offset + size]
+        body = {
+            "kind": f"youtube#{'videoListResponse' if resource == 'videos' else 'searchListResponse'}",
+            "etag": hashlib.sha1(json.dumps(page, sort_keys=True).encode("utf-8")).hexdigest(),
+            "pageInfo": {"totalResults": len(items), "resultsPerPage": size},
+            "items": page,
+        }
+        if offset + size < len(items):
+            body["nextPageToken"] = str(offset + size)
+        return body
+
+
+# ====================================
+# 재생 서버
+# ====================================
+class MockYouTubeServer:
+    """
+    FixtureStore의 데이터를 YouTube API처럼 돌려주는 로컬 HTTP 서버
+
+    설정 값(latency, error_rate 등)은 실행 중에도 바꿀 수 있습니다. If-None-Match가
+    페이지의 ETag와 같으면 304를 돌려주며, 요청 수는 리소스별로 calls()에서 확인합니다.
+    """
+
+    def __init__(self, store, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, quota_exceeded=False,
+                 page_size=None, max_items=None):
+        """
+        Args:
+            store (FixtureStore): 재생할 데이터
+            host (str): 바인딩할 주소
+            port (int): 포트 (0이면 빈 포트를 자동 선택)
+            latency (float): 응답마다 더할 지연 시간 (초)
+            jitter (float): 지연 시간에 더할 무작위 값의 최대치 (초)
+            error_rate (float): error_status로 실패할 요청의 비율 (0~1)
+            error_status (int): 실패 응답의 HTTP 상태 (503, 429, 500 등)
+            quota_exceeded (bool): 모든 요청에 403 quotaExceeded로 응답
+            page_size (int): 지정하면 maxResults 대신 이 크기로 페이지를 자름
+            max_items (int): 목록마다 제공할 최대 항목 수
+        """
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_exceeded = quota_exceeded
+        self.page_size = page_size
+        self.max_items = max_items
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """YOUTUBE_API_BASE_URL에 지정할 주소"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def calls(self):
+        """리소스별 받은 요청 수"""
+        with self._lock:
+            return dict(self._calls)
+
+    def reset_calls(self):
+        with self._lock:
+            self._calls.clear()
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작하고 자신을 반환합니다."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-youtube-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, resource):
+        with self._lock:
+            self._calls[resource] = self._calls.get(resource, 0) + 1
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                prefix, _, resource = url.path.rpartition("/")
+                if prefix != API_PATH or resource not in ("videos", "search"):
+                    self.send_json(404, {"error": {"code": 404, "message": "Not Found"}})
+                    return
+                params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                mock._count(resource)
+
+                if mock.latency or mock.jitter:
+                    time.sleep(mock.latency + random.uniform(0, mock.jitter))
+                if mock.quota_exceeded:
+                    self.send_json(403, {"error": {"code": 403, "message": "quota", "errors": [
+                        {"reason": "quotaExceeded", "domain": "youtube.quota"}]}})
+                    return
+                if mock.error_rate and random.random() < mock.error_rate:
+                    self.send_json(mock.error_status, {"error": {"code": mock.error_status, "message": "mock error"}})
+                    return
+
+                body = mock.store.respond(resource, params, mock.page_size, mock.max_items)
+                etag = body.get("etag")
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_json(200, body)
+
+            def send_json(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                if body.get("etag"):
+                    self.send_header("ETag", body["etag"])
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 로그를 남기지 않음
+
+        return Handler
+
+
+# ====================================
+# 명령줄
+# ====================================
+def main(argv=None):
+    from popular import ORDERS, PAGE_SIZE, REGION_CODES
+
+    parser = argparse.ArgumentParser(description="YouTube Data API 응답을 기록하거나 로컬에서 재생합니다.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="실제 API 응답을 fixture로 저장")
+    rec.add_argument("--output", "-o", default="fixtures", help="fixture를 저장할 디렉터리 (기본값: fixtures)")
+    rec.add_argument("--regions", default="KR", help="쉼표로 구분한 지역 코드 (기본값: KR)")
+    rec.add_argument("--orders", default="mostPopular", help="쉼표로 구분한 정렬 기준 (기본값: mostPopular)")
+    rec.add_argument("--max-results", type=int, default=PAGE_SIZE, help="조합별로 기록할 동영상 수 (기본값: 50)")
+
+    srv = commands.add_parser("serve", help="fixture를 재생하는 로컬 API 서버 실행")
+    srv.add_argument("--fixtures", help="재생할 fixture 디렉터리")
+    srv.add_argument("--synthetic", type=int, default=0, help="fixture에 없는 목록을 이 개수만큼 합성")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=DEFAULT_PORT)
+    srv.add_argument("--latency", type=float, default=0.0, help="응답 지연 시간 (초)")
+    srv.add_argument("--jitter", type=float, default=0.0, help="지연 시간에 더할 무작위 값의 최대치 (초)")
+    srv.add_argument("--error-rate", type=float, default=0.0, help="실패 응답 비율 (0~1)")
+    srv.add_argument("--error-status", type=int, default=503, help="실패 응답의 HTTP 상태 (기본값: 503)")
+    srv.add_argument("--quota-exceeded", action="store_true", help="모든 요청에 403 quotaExceeded로 응답")
+    srv.add_argument("--page-size", type=int, help="maxResults 대신 쓸 페이지 크기")
+    srv.add_argument("--max-items", type=int, help="목록마다 제공할 최대 항목 수")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        from dotenv import load_dotenv
+        from quota import ApiKeyPool
+
+        load_dotenv()
+        key_pool = ApiKeyPool.from_env()
+        if key_pool is None:
+            parser.error("YouTube API 키가 설정되지 않았습니다. .env 파일에 YOUTUBE_API_KEY를 추가해주세요.")
+        regions = [code.strip() for code in args.regions.split(",") if code.strip()]
+        orders = [order.strip() for order in args.orders.split(",") if order.strip()]
+        unknown = [value for value in regions + orders if value not in REGION_CODES + ORDERS]
+        if unknown:
+            parser.error(f"알 수 없는 값: {', '.join(unknown)}")
+        total = record(args.output, regions, orders, args.max_results, key_pool)
+        print(f"동영상 {total}개를 {args.output}에 기록했습니다.", file=sys.stderr)
+        return 0
+
+    if not args.fixtures and not args.synthetic:
+        parser.error("--fixtures 또는 --synthetic 중 하나는 지정해야 합니다.")
+    server = MockYouTubeServer(
+        FixtureStore(args.fixtures, synthetic=args.synthetic),
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+        quota_exceeded=args.quota_exceeded, page_size=args.page_size, max_items=args.max_items,
+    )
+    print(f"YOUTUBE_API_BASE_URL={server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
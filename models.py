@@ -0,0 +1,152 @@
+# 필요한 라이브러리 임포트
+import re
+from datetime import datetime, timezone
+
+# ====================================
+# 응답 값 파싱 (수집 시점에 한 번만 수행)
+# ====================================
+# ISO-8601 기간 (예: PT4M13S, PT1H2M, P1DT3H)
+_DURATION_PATTERN = re.compile(
+    r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$'
+)
+
+
+def parse_count(value):
+    """API의 문자열 숫자('12345')를 정수로 변환하는 함수 (없거나 잘못되면 0)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_duration(value):
+    """
+    ISO-8601 기간 문자열을 초 단위 정수로 변환하는 함수
+
+    Returns:
+        int: 전체 길이 (초), 알 수 없으면 0
+    """
+    match = _DURATION_PATTERN.match(value or '')
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(g) if g else 0 for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_published_at(value):
+    """'2024-01-01T12:00:00Z' 형식의 게시일을 UTC datetime으로 변환하는 함수"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+# ====================================
+# 동영상 모델
+# ====================================
+class Video:
+    """
+    동영상 한 개의 정보
+
+    조회수/좋아요/댓글 수, 게시일, 길이는 응답을 받을 때 한 번만 파싱해 두므로
+    화면을 다시 그릴 때마다 문자열을 다시 해석하지 않습니다. __slots__를 사용해
+    캐시에 많이 쌓여도 메모리를 적게 차지합니다.
+    """
+
+    __slots__ = (
+        'id', 'title', 'channel', 'thumbnail',
+        'view_count', 'like_count', 'comment_count',
+        'published_at', 'duration', 'region',
+    )
+
+    def __init__(self, id, title, channel, thumbnail, view_count=0, like_count=0,
+                 comment_count=0, published_at=None, duration=0, region=None):
+        self.id = id
+        self.title = title
+        self.channel = channel
+        self.thumbnail = thumbnail          # 고화질(high) 썸네일 URL
+        self.view_count = view_count        # int
+        self.like_count = like_count        # int
+        self.comment_count = comment_count  # int
+        self.published_at = published_at    # UTC datetime 또는 None
+        self.duration = duration            # 초 단위 int
+        self.region = region                # 전체 국가 모드에서의 지역 코드
+
+    def __repr__(self):
+        return f"Video(id={self.id!r}, title={self.title!r})"
+
+    def with_region(self, region):
+        """region만 바꾼 사본 (캐시에 공유된 객체를 수정하지 않기 위해 사용)"""
+        copy = Video.__new__(Video)
+        for name in Video.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.region = region
+        return copy
+
+    @property
+    def url(self):
+        """YouTube 시청 페이지 URL"""
+        return f"https://www.youtube.com/watch?v={self.id}"
+
+    @classmethod
+    def from_api_item(cls, item):
+        """
+        videos.list 또는 search.list 응답의 항목 하나로 Video를 만드는 함수
+
+        search.list 항목에는 통계가 없으므로 apply_statistics()로 채웁니다.
+        """
+        snippet = item['snippet']
+        thumbnails = snippet['thumbnails']
+        video_id = item['id']['videoId'] if isinstance(item['id'], dict) else item['id']
+        video = cls(
+            id=video_id,
+            title=snippet['title'],
+            channel=snippet['channelTitle'],
+            thumbnail=thumbnails.get('high', thumbnails.get('medium', {})).get('url', ''),
+            published_at=parse_published_at(snippet.get('publishedAt')),
+        )
+        video.apply_statistics(item)
+        return video
+
+    def apply_statistics(self, item):
+        """응답 항목의 statistics/contentDetails 값을 파싱해 반영하는 함수"""
+        stats = item.get('statistics', {})
+        self.view_count = parse_count(stats.get('viewCount'))
+        self.like_count = parse_count(stats.get('likeCount'))
+        self.comment_count = parse_count(stats.get('commentCount'))
+        self.duration = parse_duration(item.get('contentDetails', {}).get('duration'))
+
+    def to_dict(self):
+        """디스크 캐시에 JSON으로 저장하기 위한 딕셔너리 (이미 파싱된 값 그대로)"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'channel': self.channel,
+            'thumbnail': self.thumbnail,
+            'view_count': self.view_count,
+            'like_count': self.like_count,
+            'comment_count': self.comment_count,
+            'published_at': self.published_at.timestamp() if self.published_at else None,
+            'duration': self.duration,
+            'region': self.region,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict()로 저장한 딕셔너리에서 Video를 복원하는 함수"""
+        published_at = data.get('published_at')
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            channel=data['channel'],
+            thumbnail=data['thumbnail'],
+            view_count=data['view_count'],
+            like_count=data['like_count'],
+            comment_count=data['comment_count'],
+            published_at=(
+                datetime.fromtimestamp(published_at, timezone.utc)
+                if published_at is not None else None
+            ),
+            duration=data['duration'],
+            region=data.get('region'),
+        )
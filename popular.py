@@ -0,0 +1,187 @@
+"""
+인기 동영상 수집 핵심 로직 (Streamlit 없이 사용 가능)
+
+API 요청 구성, 페이지 단위 호출, 응답 파싱만 담당합니다. 화면 표시나 캐시는
+호출하는 쪽(streamlit_app.py, export.py)에서 처리하며, 오류는 예외로 알립니다.
+"""
+# 필요한 라이브러리 임포트
+from disk_cache import NOT_MODIFIED
+from instrumentation import REGISTRY
+from models import Video
+from youtube_client import POPULAR_FIELDS, SEARCH_FIELDS, STATS_FIELDS
+
+# ====================================
+# 수집 설정
+# ====================================
+# 한 번의 API 호출로 가져오는 최대 동영상 수 (YouTube API 제한)
+PAGE_SIZE = 50
+
+# 지원하는 지역 코드와 정렬 기준
+REGION_CODES = ('KR', 'US', 'JP', 'GB', 'DE', 'FR', 'CA', 'AU')
+ORDERS = ('mostPopular', 'date', 'viewCount', 'rating')
+
+# 인기순 이외의 정렬은 인기 키워드 검색으로 대신합니다.
+SEARCH_QUERIES = {
+    'date': 'music OR gaming OR news OR entertainment',
+    'viewCount': 'trending OR viral OR popular',
+    'rating': 'best OR top OR amazing'
+}
+
+
+class EmptyResponseError(Exception):
+    """API 응답에 동영상이 하나도 없는 경우 (응답 본문을 함께 보관)"""
+
+    def __init__(self, data):
+        super().__init__(f"응답에 동영상이 없습니다: {data}")
+        self.data = data
+
+
+class PageUnavailableError(Exception):
+    """페이지를 API에서 가져오지 못했고 캐시에도 없는 경우
+
+    빈 결과를 반환하지 않고 예외를 내므로 st.cache_data가 실패를 캐시하지 않습니다.
+    """
+
+
+def video_page_cache_key(region_code, order, page_index):
+    """페이지 단위 캐시 키 (API 키와 무관하게 모든 사용자가 공유)"""
+    return f"popular:v2:{region_code}:{order}:page{page_index}"
+
+
+def cached_etag(entry):
+    """디스크 캐시 항목에 함께 저장된 ETag를 꺼내는 함수 (없으면 None)"""
+    if entry is None:
+        return None
+    return entry.value.get('etag')
+
+
+def build_page_request(region_code, order, page_token=None):
+    """
+    동영상 목록 한 페이지를 가져오기 위한 API 요청을 구성하는 함수
+
+    Returns:
+        tuple: (리소스 이름, fields 마스크, 쿼리 매개변수)
+    """
+    if order == 'mostPopular':
+        # YouTube Data API v3 endpoint for most popular videos
+        resource, fields = 'videos', POPULAR_FIELDS
+        params = {
+            'part': 'snippet,statistics,contentDetails',
+            'chart': 'mostPopular',
+            'regionCode': region_code,
+            'maxResults': PAGE_SIZE,
+        }
+    else:
+        resource, fields = 'search', SEARCH_FIELDS
+        params = {
+            'part': 'snippet',
+            'type': 'video',
+            'regionCode': region_code,
+            'maxResults': PAGE_SIZE,
+            'order': order,
+            'q': SEARCH_QUERIES.get(order, 'popular'),
+        }
+    if page_token:
+        params['pageToken'] = page_token
+    return resource, fields, params
+
+
+def request_video_page(client, region_code='KR', order='mostPopular', page_token=None,
+                       etag=None, on_warning=None):
+    """
+    YouTube API를 통해 동영상 목록 한 페이지(최대 50개)를 가져오는 함수 (캐시 없음)
+
+    Args:
+        client (YouTubeClient): API 클라이언트 (API 키는 클라이언트의 키 풀에서 붙임)
+        region_code (str): 지역 코드 (기본값: 'KR' - 한국)
+        order (str): 정렬 기준 ('mostPopular', 'date', 'viewCount', 'rating')
+        page_token (str): 가져올 페이지의 토큰 (첫 페이지는 None)
+        etag (str): 캐시된 페이지의 ETag (인기순에서 조건부 요청에 사용)
+        on_warning (callable): 검색 결과의 조회수 보강에 실패했을 때 메시지를 받을 함수
+            (목록은 조회수 없이 그대로 반환합니다)
+
+    Returns:
+        dict: {'videos': Video.to_dict() 리스트, 'next_page_token': 다음 페이지 토큰, 'etag': ETag},
+              캐시된 페이지에서 바뀌지 않았으면 NOT_MODIFIED
+
+    Raises:
+        QuotaExceededError: 남은 할당량이 부족한 경우
+        EmptyResponseError: 응답에 동영상이 없는 경우
+        requests.exceptions.RequestException: 네트워크 오류 또는 HTTP 오류 상태
+        ValueError: 응답을 JSON으로 해석할 수 없는 경우
+    """
+    resource, fields, params = build_page_request(region_code, order, page_token)
+
+    # 검색 결과의 ETag는 목록만 반영하고 조회수는 별도 호출로 받으므로,
+    # 조회수까지 ETag에 포함되는 인기순 목록에만 조건부 요청을 보냅니다.
+    if order != 'mostPopular':
+        etag = None
+
+    with REGISTRY.timer('fetch'):
+        data = client.get(resource, params, fields=fields, etag=etag)
+    if data is None:
+        return NOT_MODIFIED
+
+    if 'items' not in data or len(data['items']) == 0:
+        raise EmptyResponseError(data)
+
+    # 숫자/게시일/길이는 여기서 한 번만 파싱합니다.
+    with REGISTRY.timer('parse'):
+        videos = [Video.from_api_item(item) for item in data['items']]
+
+    # Get statistics for search results
+    if order != 'mostPopular' and videos:
+        with REGISTRY.timer('stats'):
+            try:
+                stats_params = {
+                    'part': 'statistics,contentDetails',
+                    'id': ','.join(video.id for video in videos),
+                }
+                stats_data = client.get('videos', stats_params, fields=STATS_FIELDS)
+                if 'items' in stats_data:
+                    stats_dict = {item['id']: item for item in stats_data['items']}
+                    for video in videos:
+                        if video.id in stats_dict:
+                            video.apply_statistics(stats_dict[video.id])
+            except Exception as e:
+                if on_warning is not None:
+                    on_warning(f"조회수 정보를 가져오는 중 오류가 발생했습니다: {str(e)}")
+
+    return {
+        'videos': [video.to_dict() for video in videos],
+        'next_page_token': data.get('nextPageToken'),
+        'etag': data.get('etag'),
+    }
+
+
+def iter_video_pages(client, region_code, order, max_results, on_warning=None):
+    """
+    nextPageToken을 따라가며 API에서 직접 페이지를 가져오는 제너레이터 (캐시 없음)
+
+    한 번에 한 페이지만 메모리에 두므로 가져오는 페이지 수와 관계없이 메모리
+    사용량이 일정합니다.
+
+    Args:
+        client (YouTubeClient): API 클라이언트
+        region_code (str): 지역 코드
+        order (str): 정렬 기준
+        max_results (int): 가져올 전체 동영상 수
+        on_warning (callable): request_video_page()와 같음
+
+    Yields:
+        tuple: (0부터 시작하는 페이지 번호, Video 리스트)
+    """
+    remaining = max_results
+    page_index = 0
+    page_token = None
+    while remaining > 0:
+        page = request_video_page(
+            client, region_code, order, page_token, on_warning=on_warning
+        )
+        videos = [Video.from_dict(video) for video in page['videos'][:remaining]]
+        yield page_index, videos
+        remaining -= len(videos)
+        page_token = page.get('next_page_token')
+        if not page_token:
+            return
+        page_index += 1
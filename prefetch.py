@@ -0,0 +1,124 @@
+# 필요한 라이브러리 임포트
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def parse_priority(spec):
+    """
+    'KR:mostPopular,US:mostPopular' 형식의 우선순위 설정을 해석하는 함수
+
+    Args:
+        spec (str): 쉼표로 구분된 '지역:정렬' 목록
+
+    Returns:
+        list: (region_code, order) 튜플의 리스트 (앞쪽일수록 우선)
+    """
+    pairs = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if ":" not in part:
+            continue
+        region_code, order = part.split(":", 1)
+        pairs.append((region_code.strip(), order.strip()))
+    return pairs
+
+
+class PrefetchScheduler:
+    """
+    모든 국가/정렬 조합을 만료 전에 미리 가져오는 백그라운드 스케줄러
+
+    디스크 캐시의 각 항목이 만료되기 refresh_margin초 전에 다시 가져오므로,
+    사용자의 페이지 로드는 네트워크를 기다리지 않습니다. 다른 워커가 이미 갱신한
+    항목은 남은 TTL을 보고 건너뜁니다. 남은 할당량이 min_remaining 아래로 내려가면
+    사용자 요청에 쓸 몫을 남기도록 미리 가져오기를 멈춥니다.
+    """
+
+    def __init__(self, cache, refresh, key_func, combinations,
+                 priority=None, stagger=2.0, refresh_margin=60, poll_interval=15,
+                 remaining=None, min_remaining=0):
+        """
+        Args:
+            cache (DiskCache): 남은 TTL을 확인할 디스크 캐시
+            refresh (callable): refresh(region_code, order, max_results) -> bool,
+                                새로 가져와 캐시에 저장하고 성공 여부를 반환
+            key_func (callable): key_func(region_code, order, max_results) -> str,
+                                 남은 TTL을 확인할 캐시 키
+            combinations (list): (region_code, order, max_results) 튜플의 리스트
+            priority (list): 먼저 갱신할 (region_code, order) 목록
+            stagger (float): 연속된 요청 사이의 간격 (초)
+            refresh_margin (int): 만료 몇 초 전에 갱신할지
+            poll_interval (int): 갱신 대상을 다시 확인하는 주기 (초)
+            remaining (callable): 남은 API 할당량을 반환하는 함수 (None이면 확인하지 않음)
+            min_remaining (int): 남은 할당량이 이보다 적으면 미리 가져오지 않음
+        """
+        self.cache = cache
+        self.refresh = refresh
+        self.key_func = key_func
+        self.stagger = stagger
+        self.refresh_margin = refresh_margin
+        self.poll_interval = poll_interval
+        self.remaining = remaining
+        self.min_remaining = min_remaining
+        rank = {pair: i for i, pair in enumerate(priority or [])}
+        # 우선순위 목록에 있는 조합이 먼저, 나머지는 원래 순서대로
+        self.combinations = sorted(
+            combinations,
+            key=lambda c: rank.get((c[0], c[1]), len(rank)),
+        )
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _needs_refresh(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return True
+        return entry.expires_at - time.time() <= self.refresh_margin
+
+    def run_once(self):
+        """
+        갱신이 필요한 조합을 우선순위 순서대로 한 번씩 가져오는 함수
+
+        Returns:
+            int: 실제로 가져온 조합 수
+        """
+        refreshed = 0
+        for region_code, order, max_results in self.combinations:
+            if self._stop.is_set():
+                break
+            key = self.key_func(region_code, order, max_results)
+            if not self._needs_refresh(key):
+                continue
+            if self.remaining is not None and self.remaining() < self.min_remaining:
+                logger.info("prefetch paused: remaining quota below %s", self.min_remaining)
+                break
+            try:
+                if self.refresh(region_code, order, max_results):
+                    refreshed += 1
+            except Exception:
+                logger.exception("prefetch failed for %s", key)
+            # 요청이 한꺼번에 몰리지 않도록 간격을 둡니다.
+            if self._stop.wait(self.stagger):
+                break
+        return refreshed
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """데몬 스레드로 스케줄러를 시작합니다."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name="youtube-prefetch", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """스케줄러를 멈춥니다."""
+        self._stop.set()
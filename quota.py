@@ -0,0 +1,313 @@
+# 필요한 라이브러리 임포트
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+    # YouTube API 할당량은 태평양 시간 자정에 초기화됩니다.
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:  # zoneinfo/tzdata가 없는 환경
+    _QUOTA_TZ = None
+
+# ====================================
+# 할당량 설정
+# ====================================
+DEFAULT_QUOTA_PATH = os.path.join(".cache", "quota.sqlite3")
+DEFAULT_DAILY_LIMIT = 10000
+
+# 엔드포인트별 호출 비용 (할당량 단위)
+# https://developers.google.com/youtube/v3/determine_quota_cost
+UNIT_COSTS = {
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+    "videoCategories": 1,
+    "search": 100,
+}
+
+
+class QuotaExceededError(Exception):
+    """남은 할당량이 부족해 API를 호출하지 않았을 때 발생하는 예외"""
+
+
+def quota_day():
+    """할당량 집계 기준 날짜 (태평양 시간 기준 YYYY-MM-DD)"""
+    return datetime.now(_QUOTA_TZ).strftime("%Y-%m-%d")
+
+
+def next_quota_reset():
+    """다음 할당량 초기화 시각 (태평양 시간 자정, 유닉스 타임스탬프)"""
+    now = datetime.now(_QUOTA_TZ)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+
+class QuotaManager:
+    """
+    YouTube API 할당량 사용량을 엔드포인트 비용 단위로 기록하는 클래스
+
+    사용량은 날짜별로 SQLite 파일에 저장되므로 재시작해도 유지되고, 같은 호스트의
+    워커들이 하나의 사용량을 함께 봅니다. 남은 할당량이 reserve 아래로 내려가면
+    can_spend()가 False를 반환해 캐시된 데이터만 쓰도록 합니다.
+    """
+
+    def __init__(self, path=None, daily_limit=None, reserve=None, key_id="default"):
+        """
+        Args:
+            path (str): 사용량을 저장할 SQLite 파일 경로
+            daily_limit (int): 하루 할당량 (기본값: 10,000)
+            reserve (int): 이 값 아래로는 쓰지 않고 남겨 둘 할당량
+            key_id (str): 사용량을 따로 집계할 API 키 식별자 (키 자체가 아닌 지문)
+        """
+        self.key_id = key_id
+        self.path = path or os.getenv("YOUTUBE_QUOTA_PATH", DEFAULT_QUOTA_PATH)
+        self.daily_limit = daily_limit or int(
+            os.getenv("YOUTUBE_QUOTA_DAILY_LIMIT", DEFAULT_DAILY_LIMIT)
+        )
+        self.reserve = reserve if reserve is not None else int(
+            os.getenv("YOUTUBE_QUOTA_RESERVE", "500")
+        )
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(usage)")]
+            if columns and "key_id" not in columns:
+                # 키별 집계 이전에 만든 파일: 기존 사용량은 기본 키의 것으로 옮깁니다.
+                conn.execute("ALTER TABLE usage RENAME TO usage_old")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usage (
+                    day TEXT NOT NULL,
+                    key_id TEXT NOT NULL,
+                    resource TEXT NOT NULL,
+                    units INTEGER NOT NULL DEFAULT 0,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, key_id, resource)
+                )
+                """
+            )
+            if columns and "key_id" not in columns:
+                conn.execute(
+                    "INSERT INTO usage (day, key_id, resource, units, calls) "
+                    "SELECT day, 'default', resource, units, calls FROM usage_old"
+                )
+                conn.execute("DROP TABLE usage_old")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def cost(resource):
+        """엔드포인트 한 번 호출의 할당량 비용"""
+        return UNIT_COSTS.get(resource, 1)
+
+    def used(self):
+        """오늘 사용한 할당량"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(units), 0) FROM usage WHERE day = ? AND key_id = ?",
+                (quota_day(), self.key_id),
+            ).fetchone()
+        return row[0]
+
+    def remaining(self):
+        """오늘 남은 할당량"""
+        return max(self.daily_limit - self.used(), 0)
+
+    def can_spend(self, resource):
+        """
+        reserve를 남기고도 resource를 한 번 호출할 수 있는지 확인하는 함수
+
+        Returns:
+            bool: 호출해도 되면 True
+        """
+        return self.remaining() - self.cost(resource) >= self.reserve
+
+    def record(self, resource):
+        """resource 한 번 호출한 비용을 오늘 사용량에 더합니다."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO usage (day, key_id, resource, units, calls) VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(day, key_id, resource) DO UPDATE SET
+                    units = units + excluded.units,
+                    calls = calls + 1
+                """,
+                (quota_day(), self.key_id, resource, self.cost(resource)),
+            )
+
+    def usage_by_resource(self):
+        """
+        오늘 엔드포인트별 사용량
+
+        Returns:
+            dict: {resource: (units, calls)}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT resource, units, calls FROM usage WHERE day = ? AND key_id = ?",
+                (quota_day(), self.key_id),
+            ).fetchall()
+        return {resource: (units, calls) for resource, units, calls in rows}
+
+
+def key_fingerprint(api_key):
+    """사용량 기록에 쓸 API 키 지문 (키 자체는 디스크에 저장하지 않음)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class ApiKeyPool:
+    """
+    여러 API 키(프로젝트)의 할당량을 묶어 쓰는 키 풀
+
+    키마다 QuotaManager로 사용량을 따로 집계하고, 호출할 때마다 남은 할당량이
+    가장 많은 키를 고릅니다. API가 quotaExceeded를 돌려준 키는 다음 초기화
+    시각까지 건너뜁니다.
+    """
+
+    def __init__(self, keys, path=None, daily_limit=None, reserve=None):
+        """
+        Args:
+            keys (list): API 키 목록 (중복/빈 값은 무시)
+            path (str): 사용량을 저장할 SQLite 파일 경로
+            daily_limit (int): 키 하나의 하루 할당량
+            reserve (int): 키마다 쓰지 않고 남겨 둘 할당량
+        """
+        self.keys = list(dict.fromkeys(key.strip() for key in keys if key and key.strip()))
+        if not self.keys:
+            raise ValueError("API 키가 하나 이상 필요합니다")
+        self._quotas = {
+            key: QuotaManager(path, daily_limit, reserve, key_id=key_fingerprint(key))
+            for key in self.keys
+        }
+        self._exhausted_until = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경 변수의 키로 풀을 만듭니다.
+
+        YOUTUBE_API_KEYS(쉼표 구분)와 YOUTUBE_API_KEY를 모두 읽으며, 키가 없으면 None
+        """
+        keys = os.getenv("YOUTUBE_API_KEYS", "").split(",") + [os.getenv("YOUTUBE_API_KEY", "")]
+        if not any(key.strip() for key in keys):
+            return None
+        return cls(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _usable(self, key):
+        return time.time() >= self._exhausted_until.get(key, 0)
+
+    def acquire(self, resource):
+        """
+        resource를 호출할 키를 고릅니다 (남은 할당량이 가장 많은 키).
+
+        Raises:
+            QuotaExceededError: 모든 키의 할당량이 부족한 경우
+        """
+        with self._lock:
+            candidates = [key for key in self.keys if self._usable(key)]
+        best, best_remaining = None, None
+        for key in candidates:
+            quota = self._quotas[key]
+            remaining = quota.remaining()
+            if remaining - quota.cost(resource) < quota.reserve:
+                continue
+            if best is None or remaining > best_remaining:
+                best, best_remaining = key, remaining
+        if best is None:
+            raise QuotaExceededError(f"{resource} 호출에 필요한 할당량이 남은 키가 없습니다")
+        return best
+
+    def available(self, resource):
+        """할당량이 남은 키가 있는지 확인하는 함수"""
+        try:
+            self.acquire(resource)
+        except QuotaExceededError:
+            return False
+        return True
+
+    def record(self, key, resource):
+        """key로 resource를 한 번 호출한 비용을 기록합니다."""
+        self._quotas[key].record(resource)
+
+    def mark_exhausted(self, key):
+        """API가 할당량 소진을 알린 키를 다음 초기화 시각까지 건너뜁니다."""
+        with self._lock:
+            self._exhausted_until[key] = next_quota_reset()
+
+    @property
+    def daily_limit(self):
+        """모든 키의 하루 할당량 합계"""
+        return sum(quota.daily_limit for quota in self._quotas.values())
+
+    def remaining(self):
+        """사용할 수 있는 키들의 남은 할당량 합계"""
+        with self._lock:
+            usable = [key for key in self.keys if self._usable(key)]
+        return sum(self._quotas[key].remaining() for key in usable)
+
+    def usage_by_resource(self):
+        """
+        오늘 엔드포인트별 사용량 (모든 키 합계)
+
+        Returns:
+            dict: {resource: (units, calls)}
+        """
+        totals = {}
+        for quota in self._quotas.values():
+            for resource, (units, calls) in quota.usage_by_resource().items():
+                prev_units, prev_calls = totals.get(resource, (0, 0))
+                totals[resource] = (prev_units + units, prev_calls + calls)
+        return totals
+
+
+class TokenBucket:
+    """
+    새로고침 같은 사용자 동작의 빈도를 제한하는 토큰 버킷
+
+    capacity개까지 모아 둘 수 있고, refill_seconds마다 하나씩 다시 채워집니다.
+    """
+
+    def __init__(self, capacity=5, refill_seconds=60.0):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed / self.refill_seconds)
+        self._updated = now
+
+    def try_acquire(self):
+        """
+        토큰 하나를 사용합니다.
+
+        Returns:
+            bool: 토큰이 있어 사용했으면 True
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def available(self):
+        """지금 사용할 수 있는 토큰 수"""
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
@@ -0,0 +1,48 @@
+# 필요한 라이브러리 임포트
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+
+def fixture_name(resource, params):
+    """요청마다 정해지는 fixture 파일 이름 (API 키는 포함하지 않음)"""
+    query = json.dumps(
+        sorted((name, str(value)) for name, value in params.items() if name != "key")
+    )
+    return f"{resource}-{hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]}.json"
+
+
+class FixtureRecorder:
+    """
+    YouTubeClient(recorder=...)에 넘겨 응답을 fixture로 저장하는 기록기
+
+    정상 응답(200)만 저장하며, 같은 요청은 마지막 응답으로 덮어씁니다. 저장한
+    fixture는 mock_api.py의 재생 서버가 읽습니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """YOUTUBE_RECORD_DIR가 지정되어 있으면 그 디렉터리에 기록하는 기록기 (없으면 None)"""
+        directory = os.getenv("YOUTUBE_RECORD_DIR")
+        return cls(directory).record if directory else None
+
+    def record(self, resource, params, response):
+        if response.status_code != 200:
+            return
+        params = {name: str(value) for name, value in params.items() if name != "key"}
+        fixture = {
+            "resource": resource,
+            "params": params,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "body": response.json(),
+        }
+        path = os.path.join(self.directory, fixture_name(resource, params))
+        with self._lock, open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False)
@@ -0,0 +1,164 @@
+# 필요한 라이브러리 임포트
+import random
+import threading
+import time
+
+import requests
+
+# ====================================
+# 재시도/차단기 설정
+# ====================================
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.5   # 첫 재시도 전 최대 대기 시간 (초)
+DEFAULT_MAX_DELAY = 4.0    # 재시도 사이 최대 대기 시간 (초)
+
+# 일시적인 오류로 보고 재시도하는 HTTP 상태
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 기다려도 풀리지 않으므로 재시도하지 않고 바로 차단기를 여는 403 사유
+# (YouTube 할당량은 태평양 시간 자정에야 초기화됩니다)
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않았을 때 발생하는 예외"""
+
+    def __init__(self, name, retry_at):
+        super().__init__(f"{name} 호출이 일시적으로 차단되었습니다 ({max(0, retry_at - time.time()):.0f}초 후 재시도)")
+        self.name = name
+        self.retry_at = retry_at
+
+
+def error_reason(response):
+    """YouTube API 오류 응답 본문의 reason 값 (없으면 None)"""
+    try:
+        errors = response.json()["error"]["errors"]
+        return errors[0].get("reason")
+    except Exception:
+        return None
+
+
+def is_transient(error):
+    """재시도하면 성공할 수 있는 오류인지 확인하는 함수"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUSES
+    return False
+
+
+def is_quota_error(error):
+    """하루 할당량이 소진되었다는 403 응답인지 확인하는 함수"""
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and error.response is not None
+        and error.response.status_code == 403
+        and error_reason(error.response) in QUOTA_REASONS
+    )
+
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, error=None):
+    """
+    attempt번째 재시도 전에 기다릴 시간 (지수 백오프 + full jitter)
+
+    서버가 Retry-After 헤더로 시간을 알려 주면 max_delay 안에서 그 값을 따릅니다.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), max_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_call(func, attempts=DEFAULT_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+               max_delay=DEFAULT_MAX_DELAY, sleep=time.sleep):
+    """
+    일시적인 오류가 나면 지수 백오프로 기다렸다가 다시 호출하는 함수
+
+    Args:
+        func (callable): 인자 없이 호출할 함수
+        attempts (int): 최대 시도 횟수 (첫 호출 포함)
+        base_delay (float): 첫 재시도 전 최대 대기 시간 (초)
+        max_delay (float): 재시도 사이 최대 대기 시간 (초)
+        sleep (callable): 대기 함수 (테스트용)
+
+    Returns:
+        func()의 반환값
+
+    Raises:
+        마지막 시도의 예외, 또는 일시적이지 않은 첫 예외
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_transient(e):
+                raise
+            sleep(backoff_delay(attempt, base_delay, max_delay, e))
+
+
+class CircuitBreaker:
+    """
+    실패가 이어지는 엔드포인트 호출을 잠시 멈추는 차단기
+
+    연속 실패가 failure_threshold에 이르면 열리고(open), reset_timeout 동안은
+    호출하지 않고 CircuitOpenError를 냅니다. 시간이 지나면 한 번만 시험 호출을
+    허용하고(half-open), 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0):
+        """
+        Args:
+            name (str): 로그/오류 메시지에 쓸 이름 (엔드포인트 이름 등)
+            failure_threshold (int): 차단기를 여는 연속 실패 횟수
+            reset_timeout (float): 열린 뒤 시험 호출까지 기다리는 시간 (초)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """지금 호출이 차단되어 있는지 여부"""
+        with self._lock:
+            return self._failures >= self.failure_threshold and time.time() < self._opened_until
+
+    def before_call(self):
+        """호출 전에 확인합니다. 차단 중이면 CircuitOpenError를 냅니다."""
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                return
+            if time.time() < self._opened_until or self._probing:
+                raise CircuitOpenError(self.name, self._opened_until)
+            # 차단 시간이 지났으면 한 호출만 통과시켜 회복 여부를 확인합니다.
+            self._probing = True
+
+    def record_success(self):
+        """호출이 성공했을 때 (차단기를 닫음)"""
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """호출이 실패했을 때 (연속 실패가 쌓이면 차단기를 엶)"""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.failure_threshold:
+                self._opened_until = time.time() + self.reset_timeout
+
+    def release(self):
+        """호출하지 못하고 끝났을 때 (시험 호출 기회를 돌려줌)"""
+        with self._lock:
+            self._probing = False
+
+    def trip(self, until):
+        """until 시각까지 바로 차단합니다 (할당량 소진처럼 기다려도 소용없는 경우)."""
+        with self._lock:
+            self._failures = max(self._failures, self.failure_threshold)
+            self._opened_until = max(self._opened_until, until)
+            self._probing = False
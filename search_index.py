@@ -0,0 +1,208 @@
+# 필요한 라이브러리 임포트
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+
+# ====================================
+# 텍스트 정규화
+# ====================================
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# 필드별 가중치 (제목이 채널명보다 중요)
+FIELD_WEIGHTS = {'title': 2.0, 'channel': 1.0}
+
+# 일치 종류별 점수
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+SUBSTRING_SCORE = 1.5
+TYPO_SCORE = 1.0
+PHRASE_BONUS = 2.0
+
+
+def normalize(text):
+    """전각/반각 등을 통일(NFKC)하고 대소문자를 접는(casefold) 함수"""
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def tokenize(text):
+    """정규화된 텍스트를 단어 토큰으로 나누는 함수"""
+    return _TOKEN_PATTERN.findall(text)
+
+
+def ngrams(text, n=2):
+    """
+    문자 n-gram 집합 (띄어쓰기가 없는 한국어/일본어 제목의 부분 검색용)
+
+    n보다 짧은 문자열은 그 자체를 하나의 n-gram으로 취급합니다.
+    """
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def within_one_edit(a, b):
+    """
+    두 문자열의 편집 거리가 1 이하인지 확인하는 함수 (오타 허용 검색용)
+
+    삽입/삭제/치환 한 번과, 이웃한 두 글자가 뒤바뀐 경우를 허용합니다.
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diff) == 2 and diff[1] == diff[0] + 1:
+            i, j = diff
+            return a[i] == b[j] and a[j] == b[i]
+    if len(a) > len(b):
+        a, b = b, a
+    i = j = 0
+    edited = False
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            i += 1
+            j += 1
+            continue
+        if edited:
+            return False
+        edited = True
+        if len(a) == len(b):
+            i += 1  # 치환
+        j += 1      # 삽입/삭제
+    return True
+
+
+# ====================================
+# 역색인
+# ====================================
+class SearchIndex:
+    """
+    동영상 제목/채널명 검색용 역색인
+
+    스냅샷(동영상 목록)마다 한 번만 만들어 두고 검색어가 바뀔 때마다 재사용합니다.
+    정규화된 단어 토큰과 문자 bigram을 색인하므로 정확히 일치, 앞부분 일치,
+    부분 문자열, 한 글자 오타까지 찾아 관련도 순으로 정렬합니다.
+    """
+
+    def __init__(self, videos):
+        """
+        Args:
+            videos (list): Video 리스트 (검색 결과는 이 리스트의 위치로 반환)
+        """
+        self.size = len(videos)
+        # 정규화된 필드 텍스트: [{'title': ..., 'channel': ...}, ...]
+        self.texts = []
+        # 토큰 → {문서 위치: 필드 가중치}
+        self.postings = defaultdict(dict)
+        # bigram → 문서 위치 집합 (부분 문자열 후보)
+        self.gram_postings = defaultdict(set)
+        # bigram → 토큰 집합 (오타 후보)
+        self.gram_vocab = defaultdict(set)
+
+        for position, video in enumerate(videos):
+            fields = {'title': normalize(video.title), 'channel': normalize(video.channel)}
+            self.texts.append(fields)
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    postings = self.postings[token]
+                    postings[position] = max(postings.get(position, 0), weight)
+                    for gram in ngrams(token):
+                        self.gram_postings[gram].add(position)
+
+        for token in self.postings:
+            for gram in ngrams(token):
+                self.gram_vocab[gram].add(token)
+        # 앞부분 일치 검색을 위한 정렬된 어휘 목록
+        self.vocabulary = sorted(self.postings)
+
+    def _prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def _typo_tokens(self, term):
+        candidates = set()
+        for gram in ngrams(term):
+            candidates |= self.gram_vocab.get(gram, set())
+        return [token for token in candidates if token != term and within_one_edit(term, token)]
+
+    def _substring_positions(self, term):
+        if len(term) < 2:
+            # 한 글자는 bigram으로 거를 수 없으므로 전체를 확인합니다.
+            candidates = range(self.size)
+        else:
+            candidates = set.intersection(*(self.gram_postings.get(gram, set()) for gram in ngrams(term)))
+        return {
+            position for position in candidates
+            if any(term in text for text in self.texts[position].values())
+        }
+
+    def _literal_positions(self, text):
+        """정규화된 제목/채널명에 text가 그대로 들어 있는 문서 위치 (원래 순서)"""
+        return [
+            position for position in range(self.size)
+            if any(text in field for field in self.texts[position].values())
+        ]
+
+    def _score_term(self, term):
+        """검색어 토큰 하나에 대한 {문서 위치: 점수}"""
+        scores = defaultdict(float)
+        for position, weight in self.postings.get(term, {}).items():
+            scores[position] = max(scores[position], EXACT_SCORE * weight)
+        for token in self._prefix_tokens(term):
+            for position, weight in self.postings[token].items():
+                scores[position] = max(scores[position], PREFIX_SCORE * weight)
+        for position in self._substring_positions(term):
+            scores[position] = max(scores[position], SUBSTRING_SCORE)
+        # 어디에도 없을 때만 오타를 허용합니다 (짧은 단어는 오탐이 많아 제외).
+        if not scores and len(term) >= 3:
+            for token in self._typo_tokens(term):
+                for position, weight in self.postings[token].items():
+                    scores[position] = max(scores[position], TYPO_SCORE * weight)
+        return scores
+
+    def search(self, query):
+        """
+        검색어와 일치하는 문서 위치를 관련도 순으로 반환하는 함수
+
+        검색어의 모든 단어가 일치해야 하며(AND), 같은 점수면 원래 순서(순위)를
+        유지합니다. 단어로 나누면서 기호가 빠지는 검색어('c++', '!!')이거나 색인에서
+        찾은 것이 없으면, 정규화한 검색어를 그대로 부분 문자열로 찾습니다.
+
+        Args:
+            query (str): 검색어
+
+        Returns:
+            list: videos 리스트에서의 위치 목록
+        """
+        normalized = normalize(query).strip()
+        if not normalized:
+            return []
+        terms = tokenize(normalized)
+        if ''.join(terms) != ''.join(normalized.split()):
+            return self._literal_positions(normalized)
+
+        total = None
+        for term in terms:
+            scores = self._score_term(term)
+            if total is None:
+                total = scores
+            else:
+                total = {
+                    position: total[position] + score
+                    for position, score in scores.items() if position in total
+                }
+            if not total:
+                return self._literal_positions(normalized)
+
+        # 검색어 전체가 그대로 들어 있으면 가산점
+        for position in total:
+            if any(normalized in text for text in self.texts[position].values()):
+                total[position] += PHRASE_BONUS
+
+        return sorted(total, key=lambda position: (-total[position], position))
@@ -0,0 +1,69 @@
+# 필요한 라이브러리 임포트
+import threading
+
+
+class _Call:
+    """진행 중인 호출 하나 (끝나면 결과 또는 예외를 담고 event를 알림)"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 호출을 하나로 합치는 클래스 (프로세스 단위)
+
+    캐시가 한꺼번에 만료되어 여러 세션이 같은 키를 동시에 가져오려 할 때, 먼저
+    온 호출(리더)만 실제로 실행하고 나머지는 그 결과를 기다렸다가 함께 씁니다.
+    호출이 끝나면 키를 지우므로 결과를 캐시하지는 않습니다.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        key에 대해 진행 중인 호출이 없으면 func()를 실행하고, 있으면 그 결과를 기다립니다.
+
+        Args:
+            key: 호출을 구분하는 키 (해시 가능)
+            func (callable): 인자 없이 호출할 함수
+
+        Returns:
+            tuple: (func()의 결과, 다른 호출의 결과를 함께 썼으면 True)
+
+        Raises:
+            func()가 낸 예외 (기다리던 호출에도 같은 예외를 냄)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    def in_flight(self):
+        """지금 진행 중인 호출 수"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,159 @@
+# 필요한 라이브러리 임포트
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# ====================================
+# 메모리 캐시 설정
+# ====================================
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 60.0  # 이 시간이 지나면 디스크 캐시에서 다시 읽음 (초)
+
+
+def estimate_size(obj, _seen=None):
+    """
+    객체가 차지하는 메모리를 대략 계산하는 함수 (바이트)
+
+    리스트/튜플/딕셔너리와 __slots__ 객체(Video 등)를 따라 들어가며, 같은 객체를
+    여러 번 참조하면 한 번만 셉니다.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    else:
+        for name in getattr(type(obj), '__slots__', ()):
+            size += estimate_size(getattr(obj, name, None), _seen)
+    return size
+
+
+class _Snapshot:
+    """(지역, 정렬) 하나의 정식 스냅샷: 앞에서부터 이어진 페이지들"""
+
+    __slots__ = ('generation', 'pages', 'created', 'size')
+
+    def __init__(self, generation, created):
+        self.generation = generation
+        self.pages = []   # (Video 리스트, 다음 페이지 토큰) 튜플
+        self.created = created
+        self.size = 0
+
+
+class SnapshotCache:
+    """
+    (지역, 정렬)마다 스냅샷 하나만 메모리에 두는 캐시 (프로세스 단위, 스레드 안전)
+
+    개수별로 따로 저장하지 않고 앞에서부터 가져온 페이지를 이어 붙여 두므로, 30개와
+    50개 요청이 같은 스냅샷의 앞부분을 나눠 씁니다. 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 스냅샷부터 지웁니다(LRU). 저장된 Video 객체는 모든
+    세션이 공유하므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+
+    def __init__(self, max_bytes=None, ttl=None, clock=time.monotonic):
+        """
+        Args:
+            max_bytes (int): 메모리 사용량 상한 (바이트)
+            ttl (float): 스냅샷을 유지하는 시간 (초)
+            clock (callable): 현재 시각 함수 (테스트용)
+        """
+        self.max_bytes = max_bytes or int(os.getenv("YOUTUBE_MEMORY_CACHE_BYTES", DEFAULT_MAX_BYTES))
+        self.ttl = ttl if ttl is not None else float(os.getenv("YOUTUBE_MEMORY_CACHE_TTL", DEFAULT_TTL))
+        self._clock = clock
+        self._entries = OrderedDict()  # (지역, 정렬) → _Snapshot (오래 사용하지 않은 순)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        """
+        저장된 페이지 목록을 반환합니다.
+
+        Args:
+            key (tuple): (지역 코드, 정렬 기준)
+            generation (int): 새로고침 세대 번호 (다르면 없는 것으로 봄)
+
+        Returns:
+            tuple: (Video 리스트, 다음 페이지 토큰) 튜플들, 없거나 만료되었으면 빈 튜플
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.generation != generation or self._clock() - entry.created > self.ttl
+            ):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return ()
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return tuple(entry.pages)
+
+    def add_page(self, key, generation, page_index, videos, next_page_token):
+        """
+        가져온 페이지를 스냅샷에 이어 붙입니다.
+
+        첫 페이지(page_index 0)는 새 스냅샷을 시작하고, 그 뒤 페이지는 같은 세대의
+        스냅샷 바로 다음 순서일 때만 붙입니다. 다른 세션이 먼저 저장했으면 무시합니다.
+        """
+        size = estimate_size(videos) + sys.getsizeof(next_page_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if page_index == 0:
+                if entry is not None and entry.generation == generation and entry.pages:
+                    return  # 다른 세션이 이미 같은 세대의 첫 페이지를 저장함
+                if entry is not None:
+                    self._remove(key)
+                entry = self._entries[key] = _Snapshot(generation, self._clock())
+            elif entry is None or entry.generation != generation or len(entry.pages) != page_index:
+                return
+            entry.pages.append((videos, next_page_token))
+            entry.size += size
+            self._bytes += size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def discard(self, key):
+        """스냅샷 하나를 지웁니다."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        # 가장 오래 사용하지 않은 스냅샷부터 지웁니다 (방금 붙인 것 하나가 상한을 넘어도 지움).
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._evictions += 1
+
+    def stats(self):
+        """
+        메모리 사용량과 적중 통계
+
+        Returns:
+            dict: {'entries', 'pages', 'bytes', 'max_bytes', 'hits', 'misses', 'evictions'}
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'pages': sum(len(entry.pages) for entry in self._entries.values()),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+            }
@@ -0,0 +1,55 @@
+# 필요한 라이브러리 임포트
+from datetime import datetime, timezone
+
+# ====================================
+# 파생 지표
+# ====================================
+def like_ratio(video):
+    """조회수 대비 좋아요 비율 (조회수가 없으면 0)"""
+    return video.like_count / video.view_count if video.view_count else 0.0
+
+
+def views_per_hour(video, now=None):
+    """게시 후 시간당 평균 조회수 (게시일을 모르면 0)"""
+    if video.published_at is None:
+        return 0.0
+    now = now or datetime.now(timezone.utc)
+    hours = (now - video.published_at).total_seconds() / 3600
+    # 방금 올라온 동영상이 과도하게 앞서지 않도록 최소 1시간으로 계산
+    return video.view_count / max(hours, 1.0)
+
+
+# ====================================
+# 로컬 정렬
+# ====================================
+# 정렬 기준별 키 함수 (모두 내림차순)
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+SORT_KEYS = {
+    'date': lambda video, now: video.published_at or _EPOCH,
+    'viewCount': lambda video, now: video.view_count,
+    'rating': lambda video, now: video.like_count,
+    'likeRatio': lambda video, now: like_ratio(video),
+    'viewsPerHour': lambda video, now: views_per_hour(video, now),
+}
+
+
+def sort_videos(videos, order, now=None):
+    """
+    인기 차트에서 가져온 동영상을 메모리에서 다시 정렬하는 함수
+
+    정렬 기준을 바꿔도 API를 다시 호출하지 않습니다. 'mostPopular'이거나 알 수
+    없는 기준이면 차트 순서를 그대로 유지합니다.
+
+    Args:
+        videos (list): Video 리스트
+        order (str): 정렬 기준 (SORT_KEYS의 키)
+        now (datetime): 시간당 조회수 계산 기준 시각 (기본값: 현재 UTC)
+
+    Returns:
+        list: 정렬된 새 리스트
+    """
+    key = SORT_KEYS.get(order)
+    if key is None:
+        return list(videos)
+    now = now or datetime.now(timezone.utc)
+    return sorted(videos, key=lambda video: key(video, now), reverse=True)
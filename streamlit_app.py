@@ -1,11 +1,40 @@
 # 필요한 라이브러리 임포트
 import os
+import contextvars
+import html
+import itertools
 import json
+import logging
+import time
 import requests
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 
+from disk_cache import NOT_MODIFIED, DiskCache
+from formatting import (
+    format_counts, format_duration, format_durations, format_view_count, get_relative_time,
+    relative_times,
+)
+from history import HistoryStore
+from instrumentation import PHASES, REGISTRY, current_trace, end_trace, serve_metrics, start_trace
+from invalidation import RefreshTracker
+from models import Video
+from popular import (
+    PAGE_SIZE, EmptyResponseError, PageUnavailableError, cached_etag, request_video_page,
+    video_page_cache_key,
+)
+from prefetch import PrefetchScheduler, parse_priority
+from search_index import SearchIndex
+from snapshot_cache import SnapshotCache
+from thumbnails import LAYOUT_WIDTHS, ThumbnailCache
+from sorting import sort_videos
+from quota import ApiKeyPool, QuotaExceededError, TokenBucket
+from recording import FixtureRecorder
+from resilience import CircuitOpenError
+from youtube_client import YouTubeClient
+
 # ====================================
 # 페이지 설정
 # ====================================
@@ -22,227 +51,556 @@ st.set_page_config(
 from dotenv import load_dotenv
 load_dotenv()  # .env 파일에서 환경 변수 로드
 
+# ====================================
+# 선택 옵션
+# ====================================
+# 국가 선택 옵션
+COUNTRIES = {
+    'KR': '🇰🇷 한국',  # 대한민국
+    'US': '🇺🇸 미국',  # 미국
+    'JP': '🇯🇵 일본',  # 일본
+    'GB': '🇬🇧 영국',  # 영국
+    'DE': '🇩🇪 독일',  # 독일
+    'FR': '🇫🇷 프랑스', # 프랑스
+    'CA': '🇨🇦 캐나다', # 캐나다
+    'AU': '🇦🇺 호주'   # 호주
+}
+
+# 전체 국가를 한 번에 비교하는 선택지
+ALL_REGIONS = 'ALL'
+ALL_REGIONS_LABEL = '🌐 전체 국가'
+
+# 정렬 옵션
+SORT_OPTIONS = {
+    'mostPopular': '📈 인기순',
+    'date': '📅 최신순',
+    'viewCount': '👁️ 조회수순',
+    'rating': '⭐ 평점순'
+}
+
+# 로컬 정렬 모드의 정렬 옵션 (인기 차트를 메모리에서 다시 정렬)
+LOCAL_SORT_OPTIONS = {
+    'mostPopular': '📈 인기순',
+    'date': '📅 최신순',
+    'viewCount': '👁️ 조회수순',
+    'rating': '👍 좋아요순',
+    'likeRatio': '💖 좋아요 비율순',
+    'viewsPerHour': '🚀 시간당 조회수순'
+}
+
+# 로컬 정렬 시 인기 차트에서 가져올 동영상 수
+LOCAL_SORT_POOL = 200
+
+# 레이아웃 선택
+LAYOUT_OPTIONS = {
+    3: "📱 모바일 (3열)",
+    4: "💻 데스크톱 (4열)",
+    2: "📺 대형 화면 (2열)"
+}
+
+# 렌더링 방식 선택
+RENDER_OPTIONS = {
+    'streamlit': "🧱 기본 (컴포넌트)",
+    'html': "⚡ 빠른 그리드 (HTML)"
+}
+
 # ====================================
 # 유틸리티 함수들
 # ====================================
-@st.cache_data  # API 키를 캐시하여 성능 향상
-def get_youtube_api_key():
+@st.cache_resource  # 키별 사용량은 디스크에 저장되고 모든 워커가 공유
+def get_api_key_pool():
     """
-    환경 변수에서 YouTube API 키를 가져오는 함수
+    환경 변수에서 YouTube API 키 풀을 만드는 함수
+    
+    YOUTUBE_API_KEYS(쉼표로 구분한 여러 키)와 YOUTUBE_API_KEY를 모두 읽습니다.
     
     Returns:
-        str: YouTube API 키
+        ApiKeyPool: 남은 할당량에 따라 키를 골라 쓰는 키 풀
         
     Raises:
         SystemExit: API 키가 없을 경우 애플리케이션 종료
     """
-    api_key = os.getenv('YOUTUBE_API_KEY')
-    if not api_key:
+    pool = ApiKeyPool.from_env()
+    if pool is None:
         st.error("YouTube API 키가 설정되지 않았습니다. .env 파일에 YOUTUBE_API_KEY를 추가해주세요.")
         st.stop()  # API 키가 없으면 애플리케이션 중지
-    return api_key
+    return pool
 
-@st.cache_data  # 자주 호출되는 함수이므로 캐싱 적용
-def format_view_count(view_count):
+# ====================================
+# YouTube API 연동 함수
+# ====================================
+# 디스크 캐시 TTL 설정
+CACHE_TTL = 300              # 5분 동안은 신선한 데이터로 간주
+CACHE_STALE_TTL = 24 * 3600  # 만료 후 하루 동안은 오래된 데이터를 보여주며 재검증
+
+@st.cache_resource  # 프로세스당 하나의 디스크 캐시 핸들 공유
+def get_disk_cache():
+    """호스트의 모든 워커가 공유하는 디스크 캐시를 반환하는 함수"""
+    return DiskCache()
+
+@st.cache_resource  # 기록은 디스크에 쌓이고 모든 워커가 공유
+def get_history_store():
+    """인기 차트 스냅샷 기록 저장소를 반환하는 함수"""
+    return HistoryStore()
+
+def page_fetcher(region_code, order, page_index, page_token, captured_at=None):
     """
-    조회수를 한국식 형식으로 포맷팅하는 함수
-    
+    디스크 캐시에 넘길 fetch(previous) 함수 (ETag 조건부 요청 + 차트 기록)
+
     Args:
-        view_count (str or int): 포맷팅할 조회수
-        
+        captured_at (float): 이번 가져오기의 기준 시각. 한 번에 가져오는 모든 페이지에
+            같은 값을 넘겨야 차트 기록에서 스냅샷 하나로 묶입니다 (기본값: 가져온 시각)
+    """
+    def fetch(previous):
+        page = fetch_video_page(region_code, order, page_token, etag=cached_etag(previous))
+        if page is NOT_MODIFIED and previous is not None:
+            # 바뀌지 않았음을 지금 확인했으므로 저장된 페이지를 이번 시각으로 다시 저장하고
+            # 기록합니다 (다음 페이지만 바뀐 경우에도 스냅샷이 온전하게 남음).
+            page = dict(previous.value)
+        record_history(region_code, order, page_index, page, captured_at or time.time())
+        return page
+    return fetch
+
+def record_history(region_code, order, page_index, page, captured_at):
+    """
+    새로 가져온 인기 차트 페이지를 순위와 함께 기록하는 함수 (다른 정렬은 순위가 없어 제외)
+
+    Args:
+        captured_at (float): 이번 가져오기의 기준 시각 (페이지에도 'captured_at'으로 남김)
+    """
+    if order != 'mostPopular' or not page or page is NOT_MODIFIED:
+        return
+    page['captured_at'] = captured_at
+    videos = [Video.from_dict(video) for video in page['videos']]
+    get_history_store().record(
+        region_code, videos, start_rank=page_index * PAGE_SIZE + 1, captured_at=captured_at,
+    )
+
+@st.cache_resource  # 프로세스 전체에서 새로고침 빈도를 제한
+def get_refresh_bucket():
+    """새로고침 버튼용 토큰 버킷 (기본값: 최대 5번, 1분마다 1번씩 충전)"""
+    return TokenBucket(
+        capacity=int(os.getenv('YOUTUBE_REFRESH_BURST', '5')),
+        refill_seconds=float(os.getenv('YOUTUBE_REFRESH_INTERVAL', '60')),
+    )
+
+@st.cache_resource  # 프로세스당 하나의 HTTP 연결 풀 공유
+def get_youtube_client():
+    """keep-alive 연결을 재사용하는 공용 YouTube API 클라이언트를 반환하는 함수"""
+    return YouTubeClient(
+        keys=get_api_key_pool(),
+        attempts=int(os.getenv('YOUTUBE_RETRY_ATTEMPTS', '3')),
+        failure_threshold=int(os.getenv('YOUTUBE_BREAKER_THRESHOLD', '5')),
+        reset_timeout=float(os.getenv('YOUTUBE_BREAKER_RESET', '60')),
+        recorder=FixtureRecorder.from_env(),
+    )
+
+@st.cache_resource  # 프로세스 전체의 세션이 같은 스냅샷을 공유
+def get_snapshot_cache():
+    """(지역, 정렬)마다 스냅샷 하나를 두는 메모리 캐시 (기본값: 64MB, 1분)를 반환하는 함수"""
+    return SnapshotCache()
+
+def get_video_page(region_code, order, page_index, page_token=None, captured_at=None):
+    """
+    동영상 목록 한 페이지를 디스크 캐시를 거쳐 가져오는 함수
+
+    디스크(SQLite) → YouTube API 순서로 조회하며, 메모리 캐시(SnapshotCache)는
+    iter_popular_video_pages()에서 확인합니다. API 키는 인자가 아니므로(클라이언트의
+    키 풀에서 붙임) 어느 키로 가져왔든 캐시를 공유합니다.
+
+    Args:
+        region_code (str): 지역 코드
+        order (str): 정렬 기준
+        page_index (int): 0부터 시작하는 페이지 번호
+        page_token (str): 이전 페이지의 nextPageToken (첫 페이지는 None)
+        captured_at (float): 이번 가져오기의 기준 시각 (차트 기록용, page_fetcher 참고)
+
     Returns:
-        str: 포맷팅된 조회수 (예: '1.2만회', '1억 2,345만회')
+        dict: {'videos': Video 리스트, 'next_page_token': 다음 페이지 토큰}
+              API 호출에 실패하면 디스크에 남아 있는 마지막 정상 데이터를 반환합니다.
+
+    Raises:
+        PageUnavailableError: 가져오지 못했고 캐시에도 없는 경우 (실패는 캐시되지 않음)
     """
-    try:
-        count = int(view_count)
-        # 1억 이상인 경우
-        if count >= 100000000:
-            # 1억 이상 1억 1만 미만: '1억회'로 표시
-            # 1억 1만 이상: '1억 1,234만회'로 표시
-            return f"{count//100000000}억{(count%100000000)//10000:,}만회" if count%100000000 >= 10000 else f"{count//100000000}억회"
-        # 1만 이상 1억 미만
-        elif count >= 10000:
-            return f"{count//10000:,}만회"
-        # 1만 미만
-        else:
-            return f"{count:,}회"
-    except (ValueError, TypeError):
-        return "조회수 정보 없음"
+    page = get_disk_cache().get_or_fetch(
+        video_page_cache_key(region_code, order, page_index),
+        page_fetcher(region_code, order, page_index, page_token, captured_at),
+        ttl=CACHE_TTL,
+        stale_ttl=CACHE_STALE_TTL,
+    )
+    if not page or page is NOT_MODIFIED:
+        raise PageUnavailableError(video_page_cache_key(region_code, order, page_index))
+    return {
+        'videos': [Video.from_dict(video) for video in page['videos']],
+        'next_page_token': page.get('next_page_token'),
+    }
+
+@st.cache_resource  # 프로세스 전체의 세션이 같은 새로고침 상태를 공유
+def get_refresh_tracker():
+    """(지역, 정렬) 단위로 새로고침 세대와 디바운스를 관리하는 객체를 반환하는 함수"""
+    return RefreshTracker(debounce_seconds=float(os.getenv('YOUTUBE_REFRESH_DEBOUNCE', '10')))
+
+def refresh_selection(targets):
+    """
+    선택한 (지역, 정렬, 개수) 조합만 새로 가져오는 함수
 
-def format_duration(duration_str):
+    다른 조합의 캐시는 건드리지 않습니다. 디스크 캐시를 먼저 갱신한 뒤 세대 번호를
+    올리므로, 이어지는 화면 갱신에서 이 조합만 메모리 캐시를 건너뛰고 새 데이터를
+    읽습니다. 짧은 시간 안의 중복 새로고침은 무시합니다.
+
+    Args:
+        targets (list): (region_code, order, max_results) 튜플의 리스트
+
+    Returns:
+        int: 디바운스로 무시되지 않고 새로고침을 시도한 조합 수
     """
-    YouTube duration을 읽기 쉬운 형태로 변환
+    tracker = get_refresh_tracker()
+    targets = [target for target in targets if tracker.request(target[:2])]
+    if not targets:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(8, len(targets))) as executor:
+        refreshed = list(executor.map(lambda target: refresh_video_pages(*target), targets))
+    # 디스크 캐시에 새 데이터가 저장된 조합만 세대 번호를 올립니다.
+    for target, ok in zip(targets, refreshed):
+        if ok:
+            tracker.bump(target[:2])
+    return len(targets)
+
+def get_snapshot_age(region_code, order):
+    """디스크 캐시에 저장된 (지역, 정렬) 첫 페이지가 만들어진 뒤 지난 시간 (초, 없으면 None)"""
+    entry = get_disk_cache().get(video_page_cache_key(region_code, order, 0))
+    return entry.age if entry is not None else None
+
+def format_age(seconds):
+    """경과 시간(초)을 '방금 전', '3분 전' 같은 문자열로 변환"""
+    if seconds < 60:
+        return "방금 전"
+    elif seconds < 3600:
+        return f"{int(seconds // 60)}분 전"
+    else:
+        return f"{int(seconds // 3600)}시간 전"
+
+def iter_popular_video_pages(max_results=30, region_code='KR', order='mostPopular'):
     """
-    if not duration_str:
-        return ""
-    
-    # PT4M13S 형태를 4:13 형태로 변환
-    import re
-    pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-    match = re.match(pattern, duration_str)
-    
-    if match:
-        hours, minutes, seconds = match.groups()
-        hours = int(hours) if hours else 0
-        minutes = int(minutes) if minutes else 0
-        seconds = int(seconds) if seconds else 0
-        
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{seconds:02d}"
+    nextPageToken을 따라가며 동영상 목록을 페이지 단위로 내보내는 제너레이터
+
+    메모리 캐시의 스냅샷에 있는 페이지는 그대로 쓰고, 모자라는 페이지만 가져와
+    스냅샷에 이어 붙입니다. 개수가 달라도 같은 스냅샷의 앞부분을 잘라 씁니다.
+
+    Args:
+        max_results (int): 가져올 전체 동영상 수
+        region_code (str): 지역 코드 (기본값: 'KR' - 한국)
+        order (str): 정렬 기준 ('mostPopular', 'date', 'viewCount', 'rating')
+
+    Yields:
+        list: 한 페이지 분량의 Video 리스트
+    """
+    key = (region_code, order)
+    generation = get_refresh_tracker().generation(key)
+    cache = get_snapshot_cache()
+    cached_pages = cache.get(key, generation)
+    captured_at = time.time()  # 이번에 가져오는 페이지들을 차트 스냅샷 하나로 기록
+    remaining = max_results
+    page_index = 0
+    page_token = None
+    while remaining > 0:
+        if page_index < len(cached_pages):
+            REGISTRY.record_cache('memory', 'hit')
+            videos, next_page_token = cached_pages[page_index]
         else:
-            return f"{minutes}:{seconds:02d}"
-    
-    return ""
+            REGISTRY.record_cache('memory', 'miss')
+            try:
+                page = get_video_page(region_code, order, page_index, page_token, captured_at)
+            except PageUnavailableError:
+                return
+            videos, next_page_token = page['videos'], page.get('next_page_token')
+            cache.add_page(key, generation, page_index, videos, next_page_token)
+        videos = videos[:remaining]
+        if not videos:
+            return
+        yield videos
+        remaining -= len(videos)
+        page_token = next_page_token
+        if not page_token:
+            return
+        page_index += 1
+
+def get_popular_videos(max_results=30, region_code='KR', order='mostPopular'):
+    """
+    인기 동영상 목록을 한 번에 가져오는 함수 (페이지를 모두 모아 반환)
+
+    Args:
+        max_results (int): 가져올 동영상 수 (기본값: 30)
+        region_code (str): 지역 코드 (기본값: 'KR' - 한국)
+        order (str): 정렬 기준 ('mostPopular', 'date', 'viewCount', 'rating')
 
-def get_relative_time(published_at):
+    Returns:
+        list: Video 리스트
     """
-    게시일을 상대적 시간으로 변환
+    return [
+        video
+        for page in iter_popular_video_pages(max_results, region_code, order)
+        for video in page
+    ]
+
+def refresh_video_pages(region_code, order, max_results):
     """
-    try:
-        from datetime import datetime
-        published = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-        now = datetime.now(published.tzinfo)
-        diff = now - published
-        
-        if diff.days > 0:
-            return f"{diff.days}일 전"
-        elif diff.seconds > 3600:
-            return f"{diff.seconds // 3600}시간 전"
-        elif diff.seconds > 60:
-            return f"{diff.seconds // 60}분 전"
-        else:
-            return "방금 전"
-    except:
-        return ""
+    캐시를 거치지 않고 필요한 페이지를 모두 새로 가져와 디스크 캐시에 저장하는 함수
 
-# ====================================
-# YouTube API 연동 함수
-# ====================================
-@st.cache_data(ttl=300, show_spinner=False)  # 5분간 캐시 유지, 로딩 스피너 비활성화
-def get_popular_videos(api_key, max_results=30, region_code='KR', order='mostPopular'):
+    다른 세션이나 미리 가져오기가 같은 페이지를 가져오는 중이면 그 결과를 함께 씁니다.
+
+    Returns:
+        bool: 첫 페이지를 가져왔으면 True
     """
-    YouTube API를 통해 인기 동영상 목록을 가져오는 함수
+    cache = get_disk_cache()
+    captured_at = time.time()  # 모든 페이지를 차트 스냅샷 하나로 기록
+    page_token = None
+    page_index = 0
+    remaining = max_results
+    while remaining > 0:
+        # 바뀐 것이 없으면(304) 저장된 페이지를 그대로 다시 저장합니다.
+        page = cache.refresh(
+            video_page_cache_key(region_code, order, page_index),
+            page_fetcher(region_code, order, page_index, page_token, captured_at),
+            CACHE_TTL,
+        )
+        if not page:
+            return page_index > 0
+        remaining -= len(page['videos'])
+        page_token = page.get('next_page_token')
+        if not page_token:
+            break
+        page_index += 1
+    return True
+
+# 국가별 작업 스레드에는 ScriptRunContext가 없어 st.error/st.warning이 화면에 나오지 않으므로,
+# 그동안 메시지를 모아 둘 리스트 (None이면 바로 표시)
+_deferred_messages = contextvars.ContextVar('deferred_messages', default=None)
+
+def show_message(level, message):
+    """
+    오류/경고 메시지를 표시하는 함수
+
+    get_popular_videos_multi()의 작업 스레드에서 호출되면 모아 두었다가, 작업이 끝난 뒤
+    메인 스레드에서 한꺼번에 표시합니다.
+
+    Args:
+        level (str): 'error' 또는 'warning'
+        message (str): 표시할 메시지
+    """
+    messages = _deferred_messages.get()
+    if messages is not None:
+        messages.append((level, message))
+    elif level == 'error':
+        st.error(message)
+    else:
+        st.warning(message)
+
+def fetch_video_page(region_code='KR', order='mostPopular', page_token=None, etag=None):
+    """
+    YouTube API를 통해 동영상 목록 한 페이지(최대 50개)를 가져오는 함수 (캐시 없음)
+    
+    실제 호출과 파싱은 popular.request_video_page()가 담당하고, 여기서는 오류를
+    화면에 표시합니다 (show_message 참고).
     
     Args:
-        api_key (str): YouTube Data API 키
-        max_results (int): 가져올 동영상 수 (기본값: 30)
         region_code (str): 지역 코드 (기본값: 'KR' - 한국)
         order (str): 정렬 기준 ('mostPopular', 'date', 'viewCount', 'rating')
+        page_token (str): 가져올 페이지의 토큰 (첫 페이지는 None)
+        etag (str): 캐시된 페이지의 ETag (인기순에서 조건부 요청에 사용)
         
     Returns:
-        list: 동영상 정보가 담긴 딕셔너리의 리스트
+        dict: {'videos': Video.to_dict() 리스트, 'next_page_token': 다음 페이지 토큰, 'etag': ETag},
+              가져오지 못했으면 빈 딕셔너리,
+              캐시된 페이지에서 바뀌지 않았으면 NOT_MODIFIED
     """
     try:
-        if order == 'mostPopular':
-            # YouTube Data API v3 endpoint for most popular videos
-            url = "https://www.googleapis.com/youtube/v3/videos"
-            params = {
-                'part': 'snippet,statistics,contentDetails',
-                'chart': 'mostPopular',
-                'regionCode': region_code,
-                'maxResults': max_results,
-                'key': api_key
-            }
-        else:
-            # For other sorting options, use search with popular keywords
-            search_queries = {
-                'date': 'music OR gaming OR news OR entertainment',
-                'viewCount': 'trending OR viral OR popular',
-                'rating': 'best OR top OR amazing'
-            }
-            
-            url = "https://www.googleapis.com/youtube/v3/search"
-            params = {
-                'part': 'snippet',
-                'type': 'video',
-                'regionCode': region_code,
-                'maxResults': max_results,
-                'order': order,
-                'q': search_queries.get(order, 'popular'),
-                'key': api_key
-            }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'items' not in data or len(data['items']) == 0:
-            st.error(f"YouTube API에서 데이터를 가져올 수 없습니다. 응답: {data}")
-            return []
-        
-        videos = []
-        for item in data['items']:
-            if order == 'mostPopular':
-                video = {
-                    'id': item['id'],
-                    'title': item['snippet']['title'],
-                    'channel': item['snippet']['channelTitle'],
-                    'thumbnail': item['snippet']['thumbnails']['medium']['url'],
-                    'thumbnail_high': item['snippet']['thumbnails'].get('high', {}).get('url', item['snippet']['thumbnails']['medium']['url']),
-                    'view_count': item['statistics'].get('viewCount', '0'),
-                    'like_count': item['statistics'].get('likeCount', '0'),
-                    'comment_count': item['statistics'].get('commentCount', '0'),
-                    'published_at': item['snippet']['publishedAt'],
-                    'duration': item.get('contentDetails', {}).get('duration', ''),
-                    'description': item['snippet'].get('description', '')[:200] + '...' if item['snippet'].get('description', '') else '',
-                    'url': f"https://www.youtube.com/watch?v={item['id']}"
-                }
-            else:
-                # For search results, we need to get video statistics separately
-                video_id = item['id']['videoId']
-                video = {
-                    'id': video_id,
-                    'title': item['snippet']['title'],
-                    'channel': item['snippet']['channelTitle'],
-                    'thumbnail': item['snippet']['thumbnails']['medium']['url'],
-                    'thumbnail_high': item['snippet']['thumbnails'].get('high', {}).get('url', item['snippet']['thumbnails']['medium']['url']),
-                    'view_count': '0',  # Will be updated below
-                    'like_count': '0',
-                    'comment_count': '0',
-                    'published_at': item['snippet']['publishedAt'],
-                    'duration': '',
-                    'description': item['snippet'].get('description', '')[:200] + '...' if item['snippet'].get('description', '') else '',
-                    'url': f"https://www.youtube.com/watch?v={video_id}"
-                }
-            videos.append(video)
-        
-        # Get statistics for search results
-        if order != 'mostPopular' and videos:
-            try:
-                video_ids = [video['id'] for video in videos]
-                stats_url = "https://www.googleapis.com/youtube/v3/videos"
-                stats_params = {
-                    'part': 'statistics,contentDetails',
-                    'id': ','.join(video_ids),
-                    'key': api_key
-                }
-                stats_response = requests.get(stats_url, params=stats_params, timeout=10)
-                if stats_response.status_code == 200:
-                    stats_data = stats_response.json()
-                    if 'items' in stats_data:
-                        stats_dict = {item['id']: item for item in stats_data['items']}
-                        for video in videos:
-                            if video['id'] in stats_dict:
-                                stats = stats_dict[video['id']].get('statistics', {})
-                                video['view_count'] = stats.get('viewCount', '0')
-                                video['like_count'] = stats.get('likeCount', '0')
-                                video['comment_count'] = stats.get('commentCount', '0')
-                                video['duration'] = stats_dict[video['id']].get('contentDetails', {}).get('duration', '')
-            except Exception as e:
-                st.warning(f"조회수 정보를 가져오는 중 오류가 발생했습니다: {str(e)}")
-        
-        return videos
-        
+        return request_video_page(
+            get_youtube_client(), region_code, order, page_token, etag,
+            on_warning=lambda message: show_message('warning', message),
+        )
+    except QuotaExceededError:
+        # 할당량이 부족하면 호출하지 않고, 캐시에 남은 데이터를 보여줍니다.
+        show_message('warning', "⚠️ 오늘의 API 할당량이 얼마 남지 않아 캐시된 데이터를 표시합니다.")
+        return {}
+    except CircuitOpenError:
+        # 차단 중에는 조용히 마지막 정상 데이터를 보여줍니다 (화면 상단에 한 번 안내).
+        return {}
+    except EmptyResponseError as e:
+        show_message('error', f"YouTube API에서 데이터를 가져올 수 없습니다. 응답: {e.data}")
+        return {}
     except requests.exceptions.RequestException as e:
-        st.error(f"네트워크 오류가 발생했습니다: {str(e)}")
-        return []
+        show_message('error', f"네트워크 오류가 발생했습니다: {str(e)}")
+        return {}
     except json.JSONDecodeError:
-        st.error("YouTube API 응답을 처리할 수 없습니다.")
-        return []
+        show_message('error', "YouTube API 응답을 처리할 수 없습니다.")
+        return {}
     except Exception as e:
-        st.error(f"예상치 못한 오류가 발생했습니다: {str(e)}")
-        return []
+        show_message('error', f"예상치 못한 오류가 발생했습니다: {str(e)}")
+        return {}
+
+def get_popular_videos_multi(region_codes, max_results=30, order='mostPopular', max_workers=8):
+    """
+    여러 국가의 인기 동영상을 병렬로 가져오는 함수
+
+    국가별 요청을 제한된 스레드 풀에서 동시에 실행하므로 전체 소요 시간은
+    국가 수와 관계없이 가장 느린 요청 하나 정도입니다.
+
+    Args:
+        region_codes (list): 지역 코드 목록
+        max_results (int): 국가별로 가져올 동영상 수
+        order (str): 정렬 기준
+        max_workers (int): 동시에 실행할 최대 요청 수
+
+    Returns:
+        tuple: (Video 리스트, {지역 코드: 소요 시간(초)})
+               동영상마다 region 속성에 지역 코드가 채워집니다.
+               국가별 오류/경고는 모든 요청이 끝난 뒤 메인 스레드에서 표시합니다.
+    """
+    def fetch_region(region_code):
+        # 복사한 컨텍스트 안에서 실행되므로 이 국가의 메시지만 모입니다.
+        messages = []
+        _deferred_messages.set(messages)
+        started = time.perf_counter()
+        videos = get_popular_videos(max_results, region_code, order)
+        return videos, time.perf_counter() - started, messages
+
+    region_codes = list(region_codes)
+    if not region_codes:
+        return [], {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(region_codes))) as executor:
+        # 국가별 단계 시간도 이번 실행의 계측에 모이도록 컨텍스트를 복사해 넘깁니다.
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_region, region_code)
+            for region_code in region_codes
+        ]
+        results = [future.result() for future in futures]
+
+    merged = []
+    latencies = {}
+    notices = {}  # (수준, 메시지) → 지역 코드 리스트 (같은 메시지는 한 번만 표시)
+    for region_code, (videos, elapsed, messages) in zip(region_codes, results):
+        latencies[region_code] = elapsed
+        if not videos and not messages:
+            messages = [('warning', "인기 동영상을 가져오지 못했습니다.")]
+        for notice in messages:
+            notices.setdefault(notice, []).append(region_code)
+        # 메모리 캐시의 객체는 다른 세션과 공유하므로 사본에 지역을 표시합니다.
+        merged.extend(video.with_region(region_code) for video in videos)
+    for (level, message), codes in notices.items():
+        labels = ", ".join(COUNTRIES.get(code, code) for code in codes)
+        show_message(level, f"{labels}: {message}")
+    return merged, latencies
+
+@st.cache_resource  # 프로세스당 스케줄러 하나만 실행
+def start_prefetcher():
+    """
+    모든 국가의 인기 차트를 미리 가져오는 백그라운드 스케줄러를 시작하는 함수
+
+    YOUTUBE_PREFETCH=1 일 때만 사용합니다. 인기순 외의 정렬은 search.list(100 units)를
+    쓰므로 기본값에서는 제외합니다. 다음 환경 변수로 조정할 수 있습니다.
+        YOUTUBE_PREFETCH_ORDERS: 미리 가져올 정렬 (쉼표 구분, 기본값: 'mostPopular')
+        YOUTUBE_PREFETCH_PRIORITY: 먼저 갱신할 조합 (기본값: 'KR:mostPopular')
+        YOUTUBE_PREFETCH_STAGGER: 요청 사이 간격 초 (기본값: 2)
+        YOUTUBE_PREFETCH_MAX_RESULTS: 미리 가져올 동영상 수 (기본값: 30)
+        YOUTUBE_PREFETCH_MIN_QUOTA: 남은 할당량이 이보다 적으면 멈춤 (기본값: 하루 할당량의 절반)
+    """
+    max_results = int(os.getenv('YOUTUBE_PREFETCH_MAX_RESULTS', '30'))
+    orders = [
+        order.strip()
+        for order in os.getenv('YOUTUBE_PREFETCH_ORDERS', 'mostPopular').split(',')
+        if order.strip() in SORT_OPTIONS
+    ]
+    combinations = [
+        (region_code, order, max_results)
+        for region_code in COUNTRIES
+        for order in orders
+    ]
+    key_pool = get_api_key_pool()
+    scheduler = PrefetchScheduler(
+        cache=get_disk_cache(),
+        refresh=lambda region_code, order, count: refresh_video_pages(region_code, order, count),
+        key_func=lambda region_code, order, count: video_page_cache_key(region_code, order, 0),
+        combinations=combinations,
+        priority=parse_priority(os.getenv('YOUTUBE_PREFETCH_PRIORITY', 'KR:mostPopular')),
+        stagger=float(os.getenv('YOUTUBE_PREFETCH_STAGGER', '2')),
+        remaining=key_pool.remaining,
+        min_remaining=int(os.getenv('YOUTUBE_PREFETCH_MIN_QUOTA', key_pool.daily_limit // 2)),
+    )
+    return scheduler.start()
+
+@st.cache_resource  # 프로세스당 서버 하나만 실행
+def start_metrics_server(port):
+    """
+    단계별 소요 시간과 캐시 적중 카운터를 /metrics(Prometheus 형식)로 제공하는 함수
+
+    워커가 여러 개라 다른 프로세스가 이미 포트를 쓰고 있으면 기록만 남기고 앱은
+    그대로 실행합니다.
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버, 시작하지 못했으면 None
+    """
+    try:
+        return serve_metrics(port)
+    except OSError as e:
+        logging.getLogger('youtube_app.metrics').warning("/metrics 서버를 시작하지 못했습니다 (포트 %s): %s", port, e)
+        return None
+
+@st.cache_resource  # 핸들러가 중복으로 붙지 않도록 한 번만 설정
+def get_metrics_logger():
+    """
+    실행마다 계측 요약을 JSON 한 줄로 남기는 로거를 반환하는 함수
+
+    YOUTUBE_METRICS_LOG=1 이면 표준 에러로 출력합니다.
+    """
+    logger = logging.getLogger('youtube_app.metrics')
+    if os.getenv('YOUTUBE_METRICS_LOG') == '1':
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
+
+@st.cache_resource  # 프로세스당 하나의 썸네일 캐시 (디스크는 워커 간 공유)
+def get_thumbnail_cache():
+    """레이아웃에 맞게 줄인 썸네일을 디스크에 보관하는 캐시를 반환하는 함수"""
+    return ThumbnailCache()
+
+def resolve_thumbnail(video, layout, thumbnails=None, for_html=False):
+    """
+    카드에 표시할 썸네일 주소를 정하는 함수
+
+    썸네일 캐시를 쓰는 경우, 레이아웃 너비로 줄인 사본이 준비되어 있으면 그것을
+    사용하고 아직 없으면 원본 URL을 그대로 씁니다 (사본은 백그라운드에서 생성).
+
+    Args:
+        video (Video): 동영상
+        layout (int): 그리드 열 수
+        thumbnails (ThumbnailCache): 썸네일 캐시 (None이면 원본 URL 사용)
+        for_html (bool): HTML 그리드용이면 정적 파일 URL, 아니면 파일 경로 반환
+            (정적 파일로 제공할 수 없는 디렉터리면 원본 URL)
+    """
+    if thumbnails is None:
+        return video.thumbnail
+    path = thumbnails.cached_path(video.thumbnail, LAYOUT_WIDTHS.get(layout, 320))
+    if path is None:
+        return video.thumbnail
+    if for_html:
+        # 썸네일 디렉터리가 static/ 밖이면 정적 파일로 제공할 수 없으므로 원본 URL을 씁니다.
+        return thumbnails.static_url(path) or video.thumbnail
+    return path
+
+@st.cache_resource(max_entries=32)  # 스냅샷마다 한 번만 색인 생성
+def get_search_index(snapshot_key, _videos):
+    """
+    동영상 목록(스냅샷)의 검색 색인을 반환하는 함수
+
+    Args:
+        snapshot_key (tuple): 스냅샷을 구분하는 동영상 ID 튜플 (캐시 키)
+        _videos (list): 색인할 Video 리스트 (해시하지 않음)
+    """
+    return SearchIndex(_videos)
 
 # ====================================
 # UI/UX 관련 함수
@@ -493,35 +851,79 @@ def set_custom_css():
             color: #888;
             font-size: 0.9rem;
         }
+        
+        /* HTML 그리드 (한 번에 렌더링) */
+        .video-grid {
+            display: grid;
+            gap: 16px;
+            margin-bottom: 16px;
+        }
+        
+        @media (max-width: 768px) {
+            .video-grid {
+                grid-template-columns: 1fr !important;
+            }
+        }
     </style>
     """, unsafe_allow_html=True)
 
-def create_video_card(video, rank=None):
-    """개선된 비디오 카드 생성"""
-    duration = format_duration(video['duration'])
-    relative_time = get_relative_time(video['published_at'])
+def card_labels(videos, years=False):
+    """
+    카드에 표시할 문구를 열 단위로 한 번에 포맷팅하는 함수
+
+    Returns:
+        list: 동영상마다 (조회수, 좋아요, 댓글, 길이, 게시 시간) 튜플
+    """
+    return list(zip(
+        format_counts(video.view_count for video in videos),
+        format_counts(video.like_count for video in videos),
+        format_counts(video.comment_count for video in videos),
+        format_durations(video.duration for video in videos),
+        relative_times((video.published_at for video in videos), years=years),
+    ))
+
+def create_video_card(video, rank=None, thumbnail_url=None, labels=None):
+    """
+    개선된 비디오 카드 생성 (thumbnail_url이 없으면 원본 썸네일 사용)
+
+    labels는 card_labels()로 미리 포맷팅한 문구이며, 없으면 여기서 포맷팅합니다.
+    """
+    views, likes, comments, duration, relative_time = labels or (
+        format_view_count(video.view_count),
+        format_view_count(video.like_count),
+        format_view_count(video.comment_count),
+        format_duration(video.duration),
+        get_relative_time(video.published_at),
+    )
     
     # 제목 길이 제한
-    title = video['title']
+    title = video.title
     if len(title) > 60:
         title = title[:60] + "..."
     
     # 채널명 길이 제한
-    channel = video['channel']
+    channel = video.channel
     if len(channel) > 25:
         channel = channel[:25] + "..."
     
+    # HTML로 그대로 삽입되므로 특수문자를 이스케이프
+    title = html.escape(title)
+    channel = html.escape(channel)
+    # 전체 국가 보기에서는 어느 지역 차트의 동영상인지 표시
+    region = html.escape(COUNTRIES.get(video.region, video.region)) if video.region else ''
+    
     return f"""
     <div class="video-card">
         <div class="thumbnail-container">
-            <img src="{video['thumbnail_high']}" 
+            <img src="{thumbnail_url or video.thumbnail}" 
                  style="width: 100%; height: 200px; object-fit: cover; border-radius: 8px;" 
                  loading="lazy">
             {f'<div class="duration-badge">{duration}</div>' if duration else ''}
             {f'<div class="duration-badge" style="top: 8px; right: 8px; bottom: auto; background: #FF4444;">#{rank}</div>' if rank else ''}
+            {f'<div class="duration-badge" style="top: 8px; left: 8px; right: auto; bottom: auto;">{region}</div>' if region else ''}
         </div>
         
-        <a href="{video['url']}" target="_blank" class="video-title">
+        <a href="{video.url}" target="_blank" class="video-title">
             {title}
         </a>
         
@@ -532,21 +934,385 @@ def create_video_card(video, rank=None):
         <div class="video-stats">
             <div class="stat-item">
                 <span>👁️</span>
-                <span>{format_view_count(video['view_count'])}</span>
+                <span>{views}</span>
             </div>
             <div class="stat-item">
                 <span>👍</span>
-                <span>{format_view_count(video['like_count'])}</span>
+                <span>{likes}</span>
             </div>
             <div class="stat-item">
                 <span>💬</span>
-                <span>{format_view_count(video['comment_count'])}</span>
+                <span>{comments}</span>
             </div>
             {f'<div class="stat-item"><span>🕐</span><span>{relative_time}</span></div>' if relative_time else ''}
         </div>
     </div>
     """
 
+def compute_totals(videos):
+    """
+    동영상 목록의 합계를 계산하는 함수
+
+    Returns:
+        tuple: (동영상 수, 총 조회수, 총 좋아요, 총 댓글)
+    """
+    return (
+        len(videos),
+        sum(video.view_count for video in videos),
+        sum(video.like_count for video in videos),
+        sum(video.comment_count for video in videos),
+    )
+
+def render_metric_cards(slots, totals):
+    """
+    총 동영상/조회수/좋아요/댓글 메트릭 카드를 표시하는 함수
+
+    Args:
+        slots (list): st.empty()로 만든 자리 4개
+        totals (tuple): compute_totals()의 결과
+    """
+    count, total_views, total_likes, total_comments = totals
+    
+    metrics = [
+        (count, "총 동영상"),
+        (format_view_count(total_views), "총 조회수"),
+        (format_view_count(total_likes), "총 좋아요"),
+        (format_view_count(total_comments), "총 댓글"),
+    ]
+    for slot, (value, label) in zip(slots, metrics):
+        slot.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{value}</div>
+            <div class="metric-label">{label}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_chart_history(region_code, limit=10):
+    """
+    최근 24시간 동안 인기 차트에서 빠르게 오른 동영상을 표시하는 함수
+
+    Args:
+        region_code (str): 지역 코드
+        limit (int): 표마다 보여줄 동영상 수
+    """
+    store = get_history_store()
+    if not store.has_previous(region_code):
+        st.caption("차트 기록이 두 번 이상 쌓이면 순위 변화와 조회수 증가 속도를 보여드립니다.")
+        return
+    
+    since = time.time() - 86400
+    tables = [
+        ('🚀 시간당 조회수 증가', 'views_per_hour'),
+        ('📈 순위 상승', 'rank_delta'),
+    ]
+    for col, (label, metric) in zip(st.columns(len(tables)), tables):
+        movers = store.top_movers(region_code, by=metric, limit=limit, since=since)
+        with col:
+            st.markdown(f"**{label}**")
+            st.dataframe({
+                '순위': movers['rank'].astype(int),
+                '제목': movers['title'],
+                '순위 변화': movers['rank_delta'],
+                '시간당 조회수': format_counts(movers['views_per_hour']),
+                '차트 체류(시간)': movers['hours_on_chart'].round(1),
+            }, hide_index=True)
+
+def render_debug_panel(container, trace):
+    """
+    이번 실행과 프로세스 전체의 단계별 소요 시간, 캐시 적중 결과를 표시하는 함수
+
+    Args:
+        container: 표시할 Streamlit 컨테이너 (사이드바 expander 등)
+        trace (RunTrace): 이번 실행의 계측값
+    """
+    summary = trace.summary()
+    totals = REGISTRY.snapshot()
+    phases = [phase for phase in PHASES if phase in totals['phases']]
+    with container:
+        st.markdown(f"**이번 실행:** {summary['total_ms']:.0f}ms")
+        st.dataframe({
+            '단계': phases,
+            '이번 실행(ms)': [summary['phases_ms'].get(phase, 0.0) for phase in phases],
+            '평균(ms)': [
+                round(totals['phases'][phase]['sum'] / totals['phases'][phase]['count'] * 1000, 1)
+                for phase in phases
+            ],
+            '최대(ms)': [round(totals['phases'][phase]['max'] * 1000, 1) for phase in phases],
+            '횟수': [totals['phases'][phase]['count'] for phase in phases],
+        }, hide_index=True)
+        
+        cache = sorted(totals['cache'].items())
+        st.dataframe({
+            '캐시': [f"{tier} {outcome}" for (tier, outcome), _ in cache],
+            '이번 실행': [summary['cache'].get(f"{tier}.{outcome}", 0) for (tier, outcome), _ in cache],
+            '누적': [count for _, count in cache],
+        }, hide_index=True)
+        
+        memory = get_snapshot_cache().stats()
+        st.caption(
+            f"메모리 캐시: 스냅샷 {memory['entries']}개 ({memory['pages']}페이지), "
+            f"{memory['bytes'] / 1024 / 1024:.1f}MB / {memory['max_bytes'] / 1024 / 1024:.0f}MB, "
+            f"제거 {memory['evictions']}회"
+        )
+
+def finish_run(trace, debug_panel=None):
+    """이번 실행의 계측 요약을 로그로 남기고, 디버그 패널이 켜져 있으면 표시하는 함수"""
+    end_trace()
+    get_metrics_logger().info(json.dumps(trace.summary(), ensure_ascii=False))
+    if debug_panel is not None:
+        render_debug_panel(debug_panel, trace)
+
+def build_video_grid_html(videos, layout, start_rank=1, show_rank=True, thumbnails=None):
+    """
+    동영상 카드 전체를 CSS 그리드 HTML 문자열 하나로 만드는 함수
+
+    줄마다 들여쓰기를 없애 한 줄로 합치므로 마크다운 코드 블록으로 해석되지 않고,
+    전송되는 크기도 줄어듭니다.
+
+    Args:
+        videos (list): 표시할 Video 리스트
+        layout (int): 그리드 열 수
+        start_rank (int): 첫 번째 카드의 순위
+        show_rank (bool): 순위 배지 표시 여부
+        thumbnails (ThumbnailCache): 줄인 썸네일을 제공할 캐시 (선택)
+
+    Returns:
+        str: 그리드 HTML
+    """
+    cards = "".join(
+        create_video_card(
+            video,
+            start_rank + idx if show_rank else None,
+            resolve_thumbnail(video, layout, thumbnails, for_html=True),
+            labels,
+        )
+        for idx, (video, labels) in enumerate(zip(videos, card_labels(videos)))
+    )
+    compact = " ".join(line.strip() for line in cards.splitlines() if line.strip())
+    return (
+        f'<div class="video-grid" style="grid-template-columns: repeat({layout}, minmax(0, 1fr));">'
+        f'{compact}</div>'
+    )
+
+def render_video_grid_html(videos, layout, start_rank=1, show_rank=True, thumbnails=None):
+    """동영상 카드 그리드를 한 번의 st.markdown 호출로 표시하는 함수 (이미지는 지연 로딩)"""
+    st.markdown(
+        build_video_grid_html(videos, layout, start_rank, show_rank, thumbnails),
+        unsafe_allow_html=True
+    )
+
+def render_videos(videos, layout, mode='streamlit', start_rank=1, show_rank=True, thumbnails=None):
+    """
+    선택한 렌더링 방식으로 동영상 카드를 표시하는 함수
+
+    Args:
+        mode (str): 'html'이면 HTML 그리드 한 번, 'streamlit'이면 카드마다 컴포넌트
+        thumbnails (ThumbnailCache): 줄인 썸네일을 제공할 캐시 (선택)
+    """
+    if mode == 'html':
+        render_video_grid_html(videos, layout, start_rank, show_rank, thumbnails)
+    else:
+        render_video_cards(videos, layout, start_rank, show_rank, thumbnails)
+
+def render_video_cards(videos, layout, start_rank=1, show_rank=True, thumbnails=None):
+    """
+    동영상 카드 목록을 그리드로 표시하는 함수
+
+    Args:
+        videos (list): 표시할 동영상 리스트
+        layout (int): 그리드 열 수
+        start_rank (int): 첫 번째 카드의 순위 (페이지 단위로 이어서 그릴 때 사용)
+        show_rank (bool): 순위 배지 표시 여부 (검색 시에는 표시하지 않음)
+        thumbnails (ThumbnailCache): 줄인 썸네일을 제공할 캐시 (선택)
+    """
+    # 반응형 그리드 레이아웃 생성
+    cols = st.columns(layout)
+    
+    # 조회수/게시 시간 문구는 목록 전체를 한 번에 포맷팅 (1년이 넘으면 'N년 전')
+    labels = card_labels(videos, years=True)
+    
+    for idx, video in enumerate(videos):
+        col = cols[idx % layout]
+        views, likes, comments, _, relative_time = labels[idx]
+        
+        with col:
+            # 순위 표시 (검색 시에는 표시하지 않음)
+            rank = start_rank + idx if show_rank else None
+            
+            # 카드 스타일 컨테이너
+            with st.container():
+                # 썸네일 이미지
+                st.image(resolve_thumbnail(video, layout, thumbnails), use_container_width=True)
+                
+                # 순위 배지 (있는 경우)
+                if rank:
+                    st.markdown(f"<div style='text-align: center; background: #FF4444; color: white; padding: 2px 8px; border-radius: 12px; margin: 5px 0; font-size: 0.8rem; font-weight: bold;'>#{rank}</div>", unsafe_allow_html=True)
+                
+                # 제목 처리
+                title = video.title
+                if len(title) > 50:
+                    title = title[:47] + "..."
+                
+                # 제목 링크
+                st.markdown(f"**[{title}]({video.url})**")
+                
+                # 채널명
+                channel = video.channel
+                if len(channel) > 25:
+                    channel = channel[:22] + "..."
+                st.markdown(f"📺 *{channel}*")
+                
+                # 비현실적인 데이터 필터링
+                like_count = video.like_count
+                if like_count > video.view_count and video.view_count > 0:
+                    like_count = 0
+                
+                # 통계 정보를 간단한 텍스트로 표시
+                stats_parts = []
+                stats_parts.append(f"👁️ {views}")
+                
+                if like_count > 0:
+                    stats_parts.append(f"👍 {likes}")
+                
+                if video.comment_count > 0:
+                    stats_parts.append(f"💬 {comments}")
+                
+                if relative_time:
+                    stats_parts.append(f"🕐 {relative_time}")
+                
+                # 전체 국가 모드에서는 국가 표시
+                if video.region:
+                    stats_parts.append(COUNTRIES[video.region])
+                
+                # 통계 정보 표시
+                stats_text = " | ".join(stats_parts)
+                st.markdown(f"<small style='color: #888;'>{stats_text}</small>", unsafe_allow_html=True)
+                
+                # 구분선
+                st.markdown("---")
+
+# ====================================
+# 동영상 목록 (부분 재실행)
+# ====================================
+# st.fragment(1.37+) 또는 st.experimental_fragment(1.33+)가 있으면 검색어나 레이아웃을
+# 바꿀 때 이 영역만 다시 실행하고, 더 오래된 버전에서는 전체 페이지를 다시 실행합니다.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# 검색 결과를 스냅샷마다 몇 개까지 기억할지
+SEARCH_MEMO_SIZE = 64
+
+def snapshot_version(selection, first_page):
+    """
+    화면에 표시할 스냅샷의 버전을 만드는 함수
+
+    선택 조건(국가/정렬/개수/새로고침 세대)과 첫 페이지 내용이 같으면 같은 값이므로,
+    session_state에 저장한 목록과 합계/검색 결과를 그대로 다시 쓸 수 있습니다.
+    """
+    return hash((selection, tuple((video.id, video.view_count) for video in first_page)))
+
+def memoized(name, version, compute):
+    """session_state에 스냅샷 버전별로 값 하나만 보관하는 메모이제이션 함수"""
+    entry = st.session_state.get(name)
+    if entry is None or entry[0] != version:
+        entry = (version, compute())
+        st.session_state[name] = entry
+    return entry[1]
+
+def search_positions(version, videos, search_term):
+    """검색 결과(목록에서의 위치)를 스냅샷 버전과 검색어별로 기억해 두는 함수"""
+    results = memoized('video_search', version, dict)
+    if search_term not in results:
+        index = get_search_index(tuple(video.id for video in videos), videos)
+        results[search_term] = index.search(search_term)
+        # 오래된 검색어부터 잊습니다.
+        while len(results) > SEARCH_MEMO_SIZE:
+            del results[next(iter(results))]
+    return results[search_term]
+
+@fragment
+def render_video_section(version, first_page, pages, thumbnails=None):
+    """
+    통계 카드, 검색창, 레이아웃 선택, 동영상 목록을 그리는 부분 재실행 영역
+
+    전체 실행에서는 페이지가 도착하는 대로 그리면서 목록을 session_state에 저장하고,
+    검색어나 레이아웃만 바뀐 재실행에서는 저장된 목록과 메모이즈된 합계/검색 결과를
+    다시 사용하므로 CSS 주입, 사이드바, 데이터 조회를 다시 하지 않습니다.
+
+    Args:
+        version (int): snapshot_version()으로 만든 스냅샷 버전
+        first_page (list): 첫 페이지의 Video 리스트
+        pages (iterator): 나머지 페이지 (저장된 목록이 없을 때만 소비)
+        thumbnails (ThumbnailCache): 줄인 썸네일을 제공할 캐시 (선택)
+    """
+    # 부분 재실행이면 이 영역의 소요 시간만 따로 기록합니다.
+    trace = start_trace() if current_trace() is None else None
+    
+    # 페이지가 도착할 때마다 값을 갱신할 수 있도록 자리만 먼저 만듭니다.
+    metric_slots = [col.empty() for col in st.columns(4)]
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    header_slot = st.empty()
+    
+    # 검색/레이아웃/렌더링 방식 (바꾸면 이 영역만 다시 실행)
+    search_col, layout_col, mode_col = st.columns([3, 1, 1])
+    with search_col:
+        search_term = st.text_input("🔍 동영상 검색", placeholder="제목이나 채널명으로 검색하세요...")
+    with layout_col:
+        selected_layout = st.selectbox(
+            "🖥️ 레이아웃",
+            options=list(LAYOUT_OPTIONS.keys()),
+            format_func=lambda x: LAYOUT_OPTIONS[x],
+            index=1
+        )
+    with mode_col:
+        render_mode = st.selectbox(
+            "🧩 렌더링 방식",
+            options=list(RENDER_OPTIONS.keys()),
+            format_func=lambda x: RENDER_OPTIONS[x],
+            index=1 if os.getenv('YOUTUBE_RENDER_MODE') == 'html' else 0
+        )
+    search_result_slot = st.empty()
+    
+    snapshot = st.session_state.get('video_snapshot')
+    if snapshot is not None and snapshot[0] == version:
+        # 같은 스냅샷: 저장된 목록과 합계를 그대로 사용
+        videos = snapshot[1]
+        render_metric_cards(metric_slots, memoized('video_totals', version, lambda: compute_totals(videos)))
+        header_slot.markdown(f"### 📺 인기 동영상 Top {len(videos)}")
+        if not search_term:
+            with REGISTRY.timer('render'):
+                render_videos(videos, selected_layout, render_mode, thumbnails=thumbnails)
+    else:
+        videos = []
+        for page in itertools.chain([first_page], pages):
+            start_rank = len(videos) + 1
+            videos.extend(page)
+            
+            render_metric_cards(metric_slots, compute_totals(videos))
+            header_slot.markdown(f"### 📺 인기 동영상 Top {len(videos)}")
+            
+            # 검색하지 않을 때는 페이지가 도착하는 대로 바로 표시
+            if not search_term:
+                with REGISTRY.timer('render'):
+                    render_videos(page, selected_layout, render_mode, start_rank, thumbnails=thumbnails)
+        st.session_state['video_snapshot'] = (version, videos)
+        st.session_state['video_totals'] = (version, compute_totals(videos))
+    
+    # 검색 필터링: 스냅샷별 색인에서 관련도 순으로 찾습니다.
+    if search_term:
+        with REGISTRY.timer('filter'):
+            filtered_videos = [videos[position] for position in search_positions(version, videos, search_term)]
+        if filtered_videos:
+            search_result_slot.success(f"🎯 '{search_term}'에 대한 검색 결과: {len(filtered_videos)}개")
+        else:
+            search_result_slot.warning(f"🚫 '{search_term}'에 대한 검색 결과가 없습니다.")
+        with REGISTRY.timer('render'):
+            render_videos(filtered_videos, selected_layout, render_mode, show_rank=False, thumbnails=thumbnails)
+    
+    if trace is not None:
+        finish_run(trace)
+
 # ====================================
 # 메인 애플리케이션
 # ====================================
@@ -556,6 +1322,9 @@ def main():
     
     사용자 인터페이스를 구성하고 이벤트를 처리합니다.
     """
+    # 이번 실행의 단계별 소요 시간/캐시 적중 기록 시작
+    trace = start_trace()
+    
     # 커스텀 CSS 적용
     set_custom_css()
     
@@ -571,31 +1340,24 @@ def main():
     st.sidebar.markdown("### 🔧 설정")
     
     # 국가 선택 옵션
-    countries = {
-        'KR': '🇰🇷 한국',  # 대한민국
-        'US': '🇺🇸 미국',  # 미국
-        'JP': '🇯🇵 일본',  # 일본
-        'GB': '🇬🇧 영국',  # 영국
-        'DE': '🇩🇪 독일',  # 독일
-        'FR': '🇫🇷 프랑스', # 프랑스
-        'CA': '🇨🇦 캐나다', # 캐나다
-        'AU': '🇦🇺 호주'   # 호주
-    }
+    countries = COUNTRIES
     
     selected_country = st.sidebar.selectbox(
         "📍 국가 선택",
-        options=list(countries.keys()),
-        format_func=lambda x: countries[x],
+        options=list(countries.keys()) + [ALL_REGIONS],
+        format_func=lambda x: countries.get(x, ALL_REGIONS_LABEL),
         index=0
     )
     
+    # 로컬 정렬: 인기 차트를 한 번 가져와 메모리에서 정렬 (검색 API 미사용)
+    local_sort = st.sidebar.checkbox(
+        "⚡ 로컬 정렬 (인기 차트 기준)",
+        value=os.getenv('YOUTUBE_LOCAL_SORT') == '1',
+        help="정렬을 바꿔도 API를 다시 호출하지 않고, 할당량이 큰 검색 API를 쓰지 않습니다."
+    )
+    
     # Sort order selection
-    sort_options = {
-        'mostPopular': '📈 인기순',
-        'date': '📅 최신순',
-        'viewCount': '👁️ 조회수순',
-        'rating': '⭐ 평점순'
-    }
+    sort_options = LOCAL_SORT_OPTIONS if local_sort else SORT_OPTIONS
     
     selected_order = st.sidebar.selectbox(
         "🔄 정렬 방식",
@@ -604,27 +1366,30 @@ def main():
         index=0
     )
     
-    # Number of videos
+    # Number of videos (인기순은 페이지를 이어 받아 최대 200개까지)
     max_results = st.sidebar.slider(
         "📺 동영상 개수",
         min_value=10,
-        max_value=50,
+        max_value=200 if local_sort or selected_order == 'mostPopular' else 50,
         value=30,
         step=5
     )
     
-    # 레이아웃 선택
-    layout_options = {
-        3: "📱 모바일 (3열)",
-        4: "💻 데스크톱 (4열)",
-        2: "📺 대형 화면 (2열)"
-    }
+    # 레이아웃/렌더링 방식은 동영상 목록 위에서 선택합니다 (목록만 다시 그림).
     
-    selected_layout = st.sidebar.selectbox(
-        "🖥️ 레이아웃",
-        options=list(layout_options.keys()),
-        format_func=lambda x: layout_options[x],
-        index=1
+    # 썸네일 최적화: 레이아웃 크기로 줄인 사본을 로컬에서 제공
+    optimize_thumbnails = st.sidebar.checkbox(
+        "🖼️ 썸네일 최적화",
+        value=os.getenv('YOUTUBE_THUMBNAIL_PROXY') == '1',
+        help="썸네일을 한 번만 내려받아 레이아웃에 맞는 크기로 줄여 제공합니다."
+    )
+    thumbnails = get_thumbnail_cache() if optimize_thumbnails else None
+    
+    # 단계별 소요 시간과 캐시 적중 여부 표시
+    show_debug = st.sidebar.checkbox(
+        "🔧 성능 정보 표시",
+        value=os.getenv('YOUTUBE_DEBUG') == '1',
+        help="가져오기/파싱/조회수 보강/필터/렌더링 단계의 실제 소요 시간과 캐시 적중 여부를 보여줍니다."
     )
     
     st.sidebar.markdown("---")
@@ -632,10 +1397,8 @@ def main():
     # Refresh button with cache clearing
     col1, col2 = st.sidebar.columns(2)
     with col1:
-        if st.button("🔄 새로고침", type="primary", use_container_width=True):
-            # 캐시를 지우고 새로운 데이터를 가져오기 위해 캐시 키를 변경
-            st.cache_data.clear()
-            st.rerun()
+        # 현재 선택한 조합만 새로 가져옵니다 (아래에서 API 키를 얻은 뒤 처리)
+        refresh_requested = st.button("🔄 새로고침", type="primary", use_container_width=True)
     
     with col2:
         if st.button("❤️ 즐겨찾기", use_container_width=True):
@@ -644,193 +1407,135 @@ def main():
     # API 호출 매개변수 표시 (디버깅용)
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📊 현재 설정")
-    st.sidebar.markdown(f"**국가:** {countries[selected_country]}")
+    country_label = countries.get(selected_country, ALL_REGIONS_LABEL)
+    st.sidebar.markdown(f"**국가:** {country_label}")
     st.sidebar.markdown(f"**정렬:** {sort_options[selected_order]}")
     st.sidebar.markdown(f"**개수:** {max_results}개")
-    st.sidebar.markdown(f"**레이아웃:** {layout_options[selected_layout]}")
     
-    # 업데이트 시간 표시
-    st.sidebar.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-label">마지막 업데이트</div>
-        <div style="color: #4CAF50; font-size: 0.9rem;">
-            {datetime.now().strftime('%H:%M:%S')}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # 데이터 갱신 시각 표시 (동영상을 가져온 뒤 채움)
+    freshness_slot = st.sidebar.empty()
     
     # Get API key
     try:
-        api_key = get_youtube_api_key()
+        key_pool = get_api_key_pool()
     except:
         st.stop()
     
-    # 현재 설정 표시
-    st.info(f"📍 **{countries[selected_country]}** | 🔄 **{sort_options[selected_order]}** | 📺 **{max_results}개 동영상** | 🖥️ **{layout_options[selected_layout]}**")
-    
-    # Fetch videos with progress
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    status_text.text("동영상 데이터를 가져오는 중...")
-    progress_bar.progress(25)
+    # 남은 API 할당량 표시 (키가 여러 개면 합계)
+    key_count = f" · 키 {len(key_pool)}개" if len(key_pool) > 1 else ""
+    st.sidebar.markdown(f"""
+    <div class="metric-card">
+        <div class="metric-label">남은 API 할당량 (오늘{key_count})</div>
+        <div style="color: #4CAF50; font-size: 0.9rem;">
+            {key_pool.remaining():,} / {key_pool.daily_limit:,}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
     
-    videos = get_popular_videos(api_key, max_results, selected_country, selected_order)
+    # 성능 정보 패널 (내용은 실행이 끝난 뒤 채움)
+    debug_panel = st.sidebar.expander("🔧 성능 정보", expanded=True) if show_debug else None
     
-    progress_bar.progress(75)
-    status_text.text("동영상 목록을 준비하는 중...")
+    # 화면에 필요한 (지역, 정렬, 개수) 조합
+    fetch_order = 'mostPopular' if local_sort else selected_order
+    fetch_regions = list(countries.keys()) if selected_country == ALL_REGIONS else [selected_country]
+    fetch_count = LOCAL_SORT_POOL if local_sort and selected_country != ALL_REGIONS else max_results
     
-    if not videos:
-        progress_bar.empty()
-        status_text.empty()
-        st.warning("🚫 동영상을 불러올 수 없습니다. 잠시 후 다시 시도해주세요.")
-        return
+    # 새로고침: 현재 조합만 다시 가져오고 다른 캐시는 유지
+    if refresh_requested:
+        # 디바운스로 무시될 클릭은 새로고침 빈도 제한 토큰을 쓰지 않습니다.
+        tracker = get_refresh_tracker()
+        targets = [
+            (region_code, fetch_order, fetch_count)
+            for region_code in fetch_regions
+            if not tracker.is_debounced((region_code, fetch_order))
+        ]
+        if not targets:
+            st.sidebar.info("방금 새로고침한 데이터입니다.")
+        elif not get_refresh_bucket().try_acquire():
+            st.sidebar.warning("새로고침이 너무 잦습니다. 잠시 후 다시 시도해주세요.")
+        elif not refresh_selection(targets):
+            st.sidebar.info("방금 새로고침한 데이터입니다.")
     
-    progress_bar.progress(100)
-    status_text.text("완료!")
+    # 백그라운드 미리 가져오기 (선택 사항)
+    if os.getenv('YOUTUBE_PREFETCH') == '1':
+        start_prefetcher()
     
-    # 잠시 후 프로그레스 바 제거
-    import time
-    time.sleep(0.5)
-    progress_bar.empty()
-    status_text.empty()
+    # 계측값 스크레이프용 엔드포인트 (선택 사항)
+    if os.getenv('YOUTUBE_METRICS_PORT'):
+        start_metrics_server(int(os.getenv('YOUTUBE_METRICS_PORT')))
     
-    # ==============================
-    # 통계 정보 표시
-    # ==============================
-    col1, col2, col3, col4 = st.columns(4)
+    # 현재 설정 표시
+    st.info(f"📍 **{country_label}** | 🔄 **{sort_options[selected_order]}** | 📺 **{max_results}개 동영상**")
     
-    total_views = sum(int(video['view_count']) for video in videos if video['view_count'].isdigit())
-    total_likes = sum(int(video['like_count']) for video in videos if video['like_count'].isdigit())
-    total_comments = sum(int(video['comment_count']) for video in videos if video['comment_count'].isdigit())
+    # 첫 페이지가 도착할 때까지만 스피너를 표시합니다.
+    with st.spinner("동영상 데이터를 가져오는 중..."):
+        region_latencies = {}
+        if selected_country == ALL_REGIONS:
+            # 모든 국가를 병렬로 가져와 합칩니다.
+            all_videos, region_latencies = get_popular_videos_multi(
+                fetch_regions, fetch_count, fetch_order
+            )
+            if local_sort:
+                with REGISTRY.timer('filter'):
+                    all_videos = sort_videos(all_videos, selected_order)
+            pages = iter([all_videos])
+        elif local_sort:
+            # 인기 차트(캐시됨)를 메모리에서 정렬하므로 정렬을 바꿔도 네트워크 호출이 없습니다.
+            chart = get_popular_videos(fetch_count, selected_country, fetch_order)
+            with REGISTRY.timer('filter'):
+                pages = iter([sort_videos(chart, selected_order)[:max_results]])
+        else:
+            # 페이지 단위로 가져오며, 첫 페이지가 도착하는 즉시 표시합니다.
+            pages = iter_popular_video_pages(max_results, selected_country, selected_order)
+        
+        first_page = next(pages, [])
     
-    with col1:
-        st.markdown(f"""
+    # 데이터가 얼마나 오래되었는지 표시 (여러 국가면 가장 오래된 것 기준)
+    ages = [age for age in (get_snapshot_age(region_code, fetch_order) for region_code in fetch_regions) if age is not None]
+    if ages:
+        oldest = max(ages)
+        fetched_at = datetime.fromtimestamp(time.time() - oldest).strftime('%H:%M:%S')
+        # 갱신 주기가 지났는데도 새 데이터를 받지 못했으면 오래된 데이터로 표시
+        is_stale = oldest > CACHE_TTL
+        freshness_slot.markdown(f"""
         <div class="metric-card">
-            <div class="metric-value">{len(videos)}</div>
-            <div class="metric-label">총 동영상</div>
+            <div class="metric-label">데이터 갱신{' (오래된 데이터)' if is_stale else ''}</div>
+            <div style="color: {'#FF9800' if is_stale else '#4CAF50'}; font-size: 0.9rem;">
+                {format_age(oldest)} ({fetched_at})
+            </div>
         </div>
         """, unsafe_allow_html=True)
     
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{format_view_count(str(total_views))}</div>
-            <div class="metric-label">총 조회수</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # API 차단 중이면 마지막으로 받아 둔 데이터를 보여주고 있음을 알립니다.
+    if first_page and get_youtube_client().open_breakers():
+        age_text = f" ({format_age(max(ages))} 데이터)" if ages else ""
+        st.warning(f"⚠️ YouTube API 응답이 불안정하여 마지막으로 받아 둔 목록을 표시합니다{age_text}. 잠시 후 자동으로 다시 시도합니다.")
     
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{format_view_count(str(total_likes))}</div>
-            <div class="metric-label">총 좋아요</div>
-        </div>
-        """, unsafe_allow_html=True)
+    if not first_page:
+        st.warning("🚫 동영상을 불러올 수 없습니다. 잠시 후 다시 시도해주세요.")
+        finish_run(trace, debug_panel)
+        return
     
-    with col4:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{format_view_count(str(total_comments))}</div>
-            <div class="metric-label">총 댓글</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # 국가별 응답 시간 (전체 국가 모드)
+    if region_latencies:
+        with st.expander(f"⏱️ 국가별 응답 시간 (최대 {max(region_latencies.values()):.2f}초)"):
+            for region_code, elapsed in sorted(region_latencies.items(), key=lambda x: -x[1]):
+                st.markdown(f"- {countries[region_code]}: **{elapsed:.2f}초**")
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    # 인기 차트 추이 (단일 국가)
+    if fetch_order == 'mostPopular' and selected_country != ALL_REGIONS:
+        with st.expander("📊 오늘의 차트 추이"):
+            render_chart_history(selected_country)
     
     # ==============================
-    # 동영상 목록 표시
+    # 통계 정보와 동영상 목록 (부분 재실행 영역)
     # ==============================
-    st.markdown(f"### 📺 인기 동영상 Top {len(videos)}")
-    
-    # 검색 기능 추가
-    search_term = st.text_input("🔍 동영상 검색", placeholder="제목이나 채널명으로 검색하세요...")
-    
-    # 검색 필터링
-    if search_term:
-        filtered_videos = [
-            video for video in videos 
-            if search_term.lower() in video['title'].lower() or 
-               search_term.lower() in video['channel'].lower()
-        ]
-        if filtered_videos:
-            st.success(f"🎯 '{search_term}'에 대한 검색 결과: {len(filtered_videos)}개")
-        else:
-            st.warning(f"🚫 '{search_term}'에 대한 검색 결과가 없습니다.")
-    else:
-        filtered_videos = videos
-    
-    # 반응형 그리드 레이아웃 생성
-    cols = st.columns(selected_layout)
-    
-    for idx, video in enumerate(filtered_videos):
-        col = cols[idx % selected_layout]
-        
-        with col:
-            # 순위 표시 (검색 시에는 표시하지 않음)
-            rank = idx + 1 if not search_term else None
-            
-            # 카드 스타일 컨테이너
-            with st.container():
-                # 썸네일 이미지
-                st.image(video['thumbnail_high'], use_container_width=True)
-                
-                # 순위 배지 (있는 경우)
-                if rank:
-                    st.markdown(f"<div style='text-align: center; background: #FF4444; color: white; padding: 2px 8px; border-radius: 12px; margin: 5px 0; font-size: 0.8rem; font-weight: bold;'>#{rank}</div>", unsafe_allow_html=True)
-                
-                # 제목 처리
-                title = video['title']
-                if len(title) > 50:
-                    title = title[:47] + "..."
-                
-                # 제목 링크
-                st.markdown(f"**[{title}]({video['url']})**")
-                
-                # 채널명
-                channel = video['channel']
-                if len(channel) > 25:
-                    channel = channel[:22] + "..."
-                st.markdown(f"📺 *{channel}*")
-                
-                # 통계 정보 처리
-                view_count = int(video['view_count']) if video['view_count'].isdigit() else 0
-                like_count = int(video['like_count']) if video['like_count'].isdigit() else 0
-                comment_count = int(video['comment_count']) if video['comment_count'].isdigit() else 0
-                relative_time = get_relative_time(video['published_at'])
-                
-                # 비현실적인 데이터 필터링
-                if like_count > view_count and view_count > 0:
-                    like_count = 0
-                
-                # 상대 시간 처리
-                if relative_time and "일 전" in relative_time:
-                    try:
-                        days = int(relative_time.split("일")[0])
-                        if days > 365:
-                            relative_time = f"{days // 365}년 전"
-                    except:
-                        pass
-                
-                # 통계 정보를 간단한 텍스트로 표시
-                stats_parts = []
-                stats_parts.append(f"👁️ {format_view_count(str(view_count))}")
-                
-                if like_count > 0:
-                    stats_parts.append(f"👍 {format_view_count(str(like_count))}")
-                
-                if comment_count > 0:
-                    stats_parts.append(f"💬 {format_view_count(str(comment_count))}")
-                
-                if relative_time:
-                    stats_parts.append(f"🕐 {relative_time}")
-                
-                # 통계 정보 표시
-                stats_text = " | ".join(stats_parts)
-                st.markdown(f"<small style='color: #888;'>{stats_text}</small>", unsafe_allow_html=True)
-                
-                # 구분선
-                st.markdown("---")
+    tracker = get_refresh_tracker()
+    selection = (
+        tuple(fetch_regions), fetch_order, fetch_count, selected_order, max_results,
+        tuple(tracker.generation((region_code, fetch_order)) for region_code in fetch_regions),
+    )
+    render_video_section(snapshot_version(selection, first_page), first_page, pages, thumbnails)
     
     # ==============================
     # 푸터 영역
@@ -876,6 +1581,8 @@ def main():
         </p>
     </div>
     """, unsafe_allow_html=True)
+    
+    finish_run(trace, debug_panel)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+# 필요한 라이브러리 임포트
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_api import FixtureStore, MockYouTubeServer  # noqa: E402
+
+# streamlit_app을 런타임 없이 불러올 때 나오는 경고를 숨깁니다.
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+@pytest.fixture
+def mock_server():
+    """지역마다 합성 동영상 200개를 돌려주는 로컬 mock YouTube API 서버"""
+    with MockYouTubeServer(FixtureStore(synthetic=200)) as server:
+        yield server
+
+
+@pytest.fixture
+def app(mock_server, tmp_path, monkeypatch):
+    """
+    mock 서버를 호출하고 캐시/기록 파일을 임시 디렉터리에 두는 streamlit_app 모듈
+
+    .env의 실제 키 대신 mock 키를 쓰며(load_dotenv()는 이미 있는 값을 덮어쓰지 않음),
+    테스트마다 st.cache_resource를 비워 새 캐시/클라이언트로 시작합니다.
+    """
+    import streamlit as st
+
+    monkeypatch.setenv("YOUTUBE_API_BASE_URL", mock_server.base_url)
+    monkeypatch.setenv("YOUTUBE_API_KEY", "mock-key")
+    monkeypatch.setenv("YOUTUBE_API_KEYS", "")
+    monkeypatch.setenv("YOUTUBE_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("YOUTUBE_HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+    monkeypatch.setenv("YOUTUBE_QUOTA_PATH", str(tmp_path / "quota.sqlite3"))
+    monkeypatch.setenv("YOUTUBE_THUMBNAIL_DIR", str(tmp_path / "thumbnails"))
+    monkeypatch.setenv("YOUTUBE_QUOTA_DAILY_LIMIT", str(10 ** 9))
+    monkeypatch.delenv("YOUTUBE_RECORD_DIR", raising=False)
+    st.cache_resource.clear()
+    import streamlit_app
+
+    yield streamlit_app
+    st.cache_resource.clear()
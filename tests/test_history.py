@@ -0,0 +1,45 @@
+# 필요한 라이브러리 임포트
+import sqlite3
+
+
+def listing_items(server, region_code="KR"):
+    """mock 서버가 region_code의 인기 차트로 돌려주는 videos.list 항목 리스트"""
+    return server.store.listing(
+        "videos", {"chart": "mostPopular", "regionCode": region_code, "part": "snippet"}
+    )
+
+
+def test_changed_page_after_not_modified_page_is_recorded(app, mock_server):
+    # 첫 가져오기: 두 페이지(100개)가 스냅샷 하나로 기록됩니다.
+    assert app.refresh_video_pages("KR", "mostPopular", 100)
+
+    # 첫 페이지는 그대로(304), 두 번째 페이지만 바뀌도록 61위의 조회수를 올립니다.
+    item = listing_items(mock_server)[60]
+    item["statistics"]["viewCount"] = str(int(item["statistics"]["viewCount"]) + 12345)
+    assert app.refresh_video_pages("KR", "mostPopular", 100)
+
+    with sqlite3.connect(app.get_history_store().path) as conn:
+        views = conn.execute(
+            "SELECT views, prev_views FROM chart_state WHERE region = 'KR' AND video_id = ?",
+            (item["id"],),
+        ).fetchone()
+        snapshots = conn.execute(
+            "SELECT captured_at, COUNT(*) FROM snapshots WHERE region = 'KR' "
+            "GROUP BY captured_at ORDER BY captured_at"
+        ).fetchall()
+
+    assert views == (int(item["statistics"]["viewCount"]), int(item["statistics"]["viewCount"]) - 12345)
+    # 두 번의 가져오기가 각각 100개짜리 스냅샷 하나씩으로 남습니다 (304 페이지 포함).
+    assert [count for _, count in snapshots] == [100, 100]
+    assert app.get_history_store().has_previous("KR")
+
+
+def test_pages_of_one_fetch_share_captured_at(app):
+    videos = app.get_popular_videos(120, "KR", "mostPopular")
+    assert len(videos) == 120
+
+    with sqlite3.connect(app.get_history_store().path) as conn:
+        rows = conn.execute(
+            "SELECT COUNT(DISTINCT captured_at), COUNT(*) FROM snapshots WHERE region = 'KR'"
+        ).fetchone()
+    assert rows == (1, 150)
@@ -0,0 +1,31 @@
+# 필요한 라이브러리 임포트
+from invalidation import RefreshTracker
+
+
+def test_request_debounces_without_bumping_generation():
+    tracker = RefreshTracker(debounce_seconds=60)
+    assert tracker.request(("KR", "mostPopular"))
+    assert tracker.generation(("KR", "mostPopular")) == 0
+    assert tracker.is_debounced(("KR", "mostPopular"))
+    assert not tracker.request(("KR", "mostPopular"))
+    tracker.bump(("KR", "mostPopular"))
+    assert tracker.generation(("KR", "mostPopular")) == 1
+    assert tracker.generation(("US", "mostPopular")) == 0
+
+
+def test_refresh_selection_bumps_after_disk_refresh(app, monkeypatch):
+    tracker = app.get_refresh_tracker()
+    seen = []
+    refresh_video_pages = app.refresh_video_pages
+
+    def refresh(region_code, order, max_results):
+        # 디스크 캐시를 갱신하는 동안에는 이전 세대를 유지해야 합니다.
+        seen.append(tracker.generation((region_code, order)))
+        return refresh_video_pages(region_code, order, max_results) and region_code == "KR"
+
+    monkeypatch.setattr(app, "refresh_video_pages", refresh)
+    assert app.refresh_selection([("KR", "mostPopular", 30), ("US", "mostPopular", 30)]) == 2
+    assert seen == [0, 0]
+    assert tracker.generation(("KR", "mostPopular")) == 1
+    # 새 데이터를 저장하지 못한 조합은 메모리 캐시를 그대로 둡니다.
+    assert tracker.generation(("US", "mostPopular")) == 0
@@ -0,0 +1,34 @@
+# 필요한 라이브러리 임포트
+from prefetch import PrefetchScheduler
+
+
+class EmptyCache:
+    """항상 비어 있는 디스크 캐시 (모든 조합을 갱신 대상으로 봄)"""
+
+    def get(self, key):
+        return None
+
+
+def make_scheduler(remaining, calls, min_remaining=1000):
+    return PrefetchScheduler(
+        cache=EmptyCache(),
+        refresh=lambda region_code, order, count: calls.append((region_code, order)) or True,
+        key_func=lambda region_code, order, count: f"{region_code}:{order}",
+        combinations=[("KR", "mostPopular", 30), ("US", "mostPopular", 30)],
+        stagger=0,
+        remaining=remaining,
+        min_remaining=min_remaining,
+    )
+
+
+def test_prefetch_runs_while_quota_above_budget():
+    calls = []
+    assert make_scheduler(lambda: 5000, calls).run_once() == 2
+    assert calls == [("KR", "mostPopular"), ("US", "mostPopular")]
+
+
+def test_prefetch_stops_when_quota_below_budget():
+    calls = []
+    left = iter([1500, 900])
+    assert make_scheduler(lambda: next(left), calls).run_once() == 1
+    assert calls == [("KR", "mostPopular")]
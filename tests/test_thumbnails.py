@@ -0,0 +1,129 @@
+# 필요한 라이브러리 임포트
+import io
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from thumbnails import ThumbnailCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_png(color, size=(640, 360)):
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def image_server():
+    """경로별 PNG를 돌려주는 로컬 이미지 서버 (요청 수도 셉니다)"""
+    images = {
+        "/red.png": make_png("red"),
+        "/red-copy.png": make_png("red"),
+        "/blue.png": make_png("blue"),
+        "/green.png": make_png("green"),
+    }
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = images.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield base, hits
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def make_cache(directory, **kwargs):
+    return ThumbnailCache(directory=str(directory), session=requests.Session(), **kwargs)
+
+
+def test_get_downloads_and_resizes(tmp_path, image_server):
+    base, hits = image_server
+    cache = make_cache(tmp_path)
+
+    path = cache.get(f"{base}/red.png", 320)
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
+        assert image.size == (320, 180)
+
+    # 다른 너비는 원본을 다시 내려받지 않고 디스크의 원본에서 만듭니다.
+    cache.get(f"{base}/red.png", 480)
+    assert hits == ["/red.png"]
+    assert cache.total_bytes() == sum(
+        os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)
+        if name.endswith((".jpg", ".orig"))
+    )
+
+
+def test_same_content_is_stored_once(tmp_path, image_server):
+    base, _ = image_server
+    cache = make_cache(tmp_path)
+
+    first = cache.get(f"{base}/red.png", 320)
+    second = cache.get(f"{base}/red-copy.png", 320)
+
+    assert first == second
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".orig")]) == 1
+
+
+def test_evicts_least_recently_used_over_limit(tmp_path, image_server):
+    base, _ = image_server
+    red = make_cache(tmp_path / "probe").get(f"{base}/red.png", 320)
+    # 원본+사본 두 묶음이 들어갈 만큼만 허용합니다.
+    limit = 2 * (len(make_png("red")) + os.path.getsize(red))
+    cache = make_cache(tmp_path / "cache", max_bytes=limit)
+
+    red = cache.get(f"{base}/red.png", 320)
+    blue = cache.get(f"{base}/blue.png", 320)
+    assert cache.cached_path(f"{base}/red.png", 320) == red  # red 사본을 최근 사용으로
+    green = cache.get(f"{base}/green.png", 320)
+
+    # 가장 오래 사용하지 않은 red 원본과 blue 원본부터 지워지고, 최근 사용한 사본은 남습니다.
+    assert cache.total_bytes() <= limit
+    remaining = set(os.listdir(tmp_path / "cache"))
+    for path in (red, blue):
+        assert os.path.basename(path).split("_")[0] + ".orig" not in remaining
+    assert os.path.exists(red) and os.path.exists(green)
+
+
+def test_cached_path_builds_in_background(tmp_path, image_server):
+    base, _ = image_server
+    url = f"{base}/blue.png"
+    cache = make_cache(tmp_path)
+
+    assert cache.cached_path(url, 400) is None
+    deadline = time.time() + 5
+    path = None
+    while path is None and time.time() < deadline:
+        time.sleep(0.05)
+        path = cache.cached_path(url, 400)
+    assert path and os.path.exists(path)
+
+    # 다시 시작해도 색인과 용량을 한 번 읽어 그대로 사용합니다.
+    reopened = make_cache(tmp_path)
+    assert reopened.cached_path(url, 400) == path
+    assert reopened.total_bytes() == cache.total_bytes()
@@ -0,0 +1,28 @@
+# 필요한 라이브러리 임포트
+from models import Video
+
+
+def make_video(**overrides):
+    data = {
+        "id": "abc123", "title": "제목", "channel": "채널", "thumbnail": "https://i.ytimg.com/x.jpg",
+        "view_count": 1000, "like_count": 10, "comment_count": 1, "published_at": None,
+        "duration": 0, "region": None,
+    }
+    data.update(overrides)
+    return Video.from_dict(data)
+
+
+def test_card_shows_region_badge(app):
+    card = app.create_video_card(make_video(region="KR"), rank=1)
+    assert app.COUNTRIES["KR"] in card
+
+
+def test_card_without_region_has_no_badge(app):
+    card = app.create_video_card(make_video(), rank=1)
+    assert not any(label in card for label in app.COUNTRIES.values())
+
+
+def test_card_escapes_region(app):
+    card = app.create_video_card(make_video(region="<b>XX</b>"))
+    assert "<b>XX</b>" not in card
+    assert "&lt;b&gt;XX&lt;/b&gt;" in card
@@ -0,0 +1,64 @@
+# 필요한 라이브러리 임포트
+import pytest
+
+import popular
+from disk_cache import NOT_MODIFIED
+from quota import ApiKeyPool
+from youtube_client import YouTubeClient
+
+
+@pytest.fixture
+def client(mock_server, tmp_path):
+    """mock 서버를 호출하고 사용량을 임시 파일에 기록하는 클라이언트"""
+    keys = ApiKeyPool(["mock-key"], path=str(tmp_path / "quota.sqlite3"), daily_limit=10000)
+    client = YouTubeClient(base_url=mock_server.base_url, keys=keys)
+    yield client
+    client.close()
+
+
+def test_most_popular_page(client, mock_server):
+    page = popular.request_video_page(client, "KR", "mostPopular")
+
+    assert len(page["videos"]) == popular.PAGE_SIZE
+    assert page["next_page_token"]
+    assert page["etag"]
+    first = page["videos"][0]
+    assert first["id"].startswith("KR")
+    assert first["title"] and first["channel"] and first["view_count"] > 0
+    assert mock_server.calls() == {"videos": 1}
+    assert client.keys.usage_by_resource() == {"videos": (1, 1)}
+
+
+def test_pagination_up_to_200_results(client, mock_server):
+    pages = list(popular.iter_video_pages(client, "US", "mostPopular", 200))
+
+    assert [index for index, _ in pages] == [0, 1, 2, 3]
+    ids = [video.id for _, videos in pages for video in videos]
+    assert len(ids) == 200
+    assert len(set(ids)) == 200
+    assert mock_server.calls() == {"videos": 4}
+
+
+def test_pagination_stops_at_max_results(client, mock_server):
+    pages = list(popular.iter_video_pages(client, "JP", "mostPopular", 120))
+
+    assert [len(videos) for _, videos in pages] == [50, 50, 20]
+    assert mock_server.calls() == {"videos": 3}
+
+
+def test_etag_returns_not_modified(client, mock_server):
+    page = popular.request_video_page(client, "KR", "mostPopular")
+
+    assert popular.request_video_page(client, "KR", "mostPopular", etag=page["etag"]) is NOT_MODIFIED
+    # 304도 할당량을 쓰는 호출로 기록합니다.
+    assert mock_server.calls() == {"videos": 2}
+    assert client.keys.usage_by_resource() == {"videos": (2, 2)}
+
+    # 페이지 내용이 바뀌면 같은 ETag로도 새 페이지를 받습니다.
+    items = mock_server.store.listing(
+        "videos", {"chart": "mostPopular", "regionCode": "KR", "part": "snippet"}
+    )
+    items[0]["statistics"]["viewCount"] = str(int(items[0]["statistics"]["viewCount"]) + 1)
+    changed = popular.request_video_page(client, "KR", "mostPopular", etag=page["etag"])
+    assert changed is not NOT_MODIFIED
+    assert changed["etag"] != page["etag"]
@@ -0,0 +1,276 @@
+# 필요한 라이브러리 임포트
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 크기 조절 없이 원본을 그대로 저장
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# ====================================
+# 썸네일 캐시 설정
+# ====================================
+# Streamlit 정적 파일 제공(enableStaticServing)을 위해 static/ 아래에 저장합니다.
+DEFAULT_THUMBNAIL_DIR = os.path.join("static", "thumbnails")
+# Streamlit은 앱 스크립트 옆의 static/ 디렉터리를 app/static/ 경로로 제공합니다.
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL_PREFIX = "app/static"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# 레이아웃(열 수)별 썸네일 너비 (px)
+LAYOUT_WIDTHS = {2: 480, 3: 400, 4: 320}
+
+
+def static_url_prefix(directory):
+    """
+    directory의 파일을 가리키는 정적 파일 URL 접두어를 구하는 함수
+
+    Returns:
+        str: 'app/static/...' 형식의 접두어, directory가 STATIC_ROOT 밖이면 None
+    """
+    relative = os.path.relpath(os.path.abspath(directory), STATIC_ROOT)
+    if relative == os.curdir:
+        return STATIC_URL_PREFIX
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    return f"{STATIC_URL_PREFIX}/{relative.replace(os.sep, '/')}"
+
+
+class ThumbnailCache:
+    """
+    썸네일을 한 번만 내려받아 디스크에 보관하고, 레이아웃에 맞게 줄인 사본을 제공하는 캐시
+
+    원본은 내용의 SHA-256 값으로 저장하므로(콘텐츠 주소 방식) 같은 이미지는 URL이
+    달라도 한 번만 저장됩니다. 줄인 사본은 '<해시>_<너비>.jpg'로 저장되며, 전체 크기가
+    max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다(LRU).
+
+    화면을 그릴 때마다 디스크를 훑지 않도록 URL → 해시 색인, 파일 크기와 사용 순서는
+    시작할 때 한 번 읽어 메모리에 두고, 이후에는 이 프로세스가 쓴 파일만 반영합니다.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, session=None, quality=75, max_workers=4):
+        """
+        Args:
+            directory (str): 썸네일을 저장할 디렉터리
+            max_bytes (int): 디스크 사용량 상한 (바이트)
+            session (requests.Session): 이미지를 내려받을 세션 (테스트용 스텁 서버 등)
+            quality (int): JPEG 재압축 품질
+            max_workers (int): 백그라운드 다운로드 스레드 수
+        """
+        self.directory = directory or os.getenv("YOUTUBE_THUMBNAIL_DIR", DEFAULT_THUMBNAIL_DIR)
+        self.max_bytes = max_bytes or int(os.getenv("YOUTUBE_THUMBNAIL_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.session = session or requests.Session()
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._digests = {}            # URL → 원본 해시
+        self._usage = OrderedDict()   # 파일 경로 → 크기 (오래 사용하지 않은 순)
+        self._bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._static_url_prefix = static_url_prefix(self.directory)
+        if self._static_url_prefix is None:
+            logger.warning(
+                "썸네일 디렉터리 %s가 %s 밖에 있어 HTML 그리드에서는 원본 URL을 사용합니다.",
+                self.directory, STATIC_ROOT,
+            )
+        if Image is None:
+            logger.warning("Pillow가 설치되어 있지 않아 썸네일을 줄이지 않고 원본 그대로 제공합니다.")
+        self._index_path = os.path.join(self.directory, "index.sqlite3")
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+            )
+            self._digests.update(conn.execute("SELECT url, digest FROM urls"))
+        for path, size, _ in sorted(self._scan(), key=lambda f: f[2]):
+            self._usage[path] = size
+            self._bytes += size
+
+    def _connect(self):
+        return sqlite3.connect(self._index_path, timeout=10)
+
+    # ------------------------------
+    # 경로/색인
+    # ------------------------------
+    def _original_path(self, digest):
+        return os.path.join(self.directory, f"{digest}.orig")
+
+    def _variant_name(self, digest, width):
+        return f"{digest}_{width}.jpg"
+
+    def _digest_for(self, url):
+        digest = self._digests.get(url)
+        if digest is None:
+            # 다른 워커가 내려받은 URL일 수 있으므로 메모리에 없을 때만 색인을 확인합니다.
+            # (백그라운드에서 만드는 get()에서만 호출되므로 화면을 그리는 속도와는 무관)
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+            if row:
+                digest = self._digests[url] = row[0]
+        return digest
+
+    def _touch(self, path):
+        # 메모리의 사용 순서만 갱신합니다 (LRU).
+        with self._lock:
+            if path in self._usage:
+                self._usage.move_to_end(path)
+
+    # ------------------------------
+    # 다운로드/변환
+    # ------------------------------
+    def _download(self, url):
+        """원본을 내려받아 내용 해시로 저장하고 해시를 반환합니다."""
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._original_path(digest)
+        if not os.path.exists(path):
+            self._write(path, content)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest)
+            )
+        self._digests[url] = digest
+        return digest
+
+    def _write(self, path, content):
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._bytes += len(content) - self._usage.pop(path, 0)
+            self._usage[path] = len(content)
+
+    def _resize(self, content, width):
+        """width 너비로 줄이고 JPEG로 재압축합니다 (원본보다 크게 늘리지는 않음)."""
+        if Image is None:
+            return content
+        with Image.open(io.BytesIO(content)) as image:
+            image = image.convert("RGB")
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=self.quality, optimize=True)
+        return output.getvalue()
+
+    def get(self, url, width):
+        """
+        width 너비로 줄인 썸네일의 경로를 반환합니다 (없으면 내려받아 만듦).
+
+        Args:
+            url (str): 원본 썸네일 URL
+            width (int): 원하는 너비 (px)
+
+        Returns:
+            str: 줄인 썸네일 파일 경로
+        """
+        digest = self._digest_for(url)
+        if digest:
+            path = os.path.join(self.directory, self._variant_name(digest, width))
+            if os.path.exists(path):
+                self._touch(path)
+                return path
+
+        original = self._original_path(digest) if digest else None
+        if original is None or not os.path.exists(original):
+            digest = self._download(url)
+            original = self._original_path(digest)
+        path = os.path.join(self.directory, self._variant_name(digest, width))
+
+        with open(original, "rb") as f:
+            content = f.read()
+        self._touch(original)
+        self._write(path, self._resize(content, width))
+        self._evict()
+        return path
+
+    # ------------------------------
+    # 화면에서 사용
+    # ------------------------------
+    def _build(self, url, width):
+        try:
+            self.get(url, width)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard((url, width))
+
+    def cached_path(self, url, width):
+        """
+        이미 만들어 둔 썸네일 경로를 반환하고, 없으면 백그라운드에서 만들기 시작합니다.
+
+        화면을 그리는 동안 다운로드를 기다리지 않도록, 아직 없으면 None을 반환하므로
+        호출하는 쪽은 원본 URL을 대신 사용하면 됩니다.
+        """
+        # 화면을 그리는 경로에서는 메모리 색인만 봅니다 (카드마다 SQLite를 조회하지 않음).
+        digest = self._digests.get(url)
+        if digest:
+            path = os.path.join(self.directory, self._variant_name(digest, width))
+            if os.path.exists(path):
+                self._touch(path)
+                return path
+        with self._lock:
+            if (url, width) in self._pending:
+                return None
+            self._pending.add((url, width))
+        self._executor.submit(self._build, url, width)
+        return None
+
+    def static_url(self, path):
+        """
+        cached_path()가 반환한 파일의 정적 파일 URL (HTML 그리드용)
+
+        Returns:
+            str: 정적 파일 URL, 디렉터리가 static/ 밖에 있어 제공할 수 없으면 None
+        """
+        if self._static_url_prefix is None:
+            return None
+        return f"{self._static_url_prefix}/{os.path.basename(path)}"
+
+    # ------------------------------
+    # 용량 관리
+    # ------------------------------
+    def _scan(self):
+        for name in os.listdir(self.directory):
+            if name.endswith((".jpg", ".orig")):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def total_bytes(self):
+        """캐시가 차지하는 디스크 용량 (바이트, 이 프로세스가 알고 있는 파일 기준)"""
+        with self._lock:
+            return self._bytes
+
+    def _evict(self):
+        # 상한을 넘었을 때만 오래 사용하지 않은 파일부터 지웁니다.
+        with self._lock:
+            victims = []
+            while self._bytes > self.max_bytes and self._usage:
+                path, size = self._usage.popitem(last=False)
+                self._bytes -= size
+                victims.append(path)
+        for path in victims:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # 다른 워커가 이미 지움
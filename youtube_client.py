@@ -0,0 +1,168 @@
+# 필요한 라이브러리 임포트
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from quota import QuotaExceededError, next_quota_reset
+from resilience import (
+    DEFAULT_ATTEMPTS, CircuitBreaker, is_quota_error, is_transient, retry_call,
+)
+
+# ====================================
+# YouTube Data API 설정
+# ====================================
+# YOUTUBE_API_BASE_URL로 다른 주소(mock_api.py의 로컬 서버 등)를 가리킬 수 있습니다.
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+# 부분 응답(fields=) 마스크: Video 모델이 실제로 쓰는 키만 요청합니다.
+# (medium 썸네일은 high가 없을 때의 대체용)
+_SNIPPET_FIELDS = "snippet(title,channelTitle,publishedAt,thumbnails(medium/url,high/url))"
+_STATS_FIELDS = "statistics(viewCount,likeCount,commentCount),contentDetails/duration"
+
+# chart=mostPopular 목록 (videos.list)
+POPULAR_FIELDS = f"etag,nextPageToken,items(id,{_SNIPPET_FIELDS},{_STATS_FIELDS})"
+# 검색 결과 (search.list)
+SEARCH_FIELDS = f"etag,nextPageToken,items(id/videoId,{_SNIPPET_FIELDS})"
+# 검색 결과의 조회수/길이 보강 (videos.list?id=...)
+STATS_FIELDS = f"items(id,{_STATS_FIELDS})"
+
+
+class YouTubeClient:
+    """
+    YouTube Data API 호출을 담당하는 공용 클라이언트
+
+    keep-alive 연결을 재사용하는 requests.Session 하나를 공유하므로 매 요청마다
+    TLS 핸드셰이크를 다시 하지 않습니다. 응답은 gzip으로 받고, fields 마스크로
+    필요한 키만 내려받습니다. API 키는 호출할 때마다 키 풀(ApiKeyPool)에서 남은
+    할당량이 가장 많은 것을 골라 붙이고 그 키의 사용량으로 기록하므로, 호출하는
+    쪽(과 캐시 키)에는 API 키가 필요 없습니다. 남은 할당량이 부족하면 호출하지 않습니다.
+
+    네트워크 오류나 5xx/429 응답은 지수 백오프로 몇 번 다시 시도하고, 그래도
+    실패가 이어지는 엔드포인트는 차단기(CircuitBreaker)로 잠시 호출을 멈춥니다.
+    할당량 소진(403 quotaExceeded)이면 그 키를 빼고 다른 키로 바로 다시 호출하며,
+    남은 키가 없으면 다음 초기화 시각까지 차단합니다.
+    """
+
+    def __init__(self, base_url=None, timeout=10, pool_maxsize=16, keys=None,
+                 attempts=DEFAULT_ATTEMPTS, failure_threshold=5, reset_timeout=60.0,
+                 recorder=None):
+        """
+        Args:
+            base_url (str): API 기본 URL (기본값: YOUTUBE_API_BASE_URL 또는 API_BASE_URL)
+            timeout (int): 요청 타임아웃 (초)
+            pool_maxsize (int): 호스트당 유지할 최대 연결 수 (동시 요청 수에 맞춤)
+            keys (ApiKeyPool): API 키 풀 (None이면 params의 'key'를 그대로 사용하고 기록하지 않음)
+            attempts (int): 일시적인 오류에 대한 최대 시도 횟수 (첫 호출 포함)
+            failure_threshold (int): 엔드포인트 차단기를 여는 연속 실패 횟수
+            reset_timeout (float): 차단기가 열린 뒤 다시 시도할 때까지의 시간 (초)
+            recorder (callable): 응답을 받을 때마다 (resource, params, response)로 호출할
+                함수 (API 키는 빠진 params, recording.FixtureRecorder 등)
+        """
+        self.base_url = (base_url or os.getenv("YOUTUBE_API_BASE_URL") or API_BASE_URL).rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.keys = keys
+        self.attempts = attempts
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Google API는 User-Agent에 'gzip'이 있어야 압축 응답을 보냅니다.
+        self.session.headers.update({
+            "Accept-Encoding": "gzip",
+            "User-Agent": "youtube-popular-videos (gzip)",
+        })
+
+    def breaker(self, resource):
+        """엔드포인트(resource)별 차단기"""
+        breaker = self._breakers.get(resource)
+        if breaker is None:
+            breaker = self._breakers.setdefault(
+                resource, CircuitBreaker(resource, self.failure_threshold, self.reset_timeout)
+            )
+        return breaker
+
+    def open_breakers(self):
+        """지금 호출이 차단된 엔드포인트 이름 목록"""
+        return [name for name, breaker in list(self._breakers.items()) if breaker.is_open]
+
+    def _send(self, resource, params, headers):
+        key = None
+        query = params
+        if self.keys is not None:
+            key = self.keys.acquire(resource)
+            query = dict(params, key=key)
+        response = self.session.get(
+            f"{self.base_url}/{resource}", params=query, headers=headers,
+            timeout=self.timeout,
+        )
+        if self.recorder is not None:
+            self.recorder(resource, params, response)
+        # 오류 응답도 할당량을 소모합니다.
+        if key is not None:
+            self.keys.record(key, resource)
+        if response.status_code != 304:
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                if key is not None and is_quota_error(e):
+                    self.keys.mark_exhausted(key)
+                raise
+        return response
+
+    def get(self, resource, params, fields=None, etag=None):
+        """
+        API 리소스를 GET으로 호출하고 JSON 응답을 반환하는 함수
+
+        Args:
+            resource (str): 리소스 이름 ('videos', 'search' 등)
+            params (dict): 쿼리 매개변수
+            fields (str): 부분 응답 마스크 (None이면 전체 응답)
+            etag (str): 이전 응답의 ETag (주어지면 If-None-Match로 조건부 요청)
+
+        Returns:
+            dict: 파싱된 JSON 응답, 이전 응답에서 바뀌지 않았으면(304) None
+
+        Raises:
+            QuotaExceededError: 남은 할당량이 부족해 호출하지 않은 경우
+            CircuitOpenError: 실패가 이어져 이 엔드포인트 호출이 차단된 경우
+            requests.exceptions.RequestException: 재시도 후에도 남은 네트워크 오류 또는 HTTP 오류 상태
+        """
+        breaker = self.breaker(resource)
+        breaker.before_call()
+        if fields:
+            params = dict(params, fields=fields)
+        headers = {"If-None-Match": etag} if etag else None
+        while True:
+            try:
+                response = retry_call(
+                    lambda: self._send(resource, params, headers), attempts=self.attempts
+                )
+            except QuotaExceededError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if is_quota_error(e):
+                    # 소진된 키는 풀에서 빠졌으므로 남은 키가 있으면 바로 다시 호출합니다.
+                    if self.keys is not None and self.keys.available(resource):
+                        continue
+                    breaker.trip(next_quota_reset())
+                elif is_transient(e):
+                    breaker.record_failure()
+                else:
+                    # 4xx처럼 서버가 정상적으로 거절한 경우는 장애로 보지 않습니다.
+                    breaker.record_success()
+                raise
+            break
+        breaker.record_success()
+        if response.status_code == 304:
+            return None
+        return response.json()
+
+    def close(self):
+        """연결 풀을 닫습니다."""
+        self.session.close()